@@ -0,0 +1,163 @@
+"""
+Keyset (seek) pagination shared by the list views.
+
+Instead of ``OFFSET n`` the next page is fetched with a ``WHERE`` clause on the
+ordering key of the last row seen, so every page costs the same as the first
+one and can be served from an index on the ordering columns. Positions are
+passed around as opaque, URL-safe cursor tokens.
+"""
+
+import base64
+import datetime
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keep datetimes to the microsecond; DjangoJSONEncoder rounds them to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _field_name(ordering):
+    return ordering[1:] if ordering.startswith('-') else ordering
+
+
+def _model_field(model, field_name):
+    """The model field ``field_name`` refers to, following ``__`` relations."""
+    *path, last = field_name.split('__')
+    for part in path:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(last)
+
+
+def _key_value(obj, field_name):
+    value = obj
+    for part in field_name.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_next_page:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], 'next')
+
+    @cached_property
+    def previous_cursor(self):
+        if not self.has_previous_page:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], 'prev')
+
+
+class CursorPaginator:
+    """
+    Paginate ``queryset`` by the given ordering, e.g. ``('-start_date', '-id')``.
+    The last ordering field must be unique so that every row has a distinct key.
+    The total row count is only queried if ``count`` is accessed.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [_field_name(o) for o in self.ordering]
+        self.queryset = queryset.order_by(*self.ordering)
+
+    @cached_property
+    def count(self):
+        return self.queryset.order_by().count()
+
+    def encode_cursor(self, obj, direction):
+        payload = {'k': [_key_value(obj, f) for f in self.fields], 'd': direction}
+        raw = json.dumps(payload, cls=CursorEncoder, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values, direction = payload['k'], payload['d']
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursor("Invalid cursor.")
+        if direction not in ('next', 'prev') or not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor("Invalid cursor.")
+        model = self.queryset.model
+        try:
+            # A tampered value must not reach the WHERE clause.
+            values = [_model_field(model, field).to_python(value) for field, value in zip(self.fields, values)]
+        except (ValidationError, TypeError):
+            raise InvalidCursor("Invalid cursor.")
+        if None in values:
+            raise InvalidCursor("Invalid cursor.")
+        return values, direction
+
+    def _seek(self, values, forward):
+        """
+        Build the filter for rows strictly after (or before) ``values`` in the
+        paginator's ordering: (a, b) after (x, y) means a > x OR (a = x AND b > y),
+        with the comparison flipped for descending fields.
+        """
+        condition = Q()
+        equal = Q()
+        for ordering, field, value in zip(self.ordering, self.fields, values):
+            descending = ordering.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        # Repeat the leading bound on its own so the database can range-scan the index.
+        first_lookup = 'lte' if self.ordering[0].startswith('-') == forward else 'gte'
+        return Q(**{f'{self.fields[0]}__{first_lookup}': values[0]}) & condition
+
+    def page(self, cursor=None):
+        if not cursor:
+            rows = list(self.queryset[:self.per_page + 1])
+            return CursorPage(rows[:self.per_page], self, len(rows) > self.per_page, False)
+
+        values, direction = self.decode_cursor(cursor)
+        if direction == 'next':
+            rows = list(self.queryset.filter(self._seek(values, forward=True))[:self.per_page + 1])
+            return CursorPage(rows[:self.per_page], self, len(rows) > self.per_page, True)
+
+        reverse_ordering = [o[1:] if o.startswith('-') else f'-{o}' for o in self.ordering]
+        rows = list(
+            self.queryset.filter(self._seek(values, forward=False)).order_by(*reverse_ordering)[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        return CursorPage(rows[:self.per_page][::-1], self, True, has_previous)
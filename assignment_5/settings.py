@@ -63,6 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'projects.middleware.ActivityBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'assignment_5.urls'
@@ -130,6 +131,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# The unread message counters (messaging.unread) are invalidated by deleting
+# their keys, so every web process must share one cache. Set REDIS_URL in any
+# deployment with more than one worker; the local-memory cache only suits a
+# single process, and `manage.py check --deploy` warns about it.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Email configuration
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.example.com")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
@@ -137,3 +156,18 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "your-email@example.com")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "your-email-password")
 EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+
+# When set, requests only queue project activity; `manage.py drain_activity` inserts it.
+PROJECT_ACTIVITY_DEFERRED = os.getenv("PROJECT_ACTIVITY_DEFERRED", "False") == "True"
+
+# Activity older than this is moved to the archive table by `manage.py archive_activity`.
+PROJECT_ACTIVITY_RETENTION_DAYS = int(os.getenv("PROJECT_ACTIVITY_RETENTION_DAYS", "365"))
+
+# Repeats of these activity events (same task, same user) within the window, in
+# seconds, are merged into one row with an occurrence count.
+PROJECT_ACTIVITY_COALESCE_WINDOWS = {
+    'TASK_UPDATED': int(os.getenv("PROJECT_ACTIVITY_COALESCE_SECONDS", "600")),
+}
+
+# Open tasks due within this many days go in the task board's "Due soon" column.
+PROJECT_TASK_DUE_SOON_DAYS = int(os.getenv("PROJECT_TASK_DUE_SOON_DAYS", "7"))
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCAL_MEMORY_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """The unread counters go stale in other processes unless the cache is shared."""
+    if settings.CACHES.get('default', {}).get('BACKEND') == LOCAL_MEMORY_CACHE:
+        return [Warning(
+            "The default cache is local to each process, so unread message counts "
+            "can be stale in all but the worker that changed them.",
+            hint="Set REDIS_URL, or configure another shared cache in CACHES.",
+            id='messaging.W001',
+        )]
+    return []
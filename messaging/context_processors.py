@@ -1,21 +1,17 @@
 # messaging/context_processors.py
 
-from .models import Message
+from django.utils.functional import SimpleLazyObject
+
+from .unread import unread_count
 
 
 def unread_messages_count(request):
     """
-    Return a dictionary with unread messages count for the authenticated user.
-    If user is anonymous, return 0.
+    Return the unread messages count for the authenticated user, or 0 if the
+    user is anonymous. The count is read from the cache, and only when a
+    template actually uses it.
     """
     if request.user.is_authenticated:
-        return {
-            'unread_messages_count': Message.objects.filter(
-                recipient=request.user,
-                # Suppose you track read status with a boolean 'is_read'
-                # If you only have 'is_archived', adjust logic accordingly.
-                is_archived=False,
-                is_read=False,
-            ).count()
-        }
+        user = request.user
+        return {'unread_messages_count': SimpleLazyObject(lambda: unread_count(user))}
     return {'unread_messages_count': 0}
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE messaging_message ADD COLUMN search_vector tsvector",
+    """
+    UPDATE messaging_message AS m SET search_vector =
+        setweight(to_tsvector('english', coalesce(m.subject, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(s.username, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(r.username, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(m.body, '')), 'D')
+    FROM {users} AS s, {users} AS r
+    WHERE s.id = m.sender_id AND r.id = m.recipient_id
+    """,
+    "CREATE INDEX message_search_vector_idx ON messaging_message USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS message_search_vector_idx",
+    "ALTER TABLE messaging_message DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE messaging_message_fts USING fts5("
+    "subject, body, sender, recipient, tokenize = 'porter unicode61')",
+    "INSERT INTO messaging_message_fts (rowid, subject, body, sender, recipient) "
+    "SELECT m.id, m.subject, m.body, s.username, r.username FROM messaging_message AS m "
+    "JOIN {users} AS s ON s.id = m.sender_id JOIN {users} AS r ON r.id = m.recipient_id",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS messaging_message_fts",
+]
+
+
+def _sqlite_has_fts5(cursor):
+    cursor.execute("PRAGMA compile_options")
+    return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def run_for_vendor(postgres_sql, sqlite_sql):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        users = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                statements = postgres_sql
+            elif connection.vendor == 'sqlite' and _sqlite_has_fts5(cursor):
+                statements = sqlite_sql
+            else:
+                statements = []
+            for statement in statements:
+                cursor.execute(statement.format(users=users))
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text search index for messages (see messaging/search.py). The search
+    structures are backend specific, so they are created with raw SQL and are
+    not part of the model state.
+    """
+
+    dependencies = [
+        ('messaging', '0004_message_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_thread_roots(apps, schema_editor):
+    """Point every existing reply at the first message of its reply chain."""
+    Message = apps.get_model('messaging', 'Message')
+    parents = dict(Message.objects.filter(reply_to__isnull=False).values_list('pk', 'reply_to_id'))
+    replies = []
+    for pk in parents:
+        root, seen = parents[pk], {pk}
+        while root in parents and root not in seen:
+            seen.add(root)
+            root = parents[root]
+        replies.append(Message(pk=pk, thread_root_id=root))
+    Message.objects.bulk_update(replies, ['thread_root'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_message_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='thread_root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='thread_messages', to='messaging.message'),
+        ),
+        migrations.RunPython(backfill_thread_roots, migrations.RunPython.noop),
+    ]
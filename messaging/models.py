@@ -1,6 +1,44 @@
 from django.db import models
 from django.conf import settings
 
+from . import search, unread
+
+
+class MessageQuerySet(models.QuerySet):
+    """Keeps the recipients' unread counters and the search index in step with bulk writes."""
+
+    def _recipient_ids(self):
+        return list(self.order_by().values_list('recipient_id', flat=True).distinct())
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        unread.invalidate(obj.recipient_id for obj in objs)
+        search.index_messages([obj.pk for obj in objs])
+        return objs
+
+    def update(self, **kwargs):
+        counted = not unread.COUNTED_FIELDS.isdisjoint(kwargs)
+        searched = not search.INDEXED_FIELDS.isdisjoint(kwargs)
+        recipient_ids = self._recipient_ids() if counted else []
+        message_ids = list(self.values_list('pk', flat=True)) if searched else []
+        rows = super().update(**kwargs)
+        if counted:
+            unread.invalidate(recipient_ids + ([kwargs['recipient'].pk] if 'recipient' in kwargs else []))
+        search.index_messages(message_ids)
+        return rows
+
+    def delete(self):
+        recipient_ids = self._recipient_ids()
+        result = super().delete()
+        unread.invalidate(recipient_ids)
+        return result
+
+    delete.queryset_only = True
+
+    def in_thread(self, thread_id):
+        """Every message of the conversation started by message ``thread_id``."""
+        return self.filter(models.Q(pk=thread_id) | models.Q(thread_root_id=thread_id))
+
 
 class Message(models.Model):
     sender = models.ForeignKey(
@@ -26,12 +64,44 @@ class Message(models.Model):
         on_delete=models.SET_NULL,
         related_name='replies'
     )
+    # First message of the conversation, so a whole thread loads with one
+    # indexed query. None on the first message itself.
+    thread_root = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='thread_messages'
+    )
 
     class Meta:
         default_permissions = ('add', 'change', 'delete', 'view')
         permissions = [
             # e.g., ('mark_as_read', 'Can mark messages as read'),
         ]
+        indexes = [
+            # Inbox and sent lists, paginated on (timestamp, id) newest first.
+            models.Index(fields=['recipient', 'is_archived', '-timestamp'], name='message_inbox_idx'),
+            models.Index(fields=['sender', '-timestamp'], name='message_sent_idx'),
+        ]
+
+    objects = MessageQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.subject[:50]}... from {self.sender.username}"
+
+    @property
+    def thread_id(self):
+        return self.thread_root_id or self.pk
+
+    def save(self, *args, **kwargs):
+        if self.reply_to_id and self.thread_root_id is None:
+            self.thread_root_id = self.reply_to.thread_id
+        super().save(*args, **kwargs)
+        unread.invalidate([self.recipient_id])
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        unread.invalidate([self.recipient_id])
+        return result
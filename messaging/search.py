@@ -0,0 +1,192 @@
+"""
+Full-text search over message subjects, bodies and the sender and recipient
+names.
+
+On PostgreSQL ``messaging_message.search_vector`` is a ``tsvector`` with a
+GIN index, created by migration 0005: subject weighted A, sender B, recipient
+C and body D. It cannot be a generated column because the names live in the
+user table, so ``index_messages`` refreshes it. On SQLite, used in
+development, an FTS5 table ``messaging_message_fts`` with one column per part
+is refreshed the same way. Other backends fall back to ``icontains``.
+
+``index_messages`` is called by the signal handlers in ``messaging.signals``
+and by ``MessageQuerySet.bulk_create`` and ``update``. Renaming a user does
+not reindex their messages; run ``rebuild_search_index`` afterwards if that
+matters.
+
+The inbox searches the sender's name and the sent list the recipient's, so
+a user's own name never matches all of their messages.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'messaging_message_fts'
+
+# Message fields that feed the index.
+INDEXED_FIELDS = frozenset({'subject', 'body', 'sender', 'sender_id', 'recipient', 'recipient_id'})
+
+# Snippet markers around matched words; ``highlight`` turns them into <mark>.
+MATCH_START = '\x02'
+MATCH_STOP = '\x03'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# tsvector weight and FTS5 column of the name searched for each party.
+PARTIES = {
+    'sender': ('B', 'sender'),
+    'recipient': ('C', 'recipient'),
+}
+
+# ts_rank weights for D, C, B, A: body, recipient, sender, subject.
+PG_RANK_WEIGHTS = '{0.1, 0.4, 0.4, 1.0}'
+
+# Whether the FTS5 table exists, per SQLite database file.
+_fts5_tables = {}
+
+
+def _fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    name = connection.settings_dict['NAME']
+    if name not in _fts5_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts5_tables[name] = cursor.fetchone() is not None
+    return _fts5_tables[name]
+
+
+def fts5_match_expression(query, party):
+    """
+    A safe FTS5 MATCH expression: every word quoted and prefix-matched, all
+    words required, and only the subject, body and ``party`` columns searched.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    words = ' '.join(f'"{token}"*' for token in tokens)
+    return f'{{subject body {PARTIES[party][1]}}} : ({words})'
+
+
+def pg_tsquery_expression(query, party):
+    """The ``to_tsquery`` input for ``query``: prefix-matched words, all required, limited to the searched weights."""
+    weights = f'A{PARTIES[party][0]}D'
+    return ' & '.join(f"'{token}':*{weights}" for token in _TOKEN_RE.findall(query))
+
+
+def icontains_search(queryset, query, party):
+    return queryset.filter(
+        Q(subject__icontains=query) | Q(body__icontains=query) | Q(**{f'{party}__username__icontains': query})
+    ).annotate(
+        search_rank=Value(0.0, output_field=FloatField()),
+        search_snippet=Value('', output_field=TextField()),
+    )
+
+
+def search_messages(queryset, query, party):
+    """
+    Filter ``queryset`` to messages matching ``query`` in the subject, body or
+    the name of ``party`` ('sender' or 'recipient'). Annotates ``search_rank``
+    (higher is more relevant) and ``search_snippet``, an excerpt of the body
+    with matches between MATCH_START and MATCH_STOP. Ordered by rank, then
+    newest first.
+    """
+    if connection.vendor == 'postgresql':
+        expression = pg_tsquery_expression(query, party)
+        if not expression:
+            return queryset.none()
+        tsquery = "to_tsquery('english', %s)"
+        queryset = queryset.alias(
+            search_match=RawSQL(f'"messaging_message"."search_vector" @@ {tsquery}', [expression],
+                                output_field=BooleanField())
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                f'ts_rank(%s, "messaging_message"."search_vector", {tsquery})', [PG_RANK_WEIGHTS, expression],
+                output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"ts_headline('english', \"messaging_message\".\"body\", {tsquery}, %s)",
+                [expression, f'StartSel={MATCH_START}, StopSel={MATCH_STOP}, MinWords=8, MaxWords=24'],
+                output_field=TextField(),
+            ),
+        )
+    elif _fts5_available():
+        match = fts5_match_expression(query, party)
+        if not match:
+            return queryset.none()
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = "messaging_message"."id"', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            # bm25() is lower for better matches: subject counts ten times the body, names five times.
+            select={
+                'search_rank': f'-bm25({FTS_TABLE}, 10.0, 1.0, 5.0, 5.0)',
+                'search_snippet': f"snippet({FTS_TABLE}, 1, '{MATCH_START}', '{MATCH_STOP}', '…', 16)",
+            },
+        )
+    else:
+        queryset = icontains_search(queryset, query, party)
+    return queryset.order_by('-search_rank', '-timestamp', '-id')
+
+
+PG_REINDEX = """
+    UPDATE messaging_message AS m SET search_vector =
+        setweight(to_tsvector('english', coalesce(m.subject, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(s.username, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(r.username, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(m.body, '')), 'D')
+    FROM {users} AS s, {users} AS r
+    WHERE s.id = m.sender_id AND r.id = m.recipient_id
+"""
+SQLITE_REINDEX = (
+    'INSERT INTO ' + FTS_TABLE + ' (rowid, subject, body, sender, recipient) '
+    'SELECT m.id, m.subject, m.body, s.username, r.username FROM messaging_message AS m '
+    'JOIN {users} AS s ON s.id = m.sender_id JOIN {users} AS r ON r.id = m.recipient_id'
+)
+
+
+def _reindex(message_ids=None):
+    """Recompute the index entries of ``message_ids``, or of every message if None."""
+    users = get_user_model()._meta.db_table
+    params = []
+    if message_ids is not None:
+        params = list(message_ids)
+        placeholders = ', '.join(['%s'] * len(params))
+    if connection.vendor == 'postgresql':
+        sql = PG_REINDEX.format(users=users)
+        if params:
+            sql += f' AND m.id IN ({placeholders})'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+    elif _fts5_available():
+        sql = SQLITE_REINDEX.format(users=users)
+        with connection.cursor() as cursor:
+            if params:
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', params)
+                sql += f' WHERE m.id IN ({placeholders})'
+            else:
+                cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(sql, params)
+
+
+def index_messages(message_ids):
+    """Refresh the search index entries of the given messages, a fixed number of statements however many."""
+    message_ids = [pk for pk in message_ids if pk is not None]
+    if message_ids:
+        _reindex(message_ids)
+
+
+def unindex_message(message_pk):
+    if not _fts5_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [message_pk])
+
+
+def rebuild_search_index():
+    """Reindex every message, e.g. after renaming users or loading data that bypassed the ORM."""
+    _reindex()
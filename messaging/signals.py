@@ -0,0 +1,38 @@
+# messaging/signals.py
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Message
+from .search import INDEXED_FIELDS, index_messages, unindex_message
+
+
+@receiver(post_save, sender=Message)
+def update_message_search_index(sender, instance, update_fields=None, **kwargs):
+    # Saves that only touch flags such as is_read leave the index as it is.
+    if update_fields is not None and INDEXED_FIELDS.isdisjoint(update_fields):
+        return
+    index_messages([instance.pk])
+
+
+@receiver(post_delete, sender=Message)
+def remove_message_search_index(sender, instance, **kwargs):
+    unindex_message(instance.pk)
+
+
+@receiver(pre_delete, sender=Message)
+def reroot_thread(sender, instance, origin=None, **kwargs):
+    """
+    Deleting the first message of a thread makes its earliest surviving reply
+    the new root, so the rest of the conversation stays together.
+    """
+    replies = Message.objects.filter(thread_root=instance.pk)
+    if isinstance(origin, QuerySet) and origin.model is Message:
+        # Messages deleted along with this one cannot take over the thread.
+        replies = replies.exclude(pk__in=origin.values('pk'))
+    new_root = replies.order_by('timestamp', 'pk').values_list('pk', flat=True).first()
+    if new_root is None:
+        return
+    replies.exclude(pk=new_root).update(thread_root=new_root)
+    Message.objects.filter(pk=new_root).update(thread_root=None)
@@ -0,0 +1,17 @@
+# messaging/templatetags/messaging_extras.py
+
+from django import template
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from messaging.search import MATCH_START, MATCH_STOP
+
+register = template.Library()
+
+
+@register.filter
+def highlight(snippet):
+    """Escape a search snippet and wrap its matched words in <mark>."""
+    if not snippet:
+        return ''
+    return mark_safe(escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_STOP, '</mark>'))
@@ -1,6 +1,9 @@
-from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from django.contrib.auth.models import AnonymousUser
+from messaging.checks import check_shared_cache
 from messaging.context_processors import unread_messages_count
 from messaging.models import Message
 
@@ -9,6 +12,7 @@ User = get_user_model()
 
 class UnreadMessagesCountContextProcessorTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.factory = RequestFactory()
         # Create two users: one for sender and one for recipient.
         self.recipient = User.objects.create_user(username='recipient', password='secret')
@@ -62,3 +66,55 @@ class UnreadMessagesCountContextProcessorTest(TestCase):
 
         context = unread_messages_count(request)
         self.assertEqual(context['unread_messages_count'], 0)
+
+    def count(self):
+        request = self.factory.get('/')
+        request.user = self.recipient
+        return unread_messages_count(request)['unread_messages_count']
+
+    def send(self, **kwargs):
+        return Message.objects.create(sender=self.sender, recipient=self.recipient, subject="Hi", body="Hi", **kwargs)
+
+    def test_count_is_lazy_and_cached(self):
+        self.send()
+        with self.assertNumQueries(0):
+            count = self.count()
+        with self.assertNumQueries(1):
+            self.assertEqual(count, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.count(), 1)
+
+    def test_writes_refresh_the_count(self):
+        first = self.send()
+        second = self.send()
+        self.assertEqual(self.count(), 2)
+
+        self.client.login(username='recipient', password='secret')
+        self.client.get(reverse('message_detail', args=[first.pk]))
+        self.assertEqual(self.count(), 1)
+
+        self.client.post(reverse('archive_message', args=[second.pk]))
+        self.assertEqual(self.count(), 0)
+
+        Message.objects.bulk_create([
+            Message(sender=self.sender, recipient=self.recipient, subject="Bulk", body="Bulk") for _ in range(3)
+        ])
+        self.assertEqual(self.count(), 3)
+
+        Message.objects.filter(recipient=self.recipient, is_read=False).update(is_read=True)
+        self.assertEqual(self.count(), 0)
+
+        Message.objects.filter(recipient=self.recipient).update(is_read=False, is_archived=False)
+        self.assertEqual(self.count(), 5)
+
+        Message.objects.filter(subject="Bulk").delete()
+        self.assertEqual(self.count(), 2)
+
+    def test_deploy_check_requires_a_shared_cache(self):
+        local = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                              'LOCATION': 'redis://localhost:6379'}}
+        with override_settings(CACHES=local):
+            self.assertEqual([w.id for w in check_shared_cache(None)], ['messaging.W001'])
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_cache(None), [])
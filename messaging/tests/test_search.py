@@ -0,0 +1,110 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from messaging.models import Message
+from messaging.search import fts5_match_expression, search_messages
+from messaging.templatetags.messaging_extras import highlight
+
+User = get_user_model()
+
+
+class MessageSearchTest(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="secret")
+        self.bob = User.objects.create_user(username="bob", password="secret")
+        self.carol = User.objects.create_user(username="carol", password="secret")
+
+    def send(self, sender, recipient, subject, body):
+        return Message.objects.create(sender=sender, recipient=recipient, subject=subject, body=body)
+
+    def inbox(self, user, query):
+        return list(search_messages(Message.objects.filter(recipient=user), query, 'sender'))
+
+    def test_matches_subject_body_and_sender(self):
+        in_body = self.send(self.bob, self.alice, "Catch up", "The quarterly budget is attached.")
+        in_subject = self.send(self.carol, self.alice, "Budget review", "See you then.")
+        self.send(self.bob, self.alice, "Lunch", "Pizza?")
+        self.assertEqual(self.inbox(self.alice, "budget"), [in_subject, in_body])
+        self.assertEqual(len(self.inbox(self.alice, "carol")), 1)
+
+    def test_own_name_does_not_match(self):
+        self.send(self.bob, self.alice, "Hello", "Hi there.")
+        self.assertEqual(self.inbox(self.alice, "alice"), [])
+        sent = search_messages(Message.objects.filter(sender=self.bob), "alice", 'recipient')
+        self.assertEqual(sent.count(), 1)
+
+    def test_all_words_must_match(self):
+        both = self.send(self.bob, self.alice, "Release notes", "Draft for the mobile release.")
+        self.send(self.bob, self.alice, "Release party", "Friday.")
+        self.assertEqual(self.inbox(self.alice, "release mobile"), [both])
+
+    def test_snippet_highlights_matches(self):
+        self.send(self.bob, self.alice, "Notes", "Please review the <b>budget</b> before Friday.")
+        message, = search_messages(Message.objects.all(), "budget", 'sender')
+        self.assertIn("\x02budget\x03", message.search_snippet)
+        self.assertEqual(
+            highlight(message.search_snippet), "Please review the &lt;b&gt;<mark>budget</mark>&lt;/b&gt; before Friday."
+        )
+
+    def test_index_follows_edits_bulk_writes_and_deletes(self):
+        message = self.send(self.bob, self.alice, "Atlas", "Old text.")
+        message.subject = "Zenith"
+        message.save()
+        self.assertEqual(self.inbox(self.alice, "atlas"), [])
+        self.assertEqual(self.inbox(self.alice, "zenith"), [message])
+
+        Message.objects.filter(pk=message.pk).update(body="Now about comets.")
+        self.assertEqual(self.inbox(self.alice, "comets"), [message])
+
+        Message.objects.bulk_create([Message(sender=self.carol, recipient=self.alice, subject="Bulk", body="Nebula")])
+        self.assertEqual(len(self.inbox(self.alice, "nebula")), 1)
+
+        Message.objects.filter(recipient=self.alice).delete()
+        self.assertEqual(self.inbox(self.alice, "zenith"), [])
+
+    def test_flag_saves_do_not_reindex(self):
+        message = self.send(self.bob, self.alice, "Atlas", "Old text.")
+        self.client.login(username="alice", password="secret")
+        with mock.patch('messaging.signals.index_messages') as index:
+            self.client.get(reverse('message_detail', args=[message.pk]))
+            self.client.post(reverse('archive_message', args=[message.pk]))
+            index.assert_not_called()
+            message.subject = "Zenith"
+            message.save(update_fields=['subject'])
+            index.assert_called_once_with([message.pk])
+        message.refresh_from_db()
+        self.assertTrue(message.is_read and message.is_archived)
+
+    def test_match_expression_neutralises_operators(self):
+        self.assertEqual(fts5_match_expression('NEAR("x" OR y*)', 'sender'),
+                         '{subject body sender} : ("NEAR"* "x"* "OR"* "y"*)')
+        self.assertEqual(fts5_match_expression('  --  ', 'sender'), '')
+        self.assertFalse(search_messages(Message.objects.all(), '--', 'sender').exists())
+
+    def test_inbox_search_is_ranked_and_paginated(self):
+        for n in range(30):
+            self.send(self.bob, self.alice, f"Report {n}", "Weekly numbers.")
+        top = self.send(self.carol, self.alice, "Report report", "Weekly report numbers.")
+        self.client.login(username="alice", password="secret")
+
+        response = self.client.get(reverse('inbox'), {'q': 'report'})
+        page = response.context['page_obj']
+        self.assertEqual(page.paginator.count, 31)
+        self.assertEqual(len(page), 25)
+        self.assertEqual(page[0], top)
+        self.assertContains(response, "<mark>report</mark>")
+
+        response = self.client.get(reverse('inbox'), {'q': 'report', 'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 6)
+
+    def test_sent_search_covers_body_and_recipient(self):
+        to_carol = self.send(self.alice, self.carol, "Hi", "Weather is nice.")
+        about_weather = self.send(self.alice, self.bob, "Hi", "Weather report.")
+        self.client.login(username="alice", password="secret")
+        response = self.client.get(reverse('sent_messages'), {'q': 'carol'})
+        self.assertEqual(list(response.context['page_obj']), [to_carol])
+        response = self.client.get(reverse('sent_messages'), {'q': 'weather report'})
+        self.assertEqual(list(response.context['page_obj']), [about_weather])
@@ -1,4 +1,9 @@
+import base64
+import json
+
+from django.db import connection
 from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -127,3 +132,136 @@ class MessagingViewsTest(TestCase):
         self.message.refresh_from_db()
         self.assertTrue(self.message.is_archived)
         self.assertRedirects(response, reverse('inbox'))
+
+
+class MessageListPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="secret")
+        self.senders = [User.objects.create_user(username=f"sender{n}", password="secret") for n in range(3)]
+        self.client.login(username="reader", password="secret")
+
+    def receive(self, count):
+        return [
+            Message.objects.create(
+                sender=self.senders[n % 3], recipient=self.user, subject=f"Message {n}", body="Long body " * 100,
+            )
+            for n in range(count)
+        ]
+
+    def test_inbox_pages_by_cursor_newest_first(self):
+        received = self.receive(30)
+        first = self.client.get(reverse('inbox'))
+        page = first.context['page_obj']
+        self.assertEqual([m.pk for m in page], [m.pk for m in reversed(received)][:25])
+        self.assertTrue(page.has_next())
+
+        second = self.client.get(reverse('inbox'), {'cursor': page.next_cursor})
+        self.assertEqual([m.pk for m in second.context['page_obj']], [m.pk for m in reversed(received)][25:])
+        self.assertFalse(second.context['page_obj'].has_next())
+
+    def test_list_rows_leave_out_the_body(self):
+        self.receive(3)
+        response = self.client.get(reverse('inbox'))
+        message = response.context['page_obj'][0]
+        self.assertIn('body', message.get_deferred_fields())
+        self.assertEqual(message.sender.username, "sender2")
+
+    def test_query_count_does_not_depend_on_senders(self):
+        self.receive(3)
+        self.client.get(reverse('inbox'))
+        # session, user, page; the unread badge comes from the cache
+        with self.assertNumQueries(3):
+            self.client.get(reverse('inbox'))
+        self.receive(20)
+        self.client.get(reverse('inbox'))
+        with self.assertNumQueries(3):
+            self.client.get(reverse('inbox'))
+
+    def test_sent_messages_are_paginated(self):
+        sent = [
+            Message.objects.create(sender=self.user, recipient=self.senders[0], subject=f"Out {n}", body="Body")
+            for n in range(27)
+        ]
+        page = self.client.get(reverse('sent_messages')).context['page_obj']
+        self.assertEqual(len(page), 25)
+        self.assertEqual(page[0].recipient.username, "sender0")
+        older = self.client.get(reverse('sent_messages'), {'cursor': page.next_cursor}).context['page_obj']
+        self.assertEqual([m.pk for m in older], [sent[1].pk, sent[0].pk])
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get(reverse('inbox'), {'cursor': 'garbage'}).status_code, 404)
+        raw = json.dumps({'k': ["notadate", 1], 'd': 'next'}).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip('=')
+        self.assertEqual(self.client.get(reverse('sent_messages'), {'cursor': cursor}).status_code, 404)
+
+
+class MessageThreadTest(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="secret")
+        self.bob = User.objects.create_user(username="bob", password="secret")
+        self.root = Message.objects.create(sender=self.alice, recipient=self.bob, subject="Plan", body="First")
+
+    def reply(self, user, message, body):
+        self.client.login(username=user.username, password="secret")
+        self.client.post(reverse('reply_message', args=[message.pk]), {'subject': "Re: Plan", 'body': body})
+        return Message.objects.get(body=body)
+
+    def test_replies_record_their_thread(self):
+        first = self.reply(self.bob, self.root, "Second")
+        second = self.reply(self.alice, first, "Third")
+        self.assertEqual(first.reply_to, self.root)
+        self.assertEqual(first.thread_root, self.root)
+        self.assertEqual(second.reply_to, first)
+        self.assertEqual(second.thread_root, self.root)
+        self.assertIsNone(self.root.thread_root)
+
+    def test_thread_is_loaded_in_order_with_one_query(self):
+        message = self.root
+        for n in range(4):
+            message = self.reply(self.bob if n % 2 == 0 else self.alice, message, f"Reply {n}")
+        Message.objects.create(sender=self.bob, recipient=self.alice, subject="Other", body="Unrelated")
+        Message.objects.filter(recipient=self.alice).update(is_read=True)
+
+        self.client.login(username="alice", password="secret")
+        self.client.get(reverse('message_thread', args=[message.pk]))
+        # session, user, the message, the thread
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('message_thread', args=[message.pk]))
+        self.assertEqual(
+            [m.body for m in response.context['thread']], ["First", "Reply 0", "Reply 1", "Reply 2", "Reply 3"]
+        )
+        self.assertNotContains(response, "Unrelated")
+
+    def test_unread_messages_are_marked_read_in_one_update(self):
+        first = self.reply(self.bob, self.root, "Second")
+        second = Message.objects.create(
+            sender=self.bob, recipient=self.alice, subject="Re: Plan", body="Third", reply_to=first
+        )
+        self.client.login(username="alice", password="secret")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('message_thread', args=[self.root.pk]))
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "messaging_message"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(response.context['unread'], {first.pk, second.pk})
+        self.assertFalse(Message.objects.filter(recipient=self.alice, is_read=False).exists())
+        # Bob's own unread messages are not touched by Alice reading the thread.
+        self.assertFalse(Message.objects.get(pk=self.root.pk).is_read)
+
+    def test_deleting_the_root_promotes_the_earliest_reply(self):
+        first = self.reply(self.bob, self.root, "Second")
+        second = self.reply(self.alice, first, "Third")
+        third = self.reply(self.bob, second, "Fourth")
+        self.root.delete()
+        self.assertEqual(
+            list(Message.objects.order_by('pk').values_list('thread_root', flat=True)), [None, first.pk, first.pk]
+        )
+        self.assertEqual(list(Message.objects.in_thread(first.pk).order_by('pk')), [first, second, third])
+
+        # Replies deleted in the same call are passed over.
+        Message.objects.filter(pk__in=[first.pk, second.pk]).delete()
+        self.assertIsNone(Message.objects.get(pk=third.pk).thread_root)
+
+    def test_outsiders_cannot_open_a_thread(self):
+        User.objects.create_user(username="eve", password="secret")
+        self.client.login(username="eve", password="secret")
+        self.assertEqual(self.client.get(reverse('message_thread', args=[self.root.pk])).status_code, 404)
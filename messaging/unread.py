@@ -0,0 +1,42 @@
+"""
+Per-user unread message counter kept in the cache.
+
+``unread_count(user)`` counts on a miss and caches the result. Every write
+that can change a count (see ``Message.save`` and ``MessageQuerySet``) calls
+``invalidate`` for the recipients involved, so the next read counts again.
+The key is deleted again once the transaction commits, in case a concurrent
+request re-cached the old count in between.
+
+Deleting a key only reaches processes that share the cache, so deployments
+with several workers need a shared backend; see ``CACHES`` in the settings.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_TIMEOUT = getattr(settings, 'MESSAGING_UNREAD_CACHE_TIMEOUT', 60 * 60)
+
+# Message fields whose change can move a message in or out of a user's count.
+COUNTED_FIELDS = frozenset({'recipient', 'recipient_id', 'is_read', 'is_archived'})
+
+
+def cache_key(user_id):
+    return f'messaging:unread:{user_id}'
+
+
+def unread_count(user):
+    key = cache_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = user.received_messages.filter(is_archived=False, is_read=False).count()
+        cache.set(key, count, CACHE_TIMEOUT)
+    return count
+
+
+def invalidate(user_ids):
+    keys = [cache_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -9,5 +9,6 @@ urlpatterns = [
     path('send/', views.CreateMessageView.as_view(), name='send_message'),
     path('<int:pk>/reply/', views.ReplyMessageView.as_view(), name='reply_message'),
     path('<int:pk>/', views.MessageDetailView.as_view(), name='message_detail'),
+    path('<int:pk>/thread/', views.MessageThreadView.as_view(), name='message_thread'),
     path('<int:pk>/archive/', views.ArchiveMessageView.as_view(), name='archive_message'),
 ]
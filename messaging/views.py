@@ -2,12 +2,15 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db.models import Q
+from django.http import Http404
 from django.views import View
 from django.views.generic import CreateView, ListView, DetailView
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.contrib.auth.decorators import login_required, permission_required
+from assignment_5.pagination import CursorPaginator, InvalidCursor
 from .models import Message
+from .search import search_messages
 from .forms import MessageForm, ReplyMessageForm
 
 
@@ -52,10 +55,36 @@ class MessageDetailView(LoginRequiredMixin, DetailView):
         # Mark as read only if the current user is the recipient and it's unread.
         if message.recipient == request.user and not message.is_read:
             message.is_read = True
-            message.save()
+            message.save(update_fields=['is_read'])
         return response
 
 
+class MessageThreadView(LoginRequiredMixin, View):
+    """
+    The whole conversation a message belongs to, oldest first. The thread is
+    loaded with one query on ``thread_root`` and the user's unread messages in
+    it are marked read with one update.
+    """
+    template_name = 'messaging/message_thread.html'
+
+    def get(self, request, pk, *args, **kwargs):
+        own = Q(recipient=request.user) | Q(sender=request.user)
+        message = get_object_or_404(Message.objects.filter(own).only('pk', 'thread_root_id'), pk=pk)
+        thread = list(
+            Message.objects.in_thread(message.thread_id).filter(own)
+            .select_related('sender', 'recipient').order_by('timestamp', 'id')
+        )
+        unread = [m.pk for m in thread if m.recipient_id == request.user.pk and not m.is_read]
+        if unread:
+            Message.objects.filter(pk__in=unread).update(is_read=True)
+        return render(request, self.template_name, {
+            'thread': thread,
+            'unread': set(unread),
+            'current': message.pk,
+            'latest_received': next((m for m in reversed(thread) if m.recipient_id == request.user.pk), None),
+        })
+
+
 class ReplyMessageView(LoginRequiredMixin, CreateView):
     model = Message
     form_class = ReplyMessageForm
@@ -85,6 +114,7 @@ class ReplyMessageView(LoginRequiredMixin, CreateView):
         reply = form.save(commit=False)
         reply.sender = self.request.user
         reply.recipient = self.original_message.sender
+        reply.reply_to = self.original_message
         reply.save()
         self.object = reply  # Set self.object so get_success_url() can access it
         messages.success(self.request, "Your reply has been sent.")
@@ -96,34 +126,66 @@ class ReplyMessageView(LoginRequiredMixin, CreateView):
         return context
 
 
+class MessageListMixin:
+    """
+    Keyset pagination on (timestamp, id), newest first, for the message lists.
+    Rows carry only the columns the list shows, never the body, plus the
+    username of ``other_party`` (the sender or recipient) in the same query.
+    Searches over the subject, body and the other party's name are ordered by
+    relevance and use numbered pages instead.
+    """
+    paginate_by = 25
+    other_party = None
+    list_fields = ('id', 'subject', 'timestamp', 'is_read', 'is_archived')
+
+    def uses_cursor_pagination(self):
+        return not self.request.GET.get('q')
+
+    def get_queryset(self):
+        queryset = Message.objects.filter(**self.get_filters()).select_related(self.other_party).only(
+            *self.list_fields, f'{self.other_party}__username'
+        )
+        query = self.request.GET.get('q', '')
+        if query:
+            queryset = search_messages(queryset, query, self.other_party)
+        return queryset
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, ordering=('-timestamp', '-id'))
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = self.uses_cursor_pagination()
+        return context
+
+
 # 2. InboxView: For listing received messages
-class InboxView(LoginRequiredMixin, ListView):
+class InboxView(LoginRequiredMixin, MessageListMixin, ListView):
     model = Message
     template_name = 'messaging/inbox.html'
     context_object_name = 'messages'
+    other_party = 'sender'
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(recipient=self.request.user, is_archived=False)
-        query = self.request.GET.get('q', '')
-        if query:
-            qs = qs.filter(subject__icontains=query) | qs.filter(sender__username__icontains=query)
-        return qs.order_by('-timestamp')
+    def get_filters(self):
+        return {'recipient': self.request.user, 'is_archived': False}
 
 
 # 3. SentMessagesView: For listing messages sent by the user
-class SentMessagesView(LoginRequiredMixin, ListView):
+class SentMessagesView(LoginRequiredMixin, MessageListMixin, ListView):
     model = Message
     template_name = 'messaging/sent_messages.html'
     context_object_name = 'messages'
+    other_party = 'recipient'
 
-    def get_queryset(self):
-        # Filter messages where the current user is the sender, ordered by timestamp descending
-        queryset = Message.objects.filter(sender=self.request.user).order_by('-timestamp')
-        query = self.request.GET.get('q', '')
-        if query:
-            queryset = queryset.filter(subject__icontains=query)
-        return queryset
+    def get_filters(self):
+        return {'sender': self.request.user}
 
 
 # 4. Archive Message: Function-based view to archive a message
@@ -132,5 +194,5 @@ class ArchiveMessageView(LoginRequiredMixin, View):
         # Retrieve the message ensuring that the current user is the recipient.
         message = get_object_or_404(Message, pk=pk, recipient=request.user)
         message.is_archived = True
-        message.save()
+        message.save(update_fields=['is_archived'])
         return redirect('inbox')
@@ -0,0 +1,103 @@
+"""
+What the current user may do with a project, resolved once per request.
+
+``project_access(request)`` returns the request's ProjectAccessResolver and
+``get(project)`` the user's ProjectAccess for a project. Ownership and public
+visibility are read from the project itself; the user's membership role is
+only queried when a check needs it, once per project per request.
+``resolve(projects)`` fetches the roles for a whole page of projects in one
+query up front. Views check rights through it and templates use the
+``{% project_access %}`` tag, so a page never asks the database twice.
+
+Owners may delete and archive their projects. Other users may do so only if
+they hold the ``projects.delete_project`` or ``projects.archive_project``
+permission.
+"""
+
+from functools import cached_property
+
+from .models import ProjectMembership
+
+
+class ProjectAccess:
+    def __init__(self, resolver, project):
+        self.resolver = resolver
+        self.user = resolver.user
+        self.project = project
+
+    @cached_property
+    def role(self):
+        """The user's ProjectMembership role, or None; only queried if a check needs it."""
+        return self.resolver.role(self.project)
+
+    @cached_property
+    def is_owner(self):
+        return self.project.owner_id is not None and self.project.owner_id == self.user.pk
+
+    @cached_property
+    def is_member(self):
+        return self.is_owner or self.role is not None
+
+    @cached_property
+    def is_stakeholder(self):
+        return self.is_member and not self.is_owner
+
+    @cached_property
+    def can_view(self):
+        return self.project.is_public or self.is_member
+
+    @cached_property
+    def can_manage(self):
+        """Add and edit tasks: the owner and the stakeholders."""
+        return self.is_member
+
+    @cached_property
+    def can_request_join(self):
+        return self.project.is_public and not self.is_member
+
+    @cached_property
+    def can_delete(self):
+        # A global permission only applies to projects the user can see.
+        return self.can_view and (self.is_owner or self.user.has_perm('projects.delete_project'))
+
+    @cached_property
+    def can_archive(self):
+        return self.can_view and (self.is_owner or self.user.has_perm('projects.archive_project'))
+
+
+class ProjectAccessResolver:
+    def __init__(self, user):
+        self.user = user
+        self._roles = {}
+        self._access = {}
+
+    def resolve(self, projects):
+        """Look up the user's role in every project in ``projects`` with at most one query."""
+        pks = [project.pk for project in projects if project.pk not in self._roles]
+        if not pks:
+            return
+        roles = {}
+        if self.user.is_authenticated:
+            roles = dict(
+                ProjectMembership.objects.filter(user=self.user, project_id__in=pks).values_list('project_id', 'role')
+            )
+        for pk in pks:
+            self._roles[pk] = roles.get(pk)
+
+    def role(self, project):
+        if project.pk not in self._roles:
+            self.resolve([project])
+        return self._roles[project.pk]
+
+    def get(self, project):
+        if project.pk not in self._access:
+            self._access[project.pk] = ProjectAccess(self, project)
+        return self._access[project.pk]
+
+
+def project_access(request):
+    """The ProjectAccessResolver for ``request``, created on first use."""
+    resolver = getattr(request, '_project_access', None)
+    if resolver is None:
+        resolver = request._project_access = ProjectAccessResolver(request.user)
+    return resolver
@@ -0,0 +1,284 @@
+"""
+Buffered recording of project activity.
+
+Views call ``record_activity()`` instead of ``ProjectActivity.objects.create()``,
+inside the ``activity_transaction()`` block that makes the change the event
+describes. The block is ``transaction.atomic()`` plus one step: just before it
+commits, the events recorded in it are written to the PendingActivity outbox
+with one ``bulk_create``, so they commit or roll back with the change. Once
+the transaction commits, the events are held for the rest of the request by
+``ActivityBufferMiddleware`` and moved to ProjectActivity together with the
+request's other events when the request finishes: one delete from the outbox
+and one ``bulk_create`` in a single transaction. Outside a buffer, e.g. in the
+shell or a management command, events are moved as soon as their transaction
+commits. If that move fails, or the process dies before it, the events stay in
+the outbox and ``manage.py drain_activity`` moves them later.
+
+The change an event describes bumps its project's ``cache_version`` in the
+same transaction, so moving the event right after the commit does not bump it
+again; a page rendered between the two can cache the activity tab without the
+event until the project next changes. ``drain_activity`` runs later and does
+bump.
+
+``record_activity()`` outside an ``activity_transaction()`` block, or in an
+``atomic()`` block nested inside one, writes its outbox row straight away in
+the current transaction instead, so it still rolls back with its block.
+
+If ``PROJECT_ACTIVITY_DEFERRED`` is set, requests only write the outbox and
+``manage.py drain_activity`` moves the events, which takes the activity table
+write, coalescing and cache invalidation out of the request.
+
+Event types listed in ``PROJECT_ACTIVITY_COALESCE_WINDOWS`` are coalesced on
+write: a repeat of the same event on the same task by the same user within the
+window updates the existing row's ``occurrences`` and timestamp instead of
+adding a row.
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import PendingActivity, Project, ProjectActivity
+
+_local = threading.local()
+
+
+def deferred():
+    return getattr(settings, 'PROJECT_ACTIVITY_DEFERRED', False)
+
+
+def record_activity(project, event_type, created_by=None, payload=None, title='', description=''):
+    """
+    Queue an activity event for ``project``; see the module docstring for when
+    it is written. The acting user's name is added to the payload as ``actor``.
+    """
+    payload = dict(payload or {})
+    if created_by is not None:
+        payload.setdefault('actor', created_by.get_username())
+    activity = ProjectActivity(
+        project=project, event_type=event_type, payload=payload,
+        title=title, description=description, created_by=created_by,
+    )
+    blocks = getattr(_local, 'blocks', None)
+    if blocks and blocks[-1][0] == len(connection.savepoint_ids):
+        blocks[-1][1].append(activity)
+    else:
+        _write_outbox([activity])
+    return activity
+
+
+def task_payload(task, /, **extra):
+    return {'task': task.pk, 'task_title': task.title, **extra}
+
+
+def task_status(is_complete):
+    return ProjectActivity.TaskStatus.COMPLETE if is_complete else ProjectActivity.TaskStatus.PENDING
+
+
+@contextmanager
+def activity_transaction():
+    """
+    ``transaction.atomic()`` that writes the events recorded directly inside it
+    to the outbox in one statement just before the block commits.
+    """
+    with transaction.atomic():
+        if not hasattr(_local, 'blocks'):
+            _local.blocks = []
+        events = []
+        # Events recorded in a savepoint nested inside this block must roll
+        # back with it, so only those at this depth are collected.
+        _local.blocks.append((len(connection.savepoint_ids), events))
+        try:
+            yield
+        finally:
+            _local.blocks.pop()
+        if events:
+            _write_outbox(events)
+
+
+def _write_outbox(activities):
+    pending = PendingActivity.objects.bulk_create(
+        [PendingActivity(event=_serialize(activity)) for activity in activities]
+    )
+    pks = [row.pk for row in pending]
+    if deferred() or None in pks:
+        # Left for drain_activity.
+        return
+    # robust: a failed write is logged, the events stay in the outbox for drain_activity.
+    transaction.on_commit(lambda: _enqueue(dict(zip(pks, activities))), robust=True)
+
+
+def _enqueue(pending):
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None:
+        write_activities(pending)
+    else:
+        buffer.update(pending)
+
+
+@contextmanager
+def activity_buffer():
+    """Collect the events committed inside the block and write them in one batch on exit."""
+    if getattr(_local, 'buffer', None) is not None:
+        # Already buffering; the outer block writes everything.
+        yield
+        return
+    _local.buffer = {}
+    try:
+        yield
+    finally:
+        buffer, _local.buffer = _local.buffer, None
+        write_activities(buffer)
+
+
+def write_activities(pending):
+    """
+    Move committed events, keyed by their PendingActivity id, from the outbox
+    to ProjectActivity.
+    """
+    if not pending:
+        return
+    with transaction.atomic():
+        deleted, _ = PendingActivity.objects.filter(pk__in=pending).delete()
+        if deleted != len(pending):
+            # drain_activity got to some of them first; leave the rest to it too.
+            transaction.set_rollback(True)
+            return
+        save_activities(list(pending.values()), bump_cache_version=False)
+
+
+def drain_pending_activities(batch_size=500):
+    """
+    Move the events left in the outbox by failed or interrupted requests to
+    ProjectActivity, ``batch_size`` per transaction. Returns the number of
+    outbox rows processed.
+    """
+    drained = 0
+    while True:
+        with transaction.atomic():
+            rows = list(PendingActivity.objects.select_for_update(skip_locked=True)[:batch_size])
+            if not rows:
+                return drained
+            activities = _activities_from_events([row.event for row in rows])
+            if activities:
+                save_activities(activities)
+            PendingActivity.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        drained += len(rows)
+
+
+def save_activities(activities, bump_cache_version=True):
+    """
+    Write ``activities``: coalesce the repeatable ones, insert the rest in one
+    statement and, unless told not to, invalidate the cached fragments of
+    their projects.
+    """
+    # No savepoint when called from write_activities(): it all fails together anyway.
+    with transaction.atomic(savepoint=False):
+        new_activities = coalesce_activities(activities)
+        ProjectActivity.objects.bulk_create(new_activities)
+        if bump_cache_version:
+            Project.objects.filter(pk__in={a.project_id for a in activities}).bump_cache_version()
+
+
+def coalesce_windows():
+    """Seconds within which repeats of an event type are merged, keyed by event type."""
+    return getattr(settings, 'PROJECT_ACTIVITY_COALESCE_WINDOWS', {})
+
+
+def coalesce_activities(activities):
+    """
+    Merge each event into the latest row for the same project, event type,
+    user and task if that row is within the event type's coalescing window,
+    bumping its ``occurrences``. Returns the events that still need inserting.
+    """
+    windows = coalesce_windows()
+    latest = {}
+    merged = {}
+    new_activities = []
+    for activity in activities:
+        window = windows.get(activity.event_type)
+        if not window:
+            new_activities.append(activity)
+            continue
+        since = activity.timestamp - timedelta(seconds=window)
+        task = activity.payload.get('task')
+        key = (activity.project_id, activity.event_type, activity.created_by_id, task)
+        if key in latest:
+            target = latest[key]
+        else:
+            target = (
+                ProjectActivity.objects.select_for_update()
+                .filter(
+                    Q(payload__task=task) if task is not None else ~Q(payload__has_key='task'),
+                    project_id=activity.project_id,
+                    event_type=activity.event_type,
+                    created_by_id=activity.created_by_id,
+                    timestamp__gte=since,
+                )
+                .order_by('-timestamp', '-id').first()
+            )
+
+        if target is not None and target.timestamp >= since:
+            target.occurrences += 1
+            target.timestamp = activity.timestamp
+            target.payload = activity.payload
+            # The newest event's id, so the row can be traced to the event that last touched it.
+            target.event_id = activity.event_id
+            if target.pk is not None:
+                merged[target.pk] = target
+        else:
+            target = activity
+            new_activities.append(activity)
+        latest[key] = target
+
+    if merged:
+        ProjectActivity.objects.bulk_update(merged.values(), ['occurrences', 'timestamp', 'payload', 'event_id'])
+    return new_activities
+
+
+def _serialize(activity):
+    return {
+        'event_id': activity.event_id,
+        'project_id': activity.project_id,
+        'event_type': activity.event_type,
+        'payload': activity.payload,
+        'title': activity.title,
+        'description': activity.description,
+        'timestamp': activity.timestamp,
+        'created_by_id': activity.created_by_id,
+    }
+
+
+def _activities_from_events(rows):
+    """
+    Rebuild ProjectActivity instances from serialized events, dropping those
+    whose project has since been deleted and unsetting deleted users.
+    """
+    project_ids = set(
+        Project.objects.filter(pk__in={r['project_id'] for r in rows}).values_list('pk', flat=True)
+    )
+    user_ids = set(
+        get_user_model().objects.filter(pk__in={r['created_by_id'] for r in rows} - {None})
+        .values_list('pk', flat=True)
+    )
+    return [
+        ProjectActivity(
+            event_id=uuid.UUID(row['event_id']),
+            project_id=row['project_id'],
+            event_type=row.get('event_type', ProjectActivity.EventType.OTHER),
+            payload=row.get('payload', {}),
+            title=row['title'],
+            description=row['description'],
+            timestamp=parse_datetime(row['timestamp']),
+            created_by_id=row['created_by_id'] if row['created_by_id'] in user_ids else None,
+        )
+        for row in rows
+        if row['project_id'] in project_ids
+    ]
@@ -0,0 +1,52 @@
+"""
+Kanban board of a project's tasks.
+
+Tasks fall into exactly one column: complete tasks in ``complete``, and open
+tasks by due date into ``overdue``, ``due_soon`` (due within
+``PROJECT_TASK_DUE_SOON_DAYS``) or ``open``. The columns are plain filters, so
+the counts for all of them come from one conditional aggregate and each column
+is paged on its own over the ``task_board_idx`` index.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+COLUMNS = (
+    ('open', 'Open'),
+    ('due_soon', 'Due soon'),
+    ('overdue', 'Overdue'),
+    ('complete', 'Complete'),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# Newest-due first for finished work, soonest-due first for everything else.
+COLUMN_ORDERING = {
+    'open': ('due_date', 'id'),
+    'due_soon': ('due_date', 'id'),
+    'overdue': ('due_date', 'id'),
+    'complete': ('-due_date', '-id'),
+}
+
+
+def due_soon_days():
+    return getattr(settings, 'PROJECT_TASK_DUE_SOON_DAYS', 7)
+
+
+def column_filters(today=None):
+    today = today or timezone.localdate()
+    due_soon_until = today + timedelta(days=due_soon_days())
+    return {
+        'open': Q(is_complete=False, due_date__gte=due_soon_until),
+        'due_soon': Q(is_complete=False, due_date__gte=today, due_date__lt=due_soon_until),
+        'overdue': Q(is_complete=False, due_date__lt=today),
+        'complete': Q(is_complete=True),
+    }
+
+
+def column_counts(tasks, today=None):
+    """Count ``tasks`` per column in a single query."""
+    filters = column_filters(today)
+    return tasks.aggregate(**{name: Count('pk', filter=filters[name]) for name in COLUMN_NAMES})
@@ -0,0 +1,65 @@
+"""
+The "My Tasks" dashboard: open tasks assigned to a user across their projects.
+
+The task rows come from one query (the user's contacts → ``assigned_to`` →
+open tasks by due date) served by ``task_open_due_idx``, and are cached per
+user. Like the fragment cache, the cache key carries the ``cache_version`` of
+every project the user belongs to; all task writes bump their project's
+version, and joining or leaving a project changes the set, so a stale list is
+never served and nothing has to be deleted.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .fragment_cache import CACHE_TIMEOUT
+from .models import Project, ProjectTask
+
+TASK_FIELDS = ('id', 'title', 'due_date', 'project_id', 'project__name')
+
+
+def cache_key(user):
+    versions = list(
+        Project.objects.filter(memberships__user=user).order_by('pk').values_list('pk', 'cache_version')
+    )
+    digest = hashlib.md5(repr(versions).encode()).hexdigest()
+    return f'projects:my_tasks:{user.pk}:{digest}'
+
+
+def open_tasks_for(user):
+    """Open tasks assigned to ``user`` in projects they belong to, soonest due first."""
+    return list(
+        ProjectTask.objects.filter(
+            assigned_to__contact_user=user, is_complete=False, project__memberships__user=user,
+        )
+        # The user may be reachable through several contacts.
+        .distinct().order_by('due_date', 'id').values(*TASK_FIELDS)
+    )
+
+
+def cached_open_tasks(user):
+    key = cache_key(user)
+    tasks = cache.get(key)
+    if tasks is None:
+        tasks = open_tasks_for(user)
+        cache.set(key, tasks, CACHE_TIMEOUT)
+    return tasks
+
+
+def group_by_project(tasks, today=None):
+    """
+    Group task rows by project, each with its ``overdue`` and ``upcoming``
+    tasks. Projects with overdue work come first, then by earliest due date.
+    Grouping happens after the cache, so tasks move to overdue on the right day.
+    """
+    today = today or timezone.localdate()
+    projects = {}
+    for task in tasks:
+        group = projects.setdefault(task['project_id'], {
+            'id': task['project_id'], 'name': task['project__name'], 'overdue': [], 'upcoming': [],
+        })
+        group['overdue' if task['due_date'] < today else 'upcoming'].append(task)
+    # ``tasks`` is sorted by due date, so insertion order is already earliest-first.
+    return sorted(projects.values(), key=lambda group: not group['overdue'])
@@ -1,7 +1,8 @@
 # projects/forms.py
 
 from django import forms
-from .models import Project, ProjectTask
+from .join_requests import pending_for_owner
+from .models import Project, ProjectJoinRequest, ProjectTask
 from contacts.models import Contact
 
 
@@ -78,3 +79,67 @@ class ProjectTaskForm(forms.ModelForm):
         if project:
             # Restrict the 'assigned_to' field to only the project's stakeholders.
             self.fields['assigned_to'].queryset = project.stakeholders.all()
+
+
+class TaskBulkForm(forms.Form):
+    ACTION_CHOICES = [
+        ('complete', 'Mark complete'),
+        ('reopen', 'Reopen'),
+        ('reassign', 'Reassign'),
+        ('redate', 'Change due date'),
+        ('delete', 'Delete'),
+    ]
+
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=ProjectTask.objects.none(),
+        error_messages={'required': 'Select at least one task.'},
+    )
+    action = forms.ChoiceField(choices=ACTION_CHOICES, widget=forms.Select(attrs={'class': 'form-select form-select-sm'}))
+    assigned_to = forms.ModelMultipleChoiceField(
+        queryset=Contact.objects.none(),
+        required=False,
+        widget=forms.SelectMultiple(attrs={'class': 'form-select form-select-sm select2',
+                                           'data-placeholder': 'Select assignees...'}),
+    )
+    due_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control form-control-sm', 'type': 'date'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        project = kwargs.pop('project')
+        super().__init__(*args, **kwargs)
+        self.fields['tasks'].queryset = project.tasks.all()
+        # Same rule as ProjectTaskForm: tasks can only be assigned to project stakeholders.
+        self.fields['assigned_to'].queryset = project.stakeholders.all()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('action') == 'redate' and not cleaned_data.get('due_date'):
+            self.add_error('due_date', 'Choose the new due date.')
+        return cleaned_data
+
+
+class TaskImportForm(forms.Form):
+    FORMAT_CHOICES = [('', 'Detect from file name'), ('csv', 'CSV'), ('json', 'JSON')]
+
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.json,.jsonl'}))
+    format = forms.ChoiceField(
+        choices=FORMAT_CHOICES, required=False, widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+
+
+class JoinRequestTriageForm(forms.Form):
+    ACTION_CHOICES = [('accept', 'Accept'), ('reject', 'Reject')]
+
+    requests = forms.ModelMultipleChoiceField(
+        queryset=ProjectJoinRequest.objects.none(),
+        error_messages={'required': 'Select at least one join request.'},
+    )
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+
+    def __init__(self, *args, **kwargs):
+        owner = kwargs.pop('owner')
+        super().__init__(*args, **kwargs)
+        # Only pending requests on the user's own projects can be decided.
+        self.fields['requests'].queryset = pending_for_owner(owner)
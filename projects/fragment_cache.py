@@ -0,0 +1,50 @@
+"""
+Fragment cache for project pages.
+
+Fragments are keyed by the project's ``cache_version``, which is bumped on
+every write that changes what the project pages show (see the ``save``
+methods in projects.models and projects.signals). A changed project simply
+stops matching its old keys, so nothing has to be deleted from the cache.
+"""
+
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_TIMEOUT = getattr(settings, 'PROJECT_FRAGMENT_CACHE_TIMEOUT', 60 * 60)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def fragment_key(name, project):
+    return f'projects:fragment:{name}:{project.pk}:{project.cache_version}'
+
+
+def get_or_render(name, project, render):
+    """Return the cached fragment ``name`` for ``project``, calling ``render()`` on a miss."""
+    key = fragment_key(name, project)
+    content = cache.get(key)
+    hit = content is not None
+    if not hit:
+        content = render()
+        cache.set(key, content, CACHE_TIMEOUT)
+    with _stats_lock:
+        _stats[(name, 'hits' if hit else 'misses')] += 1
+    return content
+
+
+def stats():
+    """Hit/miss counts for this process, per fragment name."""
+    with _stats_lock:
+        result = {}
+        for (name, outcome), count in _stats.items():
+            result.setdefault(name, {'hits': 0, 'misses': 0})[outcome] = count
+        return result
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,142 @@
+"""
+Bulk triage of pending join requests across the projects a user owns.
+
+``accept_join_requests`` and ``reject_join_requests`` decide many requests in
+one transaction with a fixed number of statements however many are selected:
+one status update, batched contact creation, a single insert into the
+stakeholders table (plus the matching ProjectMembership rows, which the
+stakeholder signal would otherwise add one project at a time), one
+``bulk_create`` of notifications and one activity entry per project.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Q
+
+from contacts.models import Contact
+from messaging.models import Message
+
+from .activity import activity_transaction, record_activity
+from .models import Project, ProjectActivity, ProjectJoinRequest, ProjectMembership
+
+
+def pending_for_owner(owner):
+    return ProjectJoinRequest.objects.filter(
+        project__owner=owner, status=ProjectJoinRequest.RequestStatus.PENDING
+    )
+
+
+def rejection_message(owner, join_request):
+    """The fields of the notification sent to a rejected requester."""
+    return dict(
+        sender=owner,
+        recipient=join_request.requesting_user,
+        subject=f"Join Request for {join_request.project.name} Rejected",
+        body=(
+            f"Hello {join_request.requesting_user.username},\n\n"
+            f"Your request to join the project '{join_request.project.name}' has been rejected by the project owner.\n\n"
+            "Please contact the project owner if you have any questions."
+        ),
+    )
+
+
+def _lock_pending(owner, request_ids):
+    """Lock and return the still-pending requests among ``request_ids`` on projects ``owner`` owns."""
+    return list(
+        pending_for_owner(owner).filter(pk__in=request_ids)
+        .select_for_update(of=('self',)).select_related('project', 'requesting_user')
+        .order_by('project_id', 'created_at')
+    )
+
+
+def _decide(join_requests, status):
+    ProjectJoinRequest.objects.filter(pk__in=[jr.pk for jr in join_requests]).update(status=status)
+    for join_request in join_requests:
+        join_request.status = status
+
+
+def _record_per_project(owner, join_requests, single_event, bulk_event):
+    by_project = defaultdict(list)
+    for join_request in join_requests:
+        by_project[join_request.project_id].append(join_request)
+    for requests in by_project.values():
+        usernames = [jr.requesting_user.username for jr in requests]
+        if len(usernames) == 1:
+            payload = {'user': usernames[0]}
+            event_type = single_event
+        else:
+            payload = {'users': usernames}
+            event_type = bulk_event
+        record_activity(requests[0].project, event_type, created_by=owner, payload=payload)
+    Project.objects.filter(pk__in=by_project).bump_cache_version()
+
+
+def _contacts_for(owner, requester_ids):
+    """
+    Make sure the owner and every requester have each other as contacts,
+    creating the missing ones in one insert. Returns the owner's contact id
+    for each requester.
+    """
+    existing = Contact.objects.filter(
+        Q(user=owner, contact_user_id__in=requester_ids) | Q(user_id__in=requester_ids, contact_user=owner)
+    ).order_by('pk').values_list('pk', 'user_id', 'contact_user_id')
+    owner_contacts = {}
+    has_owner = set()
+    for contact_pk, user_id, contact_user_id in existing:
+        if user_id == owner.pk:
+            owner_contacts.setdefault(contact_user_id, contact_pk)
+        else:
+            has_owner.add(user_id)
+
+    missing_owner_side = [Contact(user=owner, contact_user_id=uid) for uid in requester_ids if uid not in owner_contacts]
+    Contact.objects.bulk_create(
+        missing_owner_side
+        + [Contact(user_id=uid, contact_user=owner) for uid in requester_ids if uid not in has_owner]
+    )
+    for contact in missing_owner_side:
+        owner_contacts[contact.contact_user_id] = contact.pk
+    return owner_contacts
+
+
+@activity_transaction()
+def accept_join_requests(owner, request_ids):
+    """Accept the pending requests in ``request_ids`` on ``owner``'s projects. Returns those accepted."""
+    join_requests = _lock_pending(owner, request_ids)
+    if not join_requests:
+        return []
+    _decide(join_requests, ProjectJoinRequest.RequestStatus.ACCEPTED)
+
+    owner_contacts = _contacts_for(owner, {jr.requesting_user_id for jr in join_requests})
+    Stakeholder = Project.stakeholders.through
+    Stakeholder.objects.bulk_create(
+        [Stakeholder(project_id=jr.project_id, contact_id=owner_contacts[jr.requesting_user_id])
+         for jr in join_requests],
+        ignore_conflicts=True,
+    )
+    ProjectMembership.objects.bulk_create(
+        [ProjectMembership(project_id=jr.project_id, user_id=jr.requesting_user_id,
+                           role=ProjectMembership.Role.STAKEHOLDER)
+         for jr in join_requests],
+        ignore_conflicts=True,
+    )
+    _record_per_project(
+        owner, join_requests,
+        ProjectActivity.EventType.JOIN_ACCEPTED, ProjectActivity.EventType.JOIN_REQUESTS_ACCEPTED,
+    )
+    return join_requests
+
+
+@activity_transaction()
+def reject_join_requests(owner, request_ids):
+    """Reject the pending requests in ``request_ids`` and notify the requesters. Returns those rejected."""
+    join_requests = _lock_pending(owner, request_ids)
+    if not join_requests:
+        return []
+    _decide(join_requests, ProjectJoinRequest.RequestStatus.REJECTED)
+
+    Message.objects.bulk_create([Message(**rejection_message(owner, jr)) for jr in join_requests])
+    _record_per_project(
+        owner, join_requests,
+        ProjectActivity.EventType.JOIN_REJECTED, ProjectActivity.EventType.JOIN_REQUESTS_REJECTED,
+    )
+    return join_requests
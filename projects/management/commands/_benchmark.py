@@ -0,0 +1,69 @@
+"""Helpers shared by the benchmark management commands."""
+
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def scratch_database(verbosity=0):
+    """
+    Run the benchmark against a freshly migrated throwaway database (the
+    same one the test runner would create), so seeded rows never touch
+    real data.
+    """
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def time_calls(func, repeat):
+    """Call ``func`` ``repeat`` times and return the durations in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"median {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms"
+
+
+class CommitCounter:
+    """
+    Count the transactions committed on the default connection: every write
+    statement run in autocommit mode, plus every commit of an outermost
+    atomic block.
+    """
+    WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+    def __init__(self):
+        self.commits = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not connection.in_atomic_block and sql.lstrip().upper().startswith(self.WRITES):
+            self.commits += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def counting(self):
+        commit = connection.commit
+
+        def counted_commit():
+            self.commits += 1
+            commit()
+
+        connection.commit = counted_commit
+        try:
+            with connection.execute_wrapper(self):
+                yield self
+        finally:
+            del connection.commit
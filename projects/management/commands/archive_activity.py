@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from projects.models import ArchivedProjectActivity, Project, ProjectActivity
+
+ARCHIVED_FIELDS = [
+    'id', 'project_id', 'created_by_id', 'event_type', 'payload', 'title', 'description', 'timestamp',
+    'occurrences', 'event_id',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Move project activity older than the retention period "
+        "(PROJECT_ACTIVITY_RETENTION_DAYS) into the archive table, in small chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'PROJECT_ACTIVITY_RETENTION_DAYS', 365),
+            help="Archive activity older than this many days (default: PROJECT_ACTIVITY_RETENTION_DAYS)."
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Number of rows to move per transaction (default: 1000)."
+        )
+        parser.add_argument(
+            '--vacuum', action='store_true',
+            help="Reclaim the space freed in the activity table afterwards."
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError("--days must not be negative.")
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        chunk_size = options['chunk_size']
+        archived = 0
+
+        while True:
+            # Each chunk copies and deletes the oldest rows in one short
+            # transaction, so a crash never loses or duplicates activity.
+            with transaction.atomic():
+                rows = list(
+                    ProjectActivity.objects.select_for_update()
+                    .filter(timestamp__lt=cutoff).order_by('timestamp', 'id')
+                    .values(*ARCHIVED_FIELDS)[:chunk_size]
+                )
+                if not rows:
+                    break
+                ArchivedProjectActivity.objects.bulk_create([ArchivedProjectActivity(**row) for row in rows])
+                ProjectActivity.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+                Project.objects.filter(pk__in={row['project_id'] for row in rows}).bump_cache_version()
+            archived += len(rows)
+
+        if options['vacuum']:
+            self.vacuum()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} activity rows older than {cutoff:%Y-%m-%d}."
+        ))
+
+    def vacuum(self):
+        table = ProjectActivity._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'VACUUM ANALYZE {table}')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('VACUUM')
@@ -0,0 +1,77 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from projects.models import Project, ProjectJoinRequest
+from ._benchmark import CommitCounter, scratch_database, summarize, time_calls
+
+# Stand-in for django.db.transaction inside projects.views that reproduces the
+# old behaviour, where every write committed on its own.
+AUTOCOMMIT = SimpleNamespace(atomic=lambda *args, **kwargs: nullcontext(), on_commit=transaction.on_commit)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare commits per request and latency of the join request accept/reject and "
+        "leave views, with and without their unit-of-work transaction. Commit costs only "
+        "show in the latency on a durable database such as PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per flow (default: 200).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with scratch_database():
+                for label in ('autocommit', 'atomic'):
+                    patch = mock.patch('projects.views.transaction', AUTOCOMMIT) if label == 'autocommit' else nullcontext()
+                    with patch:
+                        self.run_flows(label, options['requests'])
+        finally:
+            teardown_test_environment()
+
+    def run_flows(self, label, count):
+        User = get_user_model()
+        owner = User.objects.create_user(username=f'{label}-owner')
+        project = Project.objects.create(
+            name=f"{label} benchmark", start_date='2024-01-01', end_date='2024-12-31', is_public=True, owner=owner
+        )
+        requesters = [User.objects.create_user(username=f'{label}-user-{i}') for i in range(2 * count)]
+        join_requests = ProjectJoinRequest.objects.bulk_create(
+            ProjectJoinRequest(project=project, requesting_user=user) for user in requesters
+        )
+        to_accept, to_reject = iter(join_requests[:count]), iter(join_requests[count:])
+
+        owner_client = Client()
+        owner_client.force_login(owner)
+        # Log the leavers in up front so the session writes are not measured.
+        leaver_clients = []
+        for user in requesters[:count]:
+            leaver_clients.append(Client())
+            leaver_clients[-1].force_login(user)
+        leaver_clients = iter(leaver_clients)
+
+        def accept():
+            owner_client.post(reverse('accept_join_request', args=[next(to_accept).pk]))
+
+        def reject():
+            owner_client.post(reverse('reject_join_request', args=[next(to_reject).pk]))
+
+        def leave():
+            next(leaver_clients).post(reverse('leave_project', args=[project.pk]))
+
+        self.stdout.write(f"\n{label}")
+        for name, flow in (('accept', accept), ('reject', reject), ('leave', leave)):
+            with CommitCounter().counting() as counter:
+                timings = time_calls(flow, count)
+            self.stdout.write(
+                f"  {name:<7} {summarize(timings)}   {counter.commits / count:5.1f} commits/request"
+            )
@@ -0,0 +1,76 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from projects.search import icontains_search, rebuild_search_index, search_projects
+from ._benchmark import scratch_database, summarize, time_calls
+
+WORDS = (
+    "alpha apollo atlas beacon bridge cascade cedar comet delta ember falcon forge galaxy granite "
+    "harbor horizon indigo iron jasper juniper kestrel lantern lumen maple meridian nebula nova "
+    "orbit onyx pioneer prism quartz quest raven ridge sable sierra summit tango tempest umber "
+    "vector vertex willow zenith migration redesign rollout onboarding analytics platform portal "
+    "warehouse billing mobile compliance audit integration dashboard pipeline"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with projects and compare the indexed full-text search "
+        "against the old icontains filter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help="Projects to seed (default: 100000).")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per query (default: 20).")
+        parser.add_argument('--queries', nargs='+', default=['falcon', 'quartz migration', 'ticket4242', 'nomatch'],
+                            help="Search terms to benchmark.")
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.seed(options['rows'])
+            queryset = Project.objects.filter(is_public=True)
+            for query in options['queries']:
+                self.stdout.write(f"\nquery: {query!r}")
+                for label, search in (('icontains', self.icontains_page), ('full-text', self.fulltext_page)):
+                    rows = len(search(queryset, query))
+                    timings = time_calls(lambda: search(queryset, query), options['repeat'])
+                    self.stdout.write(f"  {label:<10} {summarize(timings)}   ({rows} rows on first page)")
+
+    # Each path fetches the first page and the total count, as the list view does for searches.
+    @staticmethod
+    def icontains_page(queryset, query):
+        results = icontains_search(queryset, query).order_by('-start_date', '-id')
+        results.count()
+        return list(results[:10])
+
+    @staticmethod
+    def fulltext_page(queryset, query):
+        results = search_projects(queryset, query)
+        results.count()
+        return list(results[:10])
+
+    def seed(self, rows):
+        rng = random.Random(0)
+        owner = get_user_model().objects.create_user(username='benchmark')
+        start = date(2020, 1, 1)
+        batch = []
+        for i in range(rows):
+            batch.append(Project(
+                name=' '.join(rng.sample(WORDS, 3)).title(),
+                # One rare token per row gives the benchmark a selective query as well.
+                description=' '.join(rng.choices(WORDS, k=40) + [f'ticket{i}']),
+                start_date=start + timedelta(days=i % 1500),
+                end_date=start + timedelta(days=i % 1500 + 90),
+                is_public=rng.random() < 0.8,
+                owner=owner,
+            ))
+            if len(batch) == 5000:
+                Project.objects.bulk_create(batch)
+                batch = []
+        Project.objects.bulk_create(batch)
+        rebuild_search_index()
+        self.stdout.write(f"Seeded {rows} projects.")
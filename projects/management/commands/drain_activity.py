@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.activity import drain_pending_activities
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert the project activity left in the outbox, by PROJECT_ACTIVITY_DEFERRED "
+        "or by failed requests, into the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', action='store_true',
+            help="Keep running and drain new events as they appear."
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help="Seconds to sleep between polls with --watch (default: 1)."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            events = drain_pending_activities()
+            if events or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(f"Drained {events} events from the outbox."))
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+from projects.task_import import CHUNK_SIZE, FORMATS, TaskImportError, format_for, import_tasks
+
+
+class Command(BaseCommand):
+    help = "Create tasks for a project from a CSV or JSON file, streaming it in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int, help="Project to add the tasks to.")
+        parser.add_argument('path', help="CSV or JSON file to import.")
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help="File format (default: detected from the file name)."
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f"Number of tasks to insert per transaction (default: {CHUNK_SIZE})."
+        )
+        parser.add_argument('--user', help="Username to record as the importer in the project activity.")
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(pk=options['project_id'])
+        except Project.DoesNotExist:
+            raise CommandError(f"Project {options['project_id']} does not exist.")
+        user = None
+        if options['user']:
+            try:
+                user = get_user_model().objects.get_by_natural_key(options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist.")
+        file_format = options['format'] or format_for(options['path'])
+        if not file_format:
+            raise CommandError("Could not tell the format from the file name; pass --format.")
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                result = import_tasks(project, stream, file_format, user=user, chunk_size=options['chunk_size'])
+        except (OSError, TaskImportError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(error)
+        if result.skipped > len(result.errors):
+            self.stderr.write(f"... and {result.skipped - len(result.errors)} more invalid rows.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} tasks into {project.name!r}; skipped {result.skipped} invalid rows."
+        ))
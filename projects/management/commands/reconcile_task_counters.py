@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from projects.models import Project, ProjectTask
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored task counters on projects in small chunks to repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="Number of projects to reconcile per transaction (default: 500)."
+        )
+
+    def task_counts(self, projects):
+        return {
+            row['project']: (row['total'], row['completed'])
+            for row in ProjectTask.objects.filter(project__in=projects)
+            .values('project')
+            .annotate(total=Count('pk'), completed=Count('pk', filter=Q(is_complete=True)))
+            .order_by()
+        }
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        checked = repaired = 0
+
+        while True:
+            # Walk the table by primary key so each chunk is a short transaction.
+            # The chunk is read without locks; only the projects that have
+            # drifted are locked and recounted, since their tasks may have
+            # changed since the first count.
+            with transaction.atomic():
+                projects = list(
+                    Project.objects.filter(pk__gt=last_pk).order_by('pk')
+                    .only('pk', 'task_count', 'completed_task_count')[:chunk_size]
+                )
+                if not projects:
+                    break
+                last_pk = projects[-1].pk
+
+                counts = self.task_counts(projects)
+                stale_pks = [
+                    project.pk for project in projects
+                    if (project.task_count, project.completed_task_count) != counts.get(project.pk, (0, 0))
+                ]
+
+                stale = []
+                if stale_pks:
+                    locked = list(
+                        Project.objects.select_for_update().filter(pk__in=stale_pks)
+                        .only('pk', 'task_count', 'completed_task_count')
+                    )
+                    counts = self.task_counts(locked)
+                    for project in locked:
+                        total, completed = counts.get(project.pk, (0, 0))
+                        if (project.task_count, project.completed_task_count) != (total, completed):
+                            project.task_count = total
+                            project.completed_task_count = completed
+                            stale.append(project)
+                if stale:
+                    Project.objects.bulk_update(stale, ['task_count', 'completed_task_count'])
+                    Project.objects.filter(pk__in=[p.pk for p in stale]).bump_cache_version()
+
+            checked += len(projects)
+            repaired += len(stale)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} projects, repaired {repaired} task counters."
+        ))
@@ -0,0 +1,25 @@
+import logging
+
+from .activity import activity_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBufferMiddleware:
+    """Write the project activity recorded during a request in one batch once the view has finished."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = None
+        try:
+            with activity_buffer():
+                response = self.get_response(request)
+        except Exception:
+            if response is None:
+                raise
+            # The view's changes are committed and its events are safe in the
+            # outbox, so don't turn the response into an error.
+            logger.exception("Could not write project activity; it is left in the outbox for drain_activity.")
+        return response
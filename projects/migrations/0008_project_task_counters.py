@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectTask = apps.get_model('projects', 'ProjectTask')
+
+    def task_count(**filters):
+        counts = (
+            ProjectTask.objects.filter(project=OuterRef('pk'), **filters)
+            .values('project').annotate(c=Count('pk')).values('c')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    Project.objects.update(
+        task_count=task_count(),
+        completed_task_count=task_count(is_complete=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_projectactivity_projecttask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_remove_contact_email_remove_contact_name_and_more'),
+        ('projects', '0008_project_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-start_date', '-id'], name='project_start_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-start_date', '-id'], name='project_public_start_date_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE projects_project ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX project_search_vector_idx ON projects_project USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS project_search_vector_idx",
+    "ALTER TABLE projects_project DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE projects_project_fts USING fts5(name, description, tokenize = 'porter unicode61')",
+    "INSERT INTO projects_project_fts (rowid, name, description) SELECT id, name, description FROM projects_project",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS projects_project_fts",
+]
+
+
+def _sqlite_has_fts5(cursor):
+    cursor.execute("PRAGMA compile_options")
+    return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def run_for_vendor(postgres_sql, sqlite_sql):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                statements = postgres_sql
+            elif connection.vendor == 'sqlite' and _sqlite_has_fts5(cursor):
+                statements = sqlite_sql
+            else:
+                statements = []
+            for statement in statements:
+                cursor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text search index for projects (see projects/search.py). The
+    search structures are backend specific, so they are created with raw SQL
+    and are not part of the model state.
+    """
+
+    dependencies = [
+        ('projects', '0009_project_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
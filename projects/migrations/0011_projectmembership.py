@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_memberships(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectMembership = apps.get_model('projects', 'ProjectMembership')
+    Through = Project.stakeholders.through
+
+    roles = {}
+    for project_id, user_id in (
+        Through.objects.exclude(contact__contact_user=None).values_list('project_id', 'contact__contact_user_id')
+    ):
+        roles[(project_id, user_id)] = 'STAKEHOLDER'
+    for project_id, owner_id in Project.objects.exclude(owner=None).values_list('pk', 'owner_id'):
+        roles[(project_id, owner_id)] = 'OWNER'
+
+    ProjectMembership.objects.bulk_create(
+        [
+            ProjectMembership(project_id=project_id, user_id=user_id, role=role)
+            for (project_id, user_id), role in roles.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('OWNER', 'Owner'), ('STAKEHOLDER', 'Stakeholder')], default='STAKEHOLDER', max_length=20)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'project'), name='unique_project_membership')],
+            },
+        ),
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
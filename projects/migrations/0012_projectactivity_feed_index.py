@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_projectmembership'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectactivity',
+            index=models.Index(fields=['project', '-timestamp', '-id'], name='activity_project_ts_idx'),
+        ),
+    ]
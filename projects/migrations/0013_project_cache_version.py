@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:33
+
+import projects.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_projectactivity_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='cache_version',
+            field=models.PositiveIntegerField(default=projects.models.initial_cache_version, editable=False),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:05
+
+import uuid
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def populate_event_ids(apps, schema_editor):
+    """Give every row its own UUID, a page of primary keys at a time."""
+    ProjectActivity = apps.get_model('projects', 'ProjectActivity')
+    last_pk = 0
+    while True:
+        pks = list(
+            ProjectActivity.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        ProjectActivity.objects.bulk_update(
+            [ProjectActivity(pk=pk, event_id=uuid.uuid4()) for pk in pks], ['event_id'], batch_size=BATCH_SIZE
+        )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_project_cache_version'),
+    ]
+
+    operations = [
+        # Added as nullable first so every existing row gets its own UUID.
+        migrations.AddField(
+            model_name='projectactivity',
+            name='event_id',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_event_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='projectactivity',
+            name='event_id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,162 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:40
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# (event type, title pattern, description pattern) for the strings the views used to write.
+LEGACY_FORMATS = [
+    ('PROJECT_CREATED', r'Project Created', r'(?P<actor>.*) created this project\.'),
+    ('PROJECT_UPDATED', r'Project Updated', r'(?P<actor>.*) updated this project\.'),
+    ('JOIN_REQUESTED', r'Join Request Submitted', r'(?P<actor>.*) requested to join this project\.'),
+    ('JOIN_ACCEPTED', r'Join Request Accepted', r'(?P<user>.*) was added to project stakeholders\.'),
+    ('JOIN_REJECTED', r'Join Request Rejected', r"(?P<user>.*)'s join request was rejected\."),
+    ('STAKEHOLDER_LEFT', r'Stakeholder Left', r'(?P<actor>.*) left the project\.'),
+    ('TASK_CREATED', r'Task Created: (?P<task_title>.*)', r'Assigned to: (?P<assignees>.*)'),
+    ('TASK_UPDATED', r'Task Updated: (?P<task_title>.*)', r'Edited by (?P<actor>.*)\.'),
+    ('TASK_STATUS_CHANGED', r'Task (?P<status_verb>completed|reopened): (?P<task_title>.*)',
+     r'Task was marked (?:completed|reopened) by (?P<actor>.*)\.'),
+    ('TASK_DELETED', r'Task Deleted: (?P<task_title>.*)', r'Deleted by (?P<actor>.*)\.'),
+]
+LEGACY_FORMATS = [
+    (event_type, re.compile(title, re.DOTALL), re.compile(description, re.DOTALL))
+    for event_type, title, description in LEGACY_FORMATS
+]
+
+# The (title, description) templates of ActivityRecord.TEXT, for rebuilding the
+# text on the way back. Copied, as the historical model does not carry them.
+TEXT = {
+    'PROJECT_CREATED': ("Project Created", "{actor} created this project."),
+    'PROJECT_UPDATED': ("Project Updated", "{actor} updated this project."),
+    'JOIN_REQUESTED': ("Join Request Submitted", "{actor} requested to join this project."),
+    'JOIN_ACCEPTED': ("Join Request Accepted", "{user} was added to project stakeholders."),
+    'JOIN_REJECTED': ("Join Request Rejected", "{user}'s join request was rejected."),
+    'JOIN_REQUESTS_ACCEPTED': ("Join Requests Accepted", "{users} were added to project stakeholders."),
+    'JOIN_REQUESTS_REJECTED': ("Join Requests Rejected", "Join requests from {users} were rejected."),
+    'STAKEHOLDER_LEFT': ("Stakeholder Left", "{actor} left the project."),
+    'TASK_CREATED': ("Task Created: {task_title}", "Assigned to: {assignees}"),
+    'TASK_UPDATED': ("Task Updated: {task_title}", "Edited by {actor}."),
+    'TASK_STATUS_CHANGED': ("Task {status_verb}: {task_title}", "Task was marked {status_verb} by {actor}."),
+    'TASK_DELETED': ("Task Deleted: {task_title}", "Deleted by {actor}."),
+    'TASKS_BULK_CHANGED': ("Tasks {action_verb}: {task_count}", "Changed in bulk by {actor}."),
+}
+BULK_ACTION_VERBS = {
+    'complete': 'completed', 'reopen': 'reopened', 'reassign': 'reassigned',
+    'redate': 'rescheduled', 'delete': 'deleted', 'import': 'imported',
+}
+
+BATCH_SIZE = 1000
+BACKFILLED_FIELDS = ['event_type', 'payload', 'title', 'description']
+
+
+def parse_legacy_activity(title, description, actor):
+    for event_type, title_re, description_re in LEGACY_FORMATS:
+        title_match = title_re.fullmatch(title)
+        description_match = description_re.fullmatch(description)
+        if not (title_match and description_match):
+            continue
+        payload = {**title_match.groupdict(), **description_match.groupdict()}
+        if actor and 'actor' not in payload:
+            payload['actor'] = actor
+        if 'assignees' in payload:
+            payload['assignees'] = payload['assignees'].split(', ') if payload['assignees'] else []
+        if 'status_verb' in payload:
+            completed = payload.pop('status_verb') == 'completed'
+            payload['old_status'] = 'pending' if completed else 'complete'
+            payload['new_status'] = 'complete' if completed else 'pending'
+        return event_type, payload
+    return None
+
+
+def backfill_event_types(apps, schema_editor):
+    """
+    Turn the old display strings into an event type and payload. Rows that do
+    not match a known format stay OTHER and keep their text. Rows are read and
+    written a page of primary keys at a time.
+    """
+    ProjectActivity = apps.get_model('projects', 'ProjectActivity')
+    rows = ProjectActivity.objects.order_by('pk').values_list('pk', 'title', 'description', 'created_by__username')
+    last_pk = 0
+    while True:
+        page = list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not page:
+            break
+        batch = []
+        for pk, title, description, actor in page:
+            parsed = parse_legacy_activity(title, description, actor)
+            if parsed is None:
+                continue
+            event_type, payload = parsed
+            # The text is rebuilt from the payload when displayed.
+            batch.append(ProjectActivity(pk=pk, event_type=event_type, payload=payload, title='', description=''))
+        ProjectActivity.objects.bulk_update(batch, BACKFILLED_FIELDS, batch_size=BATCH_SIZE)
+        last_pk = page[-1][0]
+
+
+def format_activity(event_type, payload):
+    """The (title, description) ActivityRecord displays, or None for event types without templates."""
+    if event_type not in TEXT:
+        return None
+    values = {'actor': '', 'user': '', 'task_title': ''}
+    values.update(payload)
+    values['assignees'] = ', '.join(payload.get('assignees', []))
+    values['users'] = ', '.join(payload.get('users', []))
+    values['status_verb'] = 'completed' if payload.get('new_status') == 'complete' else 'reopened'
+    values['action_verb'] = BULK_ACTION_VERBS.get(payload.get('action'), 'changed')
+    count = payload.get('count', 0)
+    values['task_count'] = f"{count} task" if count == 1 else f"{count} tasks"
+    title, description = TEXT[event_type]
+    return title.format(**values), description.format(**values)
+
+
+def restore_display_text(apps, schema_editor):
+    """
+    Write the displayed text back into title and description before the event
+    type and payload are dropped. OTHER rows kept their text.
+    """
+    ProjectActivity = apps.get_model('projects', 'ProjectActivity')
+    rows = ProjectActivity.objects.exclude(event_type='OTHER').order_by('pk').values_list('pk', 'event_type', 'payload')
+    last_pk = 0
+    while True:
+        page = list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not page:
+            break
+        batch = []
+        for pk, event_type, payload in page:
+            text = format_activity(event_type, payload)
+            if text is not None:
+                batch.append(ProjectActivity(pk=pk, title=text[0], description=text[1]))
+        ProjectActivity.objects.bulk_update(batch, ['title', 'description'], batch_size=BATCH_SIZE)
+        last_pk = page[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_projectactivity_event_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectactivity',
+            name='event_type',
+            field=models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('OTHER', 'Other')], default='OTHER', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='projectactivity',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='projectactivity',
+            name='title',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.RunPython(backfill_event_types, restore_display_text),
+        migrations.AddIndex(
+            model_name='projectactivity',
+            index=models.Index(fields=['event_type', '-timestamp'], name='activity_type_ts_idx'),
+        ),
+    ]
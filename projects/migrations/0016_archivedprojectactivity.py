@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:41
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0015_projectactivity_event_type_payload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProjectActivity',
+            fields=[
+                ('event_type', models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('OTHER', 'Other')], default='OTHER', max_length=30)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_activities', to='projects.project')),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['project', '-timestamp', '-id'], name='archived_activity_feed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0016_archivedprojectactivity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedprojectactivity',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='projectactivity',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0017_activity_occurrences'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedprojectactivity',
+            name='event_type',
+            field=models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('TASKS_BULK_CHANGED', 'Tasks changed in bulk'), ('OTHER', 'Other')], default='OTHER', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='projectactivity',
+            name='event_type',
+            field=models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('TASKS_BULK_CHANGED', 'Tasks changed in bulk'), ('OTHER', 'Other')], default='OTHER', max_length=30),
+        ),
+    ]
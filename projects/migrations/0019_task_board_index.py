@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_remove_contact_email_remove_contact_name_and_more'),
+        ('projects', '0018_activity_tasks_bulk_changed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(fields=['project', 'is_complete', 'due_date', 'id'], name='task_board_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_remove_contact_email_remove_contact_name_and_more'),
+        ('projects', '0019_task_board_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(condition=models.Q(('is_complete', False)), fields=['due_date', 'id'], name='task_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A request that was already decided wins over a pending duplicate of it.
+STATUS_PRIORITY = {'ACCEPTED': 0, 'REJECTED': 1, 'PENDING': 2}
+
+
+def remove_duplicate_join_requests(apps, schema_editor):
+    """Keep one request per (project, user) so the unique constraint can be added."""
+    ProjectJoinRequest = apps.get_model('projects', 'ProjectJoinRequest')
+    duplicated = (
+        ProjectJoinRequest.objects.values('project_id', 'requesting_user_id')
+        .annotate(n=models.Count('pk')).filter(n__gt=1)
+    )
+    doomed = []
+    for pair in duplicated:
+        rows = ProjectJoinRequest.objects.filter(
+            project_id=pair['project_id'], requesting_user_id=pair['requesting_user_id']
+        ).values_list('pk', 'status', 'created_at')
+        ranked = sorted(rows, key=lambda row: (STATUS_PRIORITY.get(row[1], 3), row[2], row[0]))
+        doomed.extend(pk for pk, _, _ in ranked[1:])
+    ProjectJoinRequest.objects.filter(pk__in=doomed).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0020_task_open_due_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedprojectactivity',
+            name='event_type',
+            field=models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('JOIN_REQUESTS_ACCEPTED', 'Join requests accepted'), ('JOIN_REQUESTS_REJECTED', 'Join requests rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('TASKS_BULK_CHANGED', 'Tasks changed in bulk'), ('OTHER', 'Other')], default='OTHER', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='projectactivity',
+            name='event_type',
+            field=models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_UPDATED', 'Project updated'), ('JOIN_REQUESTED', 'Join request submitted'), ('JOIN_ACCEPTED', 'Join request accepted'), ('JOIN_REJECTED', 'Join request rejected'), ('JOIN_REQUESTS_ACCEPTED', 'Join requests accepted'), ('JOIN_REQUESTS_REJECTED', 'Join requests rejected'), ('STAKEHOLDER_LEFT', 'Stakeholder left'), ('TASK_CREATED', 'Task created'), ('TASK_UPDATED', 'Task updated'), ('TASK_STATUS_CHANGED', 'Task status changed'), ('TASK_DELETED', 'Task deleted'), ('TASKS_BULK_CHANGED', 'Tasks changed in bulk'), ('OTHER', 'Other')], default='OTHER', max_length=30),
+        ),
+        migrations.RunPython(remove_duplicate_join_requests, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='projectjoinrequest',
+            index=models.Index(fields=['project', 'status'], name='join_request_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectjoinrequest',
+            constraint=models.UniqueConstraint(fields=('project', 'requesting_user'), name='unique_project_join_request'),
+        ),
+    ]
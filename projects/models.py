@@ -1,9 +1,47 @@
+import random
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Case, F, IntegerField, Q, Value, When
 from django.conf import settings
 from django.utils import timezone
 from contacts.models import Contact
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_progress(self):
+        """
+        Annotate task totals, completed counts and progress percentage so that
+        list pages get them from the main query instead of two COUNTs per row.
+        The values come from the stored task counters, so no join is needed.
+        """
+        return self.annotate(
+            num_tasks=F('task_count'),
+            num_completed_tasks=F('completed_task_count'),
+        ).annotate(
+            progress_pct=Case(
+                When(num_tasks=0, then=Value(0)),
+                default=Value(100) * F('num_completed_tasks') / F('num_tasks'),
+                output_field=IntegerField(),
+            )
+        )
+
+    def bump_cache_version(self):
+        """Invalidate the cached page fragments of these projects."""
+        return self.update(cache_version=F('cache_version') + 1)
+
+    def member_of(self, user):
+        """Projects ``user`` owns or is a stakeholder of."""
+        return self.filter(pk__in=ProjectMembership.objects.filter(user=user).values('project_id'))
+
+
+def initial_cache_version():
+    # Start at a random version so a reused primary key (e.g. after a rollback)
+    # can never match fragments cached for an earlier project.
+    return random.randint(1, 2 ** 30)
+
+
 class Project(models.Model):
     class Status(models.TextChoices):
         IN_PROGRESS = 'IN_PROGRESS', 'In Progress'
@@ -24,35 +62,133 @@ class Project(models.Model):
         related_name='projects',
         null=True
     )
+    # Denormalized task counters, maintained incrementally by the task views.
+    task_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
+    # Part of every fragment cache key; bumped whenever anything the project pages show changes.
+    cache_version = models.PositiveIntegerField(default=initial_cache_version, editable=False)
+
+    objects = ProjectQuerySet.as_manager()
 
     class Meta:
         default_permissions = ('add', 'change', 'delete', 'view')
         permissions = [
             ('archive_project', 'Can archive a projects'),
         ]
+        indexes = [
+            # Back the keyset pagination of the project list on (start_date, id).
+            models.Index(fields=['-start_date', '-id'], name='project_start_date_id_idx'),
+            models.Index(
+                fields=['-start_date', '-id'], condition=Q(is_public=True),
+                name='project_public_start_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    # Written only by adjust_task_counters() and reconcile_task_counters; a full
+    # save must not write back loaded values over concurrent F() increments.
+    COUNTER_FIELDS = frozenset({'task_count', 'completed_task_count'})
+
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            # Bump in the database, as bump_cache_version() does, so the version
+            # never rewinds to one an F() bump has already produced.
+            self.cache_version = F('cache_version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                # Like a plain save, leave deferred fields alone.
+                update_fields = {
+                    f.attname for f in self._meta.concrete_fields if not f.primary_key
+                } - self.COUNTER_FIELDS - self.get_deferred_fields()
+            kwargs['update_fields'] = {*update_fields, 'cache_version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['cache_version'])
+
+    def adjust_task_counters(self, total=0, completed=0):
+        """
+        Atomically shift the stored task counters by the given deltas, bumping
+        ``cache_version`` in the same statement.
+        """
+        Project.objects.filter(pk=self.pk).update(
+            task_count=F('task_count') + total,
+            completed_task_count=F('completed_task_count') + completed,
+            cache_version=F('cache_version') + 1,
+        )
+
+    def sync_memberships(self):
+        """
+        Rebuild this project's ProjectMembership rows from its owner and
+        stakeholders. Called whenever the stakeholder list is edited as a whole.
+        """
+        roles = {
+            user_id: ProjectMembership.Role.STAKEHOLDER
+            for user_id in self.stakeholders.exclude(contact_user=None).values_list('contact_user_id', flat=True)
+        }
+        if self.owner_id:
+            roles[self.owner_id] = ProjectMembership.Role.OWNER
+
+        existing = {m.user_id: m for m in self.memberships.all()}
+        stale = [m.pk for user_id, m in existing.items() if roles.get(user_id) != m.role]
+        if stale:
+            ProjectMembership.objects.filter(pk__in=stale).delete()
+        ProjectMembership.objects.bulk_create([
+            ProjectMembership(project=self, user_id=user_id, role=role)
+            for user_id, role in roles.items()
+            if user_id not in existing or existing[user_id].role != role
+        ])
+
     @property
     def total_tasks(self):
         """Return total number of tasks for this project."""
+        if hasattr(self, 'num_tasks'):
+            return self.num_tasks
         return self.tasks.count()
 
     @property
     def completed_tasks(self):
         """Number of tasks marked complete."""
+        if hasattr(self, 'num_completed_tasks'):
+            return self.num_completed_tasks
         return self.tasks.filter(is_complete=True).count()
 
     @property
     def progress(self):
         """Calculate progress as ratio of completed tasks to total tasks."""
+        if hasattr(self, 'progress_pct'):
+            return self.progress_pct
         total = self.total_tasks
         if total == 0:
             return 0
         return int((self.completed_tasks / total) * 100)
 
 
+class ProjectMembership(models.Model):
+    """
+    Materialized (project, user) membership, so visibility and permission
+    checks are an indexed lookup instead of a join through stakeholders.
+    Kept in step by Project.sync_memberships() and the join/leave views.
+    """
+    class Role(models.TextChoices):
+        OWNER = 'OWNER', 'Owner'
+        STAKEHOLDER = 'STAKEHOLDER', 'Stakeholder'
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='project_memberships')
+    role = models.CharField(max_length=20, choices=Role.choices, default=Role.STAKEHOLDER)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'project'], name='unique_project_membership'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} ({self.get_role_display()}) in {self.project.name}"
+
+
 class ProjectJoinRequest(models.Model):
     class RequestStatus(models.TextChoices):
         PENDING = 'PENDING', 'Pending'
@@ -64,19 +200,125 @@ class ProjectJoinRequest(models.Model):
     status = models.CharField(max_length=10, choices=RequestStatus.choices, default=RequestStatus.PENDING)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        constraints = [
+            # One request per user and project, so concurrent get_or_create calls cannot both insert.
+            models.UniqueConstraint(fields=['project', 'requesting_user'], name='unique_project_join_request'),
+        ]
+        indexes = [
+            models.Index(fields=['project', 'status'], name='join_request_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.requesting_user} wants to join {self.project.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Project.objects.filter(pk=self.project_id).bump_cache_version()
+
+
+class ActivityRecord(models.Model):
+    """
+    Fields and display logic shared by live and archived project activity.
+
+    Events are stored as an ``event_type`` plus a small JSON ``payload``; the
+    display text is only built when a row is rendered. ``title`` and
+    ``description`` hold free text for events of type OTHER.
+    """
+    class EventType(models.TextChoices):
+        PROJECT_CREATED = 'PROJECT_CREATED', 'Project created'
+        PROJECT_UPDATED = 'PROJECT_UPDATED', 'Project updated'
+        JOIN_REQUESTED = 'JOIN_REQUESTED', 'Join request submitted'
+        JOIN_ACCEPTED = 'JOIN_ACCEPTED', 'Join request accepted'
+        JOIN_REJECTED = 'JOIN_REJECTED', 'Join request rejected'
+        JOIN_REQUESTS_ACCEPTED = 'JOIN_REQUESTS_ACCEPTED', 'Join requests accepted'
+        JOIN_REQUESTS_REJECTED = 'JOIN_REQUESTS_REJECTED', 'Join requests rejected'
+        STAKEHOLDER_LEFT = 'STAKEHOLDER_LEFT', 'Stakeholder left'
+        TASK_CREATED = 'TASK_CREATED', 'Task created'
+        TASK_UPDATED = 'TASK_UPDATED', 'Task updated'
+        TASK_STATUS_CHANGED = 'TASK_STATUS_CHANGED', 'Task status changed'
+        TASK_DELETED = 'TASK_DELETED', 'Task deleted'
+        TASKS_BULK_CHANGED = 'TASKS_BULK_CHANGED', 'Tasks changed in bulk'
+        OTHER = 'OTHER', 'Other'
+
+    class TaskStatus(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        COMPLETE = 'complete', 'Complete'
+
+    event_type = models.CharField(max_length=30, choices=EventType.choices, default=EventType.OTHER)
+    # e.g. {"actor": "alice", "task": 12, "task_title": "Draft", "old_status": "pending", "new_status": "complete"}
+    payload = models.JSONField(default=dict, blank=True)
+    title = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    # Time of the latest occurrence when repeated events are coalesced into one row.
+    timestamp = models.DateTimeField(default=timezone.now)
+    occurrences = models.PositiveIntegerField(default=1)
+    # Identifies the event from the outbox through to this table.
+    event_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+
+    class Meta:
+        abstract = True
+        ordering = ['-timestamp']
+
+    # (title, description) templates, formatted with the payload.
+    TEXT = {
+        EventType.PROJECT_CREATED: ("Project Created", "{actor} created this project."),
+        EventType.PROJECT_UPDATED: ("Project Updated", "{actor} updated this project."),
+        EventType.JOIN_REQUESTED: ("Join Request Submitted", "{actor} requested to join this project."),
+        EventType.JOIN_ACCEPTED: ("Join Request Accepted", "{user} was added to project stakeholders."),
+        EventType.JOIN_REJECTED: ("Join Request Rejected", "{user}'s join request was rejected."),
+        EventType.JOIN_REQUESTS_ACCEPTED: ("Join Requests Accepted", "{users} were added to project stakeholders."),
+        EventType.JOIN_REQUESTS_REJECTED: ("Join Requests Rejected", "Join requests from {users} were rejected."),
+        EventType.STAKEHOLDER_LEFT: ("Stakeholder Left", "{actor} left the project."),
+        EventType.TASK_CREATED: ("Task Created: {task_title}", "Assigned to: {assignees}"),
+        EventType.TASK_UPDATED: ("Task Updated: {task_title}", "Edited by {actor}."),
+        EventType.TASK_STATUS_CHANGED: ("Task {status_verb}: {task_title}", "Task was marked {status_verb} by {actor}."),
+        EventType.TASK_DELETED: ("Task Deleted: {task_title}", "Deleted by {actor}."),
+        EventType.TASKS_BULK_CHANGED: ("Tasks {action_verb}: {task_count}", "Changed in bulk by {actor}."),
+    }
+
+    BULK_ACTION_VERBS = {
+        'complete': 'completed', 'reopen': 'reopened', 'reassign': 'reassigned',
+        'redate': 'rescheduled', 'delete': 'deleted', 'import': 'imported',
+    }
+
+    def __str__(self):
+        return f"{self.display_title} ({self.project.name})"
+
+    def _text_values(self):
+        values = {'actor': '', 'user': '', 'task_title': ''}
+        values.update(self.payload)
+        values['assignees'] = ', '.join(self.payload.get('assignees', []))
+        values['users'] = ', '.join(self.payload.get('users', []))
+        values['status_verb'] = (
+            'completed' if self.payload.get('new_status') == self.TaskStatus.COMPLETE else 'reopened'
+        )
+        values['action_verb'] = self.BULK_ACTION_VERBS.get(self.payload.get('action'), 'changed')
+        count = self.payload.get('count', 0)
+        values['task_count'] = f"{count} task" if count == 1 else f"{count} tasks"
+        return values
+
+    @property
+    def display_title(self):
+        if self.event_type not in self.TEXT:
+            return self.title
+        return self.TEXT[self.event_type][0].format(**self._text_values())
+
+    @property
+    def display_description(self):
+        if self.event_type not in self.TEXT:
+            return self.description
+        return self.TEXT[self.event_type][1].format(**self._text_values())
+
 
-class ProjectActivity(models.Model):
+class ProjectActivity(ActivityRecord):
     """
     Logs any events / updates for the project:
     e.g. user joined, tasks updated, status changed, etc.
+    Rows past the retention period are moved to ArchivedProjectActivity by
+    ``manage.py archive_activity``.
     """
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="activities")
-    title = models.CharField(max_length=200)
-    description = models.TextField(blank=True)
-    timestamp = models.DateTimeField(default=timezone.now)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -84,11 +326,53 @@ class ProjectActivity(models.Model):
         related_name='activity_created'
     )
 
-    class Meta:
-        ordering = ['-timestamp']
+    class Meta(ActivityRecord.Meta):
+        indexes = [
+            # Backs the cursor-paginated activity feed on the project detail page.
+            models.Index(fields=['project', '-timestamp', '-id'], name='activity_project_ts_idx'),
+            # Filtering and counting by kind of event.
+            models.Index(fields=['event_type', '-timestamp'], name='activity_type_ts_idx'),
+        ]
 
-    def __str__(self):
-        return f"{self.title} ({self.project.name})"
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Project.objects.filter(pk=self.project_id).bump_cache_version()
+
+
+class ArchivedProjectActivity(ActivityRecord):
+    """
+    Activity older than the retention period. Rows keep the primary key they
+    had in ProjectActivity, so the archived feed continues the live one in
+    (timestamp, id) order.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="archived_activities")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='+'
+    )
+
+    class Meta(ActivityRecord.Meta):
+        indexes = [
+            models.Index(fields=['project', '-timestamp', '-id'], name='archived_activity_feed_idx'),
+        ]
+
+
+class PendingActivity(models.Model):
+    """
+    Outbox for project activity. ``record_activity()`` writes the event here in
+    the same transaction as the change it describes; after the commit the
+    request's batch moves it to ProjectActivity, and ``manage.py
+    drain_activity`` moves whatever a failed or interrupted request, or
+    deferred mode, left.
+    """
+    event = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
 
 
 class ProjectTask(models.Model):
@@ -105,5 +389,26 @@ class ProjectTask(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves the task board: per-column counts and keyset pages by due date.
+            models.Index(fields=['project', 'is_complete', 'due_date', 'id'], name='task_board_idx'),
+            # Serves the cross-project "My Tasks" dashboard: open tasks by due date.
+            models.Index(fields=['due_date', 'id'], condition=Q(is_complete=False), name='task_open_due_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.project.name}"
+
+    # Callers that go on to adjust_task_counters(), which bumps the project's
+    # cache_version itself, pass bump_cache_version=False.
+    def save(self, *args, bump_cache_version=True, **kwargs):
+        super().save(*args, **kwargs)
+        if bump_cache_version:
+            Project.objects.filter(pk=self.project_id).bump_cache_version()
+
+    def delete(self, *args, bump_cache_version=True, **kwargs):
+        result = super().delete(*args, **kwargs)
+        if bump_cache_version:
+            Project.objects.filter(pk=self.project_id).bump_cache_version()
+        return result
@@ -0,0 +1,112 @@
+"""
+Full-text search over project names and descriptions.
+
+On PostgreSQL the ``projects_project.search_vector`` column is a generated
+``tsvector`` (name weighted above description) with a GIN index, both created
+by migration 0010. On SQLite, used in development, an FTS5 table
+``projects_project_fts`` is kept in step by the signal handlers in
+``projects.signals``. Other backends fall back to ``icontains``.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'projects_project_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Whether the FTS5 table exists, per SQLite database file.
+_fts5_tables = {}
+
+
+def _fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    name = connection.settings_dict['NAME']
+    if name not in _fts5_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts5_tables[name] = cursor.fetchone() is not None
+    return _fts5_tables[name]
+
+
+def fts5_match_expression(query):
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word is quoted
+    (so FTS5 operators in user input are inert) and prefix-matched, and all
+    words must match.
+    """
+    return ' '.join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
+
+
+def icontains_search(queryset, query):
+    """The unindexed substring search, kept as the fallback and as the benchmark baseline."""
+    return queryset.filter(
+        Q(name__icontains=query) | Q(description__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_projects(queryset, query):
+    """
+    Filter ``queryset`` to projects matching ``query`` and annotate a
+    ``search_rank`` (higher is more relevant). Results are ordered by rank,
+    then by the usual list ordering.
+    """
+    if connection.vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        queryset = queryset.alias(
+            search_match=RawSQL(f'"projects_project"."search_vector" @@ {tsquery}', [query],
+                                output_field=BooleanField())
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(f'ts_rank("projects_project"."search_vector", {tsquery})', [query],
+                               output_field=FloatField())
+        )
+    elif _fts5_available():
+        match = fts5_match_expression(query)
+        if not match:
+            return queryset.none()
+        # Join the FTS5 table directly so MATCH and bm25() are evaluated once per query.
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = "projects_project"."id"', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            # bm25() is lower for better matches; the name column counts ten times the description.
+            select={'search_rank': f'-bm25({FTS_TABLE}, 10.0, 1.0)'},
+        )
+    else:
+        queryset = icontains_search(queryset, query)
+    return queryset.order_by('-search_rank', '-start_date', '-id')
+
+
+def index_project(project):
+    """Refresh the SQLite FTS5 row for ``project``; PostgreSQL maintains its vector itself."""
+    if not _fts5_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [project.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (%s, %s, %s)',
+            [project.pk, project.name, project.description]
+        )
+
+
+def unindex_project(project_pk):
+    if not _fts5_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [project_pk])
+
+
+def rebuild_search_index():
+    """Repopulate the SQLite FTS5 table, e.g. after bulk inserts that bypass signals."""
+    if not _fts5_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM projects_project'
+        )
@@ -0,0 +1,95 @@
+# projects/signals.py
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from contacts.models import Contact
+
+from .models import Project, ProjectJoinRequest, ProjectMembership
+from .search import index_project, unindex_project
+
+
+@receiver(post_save, sender=Project)
+def update_project_search_index(sender, instance, **kwargs):
+    """Keep the development (SQLite FTS5) search index in step with project edits."""
+    index_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def remove_project_search_index(sender, instance, **kwargs):
+    unindex_project(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def create_owner_membership(sender, instance, created, **kwargs):
+    if created and instance.owner_id:
+        ProjectMembership.objects.get_or_create(
+            project=instance, user_id=instance.owner_id,
+            defaults={'role': ProjectMembership.Role.OWNER}
+        )
+
+
+@receiver(m2m_changed, sender=Project.stakeholders.through)
+def sync_stakeholder_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep ProjectMembership in step with every stakeholder change, whether it
+    comes from ProjectForm, the join/leave views or the admin, and invalidate
+    the cached fragments that list stakeholders.
+    """
+    if reverse and action == 'pre_clear':
+        # Clearing contact.projects does not report which projects were affected.
+        instance._cleared_project_ids = list(instance.projects.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        instance.sync_memberships()
+        Project.objects.filter(pk=instance.pk).bump_cache_version()
+        return
+    project_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_project_ids', [])
+    for project in Project.objects.filter(pk__in=project_ids):
+        project.sync_memberships()
+    Project.objects.filter(pk__in=project_ids).bump_cache_version()
+
+
+@receiver(post_save, sender=Contact)
+def resync_contact_projects(sender, instance, created, **kwargs):
+    """A contact re-pointed to another user moves its project memberships with it."""
+    if created:
+        return
+    project_ids = list(instance.projects.values_list('pk', flat=True))
+    for project in Project.objects.filter(pk__in=project_ids):
+        project.sync_memberships()
+    Project.objects.filter(pk__in=project_ids).bump_cache_version()
+
+
+@receiver(pre_delete, sender=Contact)
+def remove_deleted_contact_from_projects(sender, instance, **kwargs):
+    """
+    The delete cascade removes stakeholder rows without m2m signals, so clear
+    them first; sync_stakeholder_memberships then drops the memberships.
+    Runs inside the delete's transaction.
+    """
+    instance.projects.clear()
+
+
+# User fields shown in the cached project fragments.
+CACHED_USER_FIELDS = frozenset({'username', 'email', 'first_name', 'last_name'})
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_projects(sender, instance, created, update_fields, **kwargs):
+    """
+    The stakeholder and overview fragments show members' and requesters' names
+    and email addresses. Saves that cannot change them, such as the
+    ``last_login`` update on every login, are skipped.
+    """
+    if created or (update_fields is not None and not CACHED_USER_FIELDS & set(update_fields)):
+        return
+    Project.objects.filter(
+        Q(pk__in=ProjectMembership.objects.filter(user=instance).values('project_id'))
+        | Q(pk__in=ProjectJoinRequest.objects.filter(requesting_user=instance).values('project_id'))
+    ).bump_cache_version()
@@ -0,0 +1,225 @@
+"""
+Streaming import of project tasks from CSV or JSON.
+
+Rows are read one at a time, validated with ``ProjectTaskForm``'s rules and
+inserted ``chunk_size`` at a time with ``bulk_create`` (tasks, then their
+``assigned_to`` rows), so memory use does not depend on the size of the file.
+
+CSV files need a header row with the columns ``title``, ``description``,
+``due_date``, ``is_complete`` and ``assigned_to``; only ``title`` and
+``due_date`` are required. JSON files hold objects with the same keys, either
+as one array or as one object per line. Assignees are stakeholder usernames or
+email addresses, separated by ``;`` or ``,`` in CSV or given as a list in JSON.
+"""
+
+import csv
+import json
+import re
+
+from django import forms
+from django.db import transaction
+
+from .activity import activity_transaction, record_activity
+from .forms import ProjectTaskForm
+from .models import ProjectActivity, ProjectTask
+
+FORMATS = ('csv', 'json')
+CHUNK_SIZE = 500
+# No JSON task is this long, so a value that still fails to parse is invalid.
+MAX_JSON_VALUE_SIZE = 1024 * 1024
+# Only the first few invalid rows are reported, so the report stays small too.
+MAX_REPORTED_ERRORS = 20
+
+_ASSIGNEE_SEPARATOR_RE = re.compile(r'[;,]')
+
+
+class TaskImportError(ValueError):
+    """The file cannot be read as tasks at all (as opposed to a single bad row)."""
+
+
+class ImportBooleanField(forms.Field):
+    """
+    A yes/no column: true/1/yes or false/0/no/empty, in any case, and JSON
+    booleans as they are. CheckboxInput would take any other text as true.
+    """
+    TRUE_VALUES = frozenset({'true', '1', 'yes'})
+    FALSE_VALUES = frozenset({'false', '0', 'no', ''})
+
+    def to_python(self, value):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in self.TRUE_VALUES:
+            return True
+        if text in self.FALSE_VALUES:
+            return False
+        raise forms.ValidationError("Expected true/false, 1/0 or yes/no.", code='invalid')
+
+
+class TaskImportRowForm(ProjectTaskForm):
+    """ProjectTaskForm's rules for one imported row; the importer resolves assignees."""
+
+    is_complete = ImportBooleanField(required=False)
+
+    class Meta(ProjectTaskForm.Meta):
+        fields = ['title', 'description', 'due_date', 'is_complete']
+
+
+class TaskImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def add_error(self, row_number, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Row {row_number}: {message}")
+
+
+def format_for(filename):
+    """Guess the import format from a file name, or return None."""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return {'csv': 'csv', 'json': 'json', 'jsonl': 'json', 'ndjson': 'json'}.get(extension)
+
+
+def iter_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def iter_json(stream, read_size=64 * 1024, max_value_size=MAX_JSON_VALUE_SIZE):
+    """
+    Yield the values of a JSON array, or of whitespace-separated JSON values
+    (JSON Lines), while holding at most one value plus one read in memory.
+    A value that cannot be parsed within ``max_value_size`` characters raises
+    TaskImportError.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    at_start = True
+    while True:
+        chunk = stream.read(read_size)
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if at_start and buffer.startswith('['):
+                buffer = buffer[1:]
+                at_start = False
+                continue
+            if buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            if buffer.startswith(']') or not buffer:
+                break
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as exc:
+                if not chunk or len(buffer) > max_value_size:
+                    raise TaskImportError(f"Invalid JSON: {exc.msg}.") from exc
+                # Most likely a value cut off by the read; fetch more of it.
+                break
+            at_start = False
+            buffer = buffer[end:]
+            yield value
+        if not chunk or buffer.startswith(']'):
+            return
+
+
+def stakeholder_lookup(project):
+    """Map each stakeholder's username and email (lowercased) to the contact's id."""
+    lookup = {}
+    rows = project.stakeholders.exclude(contact_user=None).values_list(
+        'pk', 'contact_user__username', 'contact_user__email'
+    )
+    for contact_pk, username, email in rows:
+        lookup[username.lower()] = contact_pk
+        if email:
+            lookup.setdefault(email.lower(), contact_pk)
+    return lookup
+
+
+def _assignee_names(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, str):
+        value = _ASSIGNEE_SEPARATOR_RE.split(value)
+    if not isinstance(value, list):
+        raise ValueError
+    return [str(name).strip() for name in value if str(name).strip()]
+
+
+def _form_errors(form):
+    return '; '.join(
+        f"{field}: {' '.join(errors)}" if field != '__all__' else ' '.join(errors)
+        for field, errors in form.errors.items()
+    )
+
+
+def import_tasks(project, stream, file_format, user=None, chunk_size=CHUNK_SIZE):
+    """
+    Create tasks for ``project`` from the rows in ``stream`` (a text file).
+    Invalid rows are skipped and reported in the returned TaskImportResult;
+    valid rows are committed a chunk at a time. A file that stops being
+    readable part way raises TaskImportError, keeping the chunks already saved.
+    """
+    if file_format not in FORMATS:
+        raise TaskImportError(f"Unsupported format {file_format!r}; use one of {', '.join(FORMATS)}.")
+    rows = iter_csv(stream) if file_format == 'csv' else iter_json(stream)
+    assignee_ids = stakeholder_lookup(project)
+    result = TaskImportResult()
+    chunk = []
+
+    try:
+        for row_number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                result.add_error(row_number, "Expected an object with task fields.")
+                continue
+            form = TaskImportRowForm({
+                name: '' if row.get(name) is None else row[name] for name in TaskImportRowForm.Meta.fields
+            })
+            if not form.is_valid():
+                result.add_error(row_number, _form_errors(form))
+                continue
+            try:
+                names = _assignee_names(row.get('assigned_to'))
+            except ValueError:
+                result.add_error(row_number, "assigned_to: Expected a list of usernames.")
+                continue
+            unknown = [name for name in names if name.lower() not in assignee_ids]
+            if unknown:
+                result.add_error(row_number, f"assigned_to: Not a stakeholder of this project: {', '.join(unknown)}.")
+                continue
+
+            task = form.save(commit=False)
+            task.project = project
+            chunk.append((task, {assignee_ids[name.lower()] for name in names}))
+            # A full chunk is only saved once the next row arrives, so the
+            # last one is always left for the block below.
+            if len(chunk) > chunk_size:
+                result.created += _save_chunk(project, chunk[:chunk_size])
+                chunk = chunk[chunk_size:]
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise TaskImportError(f"Could not read the file: {exc}") from exc
+
+    if chunk:
+        # The last chunk commits together with the import's activity entry.
+        with activity_transaction():
+            result.created += _save_chunk(project, chunk)
+            record_activity(
+                project, ProjectActivity.EventType.TASKS_BULK_CHANGED, created_by=user,
+                payload={'action': 'import', 'count': result.created},
+            )
+    return result
+
+
+def _save_chunk(project, chunk):
+    Assignment = ProjectTask.assigned_to.through
+    with transaction.atomic():
+        tasks = ProjectTask.objects.bulk_create([task for task, _ in chunk])
+        Assignment.objects.bulk_create(
+            Assignment(projecttask_id=task.pk, contact_id=contact_id)
+            for task, (_, contact_ids) in zip(tasks, chunk)
+            for contact_id in contact_ids
+        )
+        project.adjust_task_counters(total=len(tasks), completed=sum(task.is_complete for task in tasks))
+    return len(tasks)
@@ -2,10 +2,59 @@
 
 from django import template
 
+from projects import fragment_cache
+from projects.access import project_access as request_project_access
+
 register = template.Library()
 
 
 @register.filter
 def in_stakeholders(user, project):
-    """Return True if user is in the project's stakeholder list."""
-    return user in [c.contact_user for c in project.stakeholders.all()]
+    """
+    Return True if user is in the project's stakeholder list.
+
+    Templates rendering the current user's rights should use
+    ``{% project_access %}`` instead, which is memoized for the request.
+    """
+    return project.stakeholders.filter(contact_user=user).exists()
+
+
+@register.simple_tag(takes_context=True)
+def project_access(context, project):
+    """
+    The current user's ProjectAccess for ``project`` (see projects.access)::
+
+        {% project_access project as access %}
+        {% if access.can_manage %} ... {% endif %}
+    """
+    return request_project_access(context['request']).get(project)
+
+
+class ProjectCacheNode(template.Node):
+    def __init__(self, nodelist, name, project):
+        self.nodelist = nodelist
+        self.name = name
+        self.project = project
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        project = self.project.resolve(context)
+        return fragment_cache.get_or_render(name, project, lambda: self.nodelist.render(context))
+
+
+@register.tag('projectcache')
+def do_projectcache(parser, token):
+    """
+    Cache the enclosed fragment until the project's cache_version changes::
+
+        {% projectcache 'row' project %} ... {% endprojectcache %}
+
+    Only wrap markup that is the same for every user (no csrf tokens or
+    per-user buttons).
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name and a project.")
+    nodelist = parser.parse(('endprojectcache',))
+    parser.delete_first_token()
+    return ProjectCacheNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
@@ -0,0 +1,125 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from contacts.models import Contact
+from projects.access import project_access
+from projects.models import Project
+
+User = get_user_model()
+
+
+class ProjectAccessTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.member = User.objects.create_user(username='member', password='secret')
+        self.outsider = User.objects.create_user(username='outsider', password='secret')
+        self.contact = Contact.objects.create(user=self.owner, contact_user=self.member)
+        self.private = self.project("Private", is_public=False)
+        self.public = self.project("Public", is_public=True)
+
+    def project(self, name, is_public):
+        project = Project.objects.create(
+            name=name, description="Access test", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31),
+            is_public=is_public, owner=self.owner,
+        )
+        project.stakeholders.add(self.contact)
+        project.sync_memberships()
+        return project
+
+    def access(self, user, project):
+        request = RequestFactory().get('/')
+        request.user = user
+        return project_access(request).get(project)
+
+    def test_rights_by_role(self):
+        rights = ('is_owner', 'is_stakeholder', 'can_view', 'can_manage', 'can_request_join', 'can_delete')
+        expected = {
+            self.owner: (True, False, True, True, False, True),
+            self.member: (False, True, True, True, False, False),
+            self.outsider: (False, False, False, False, False, False),
+        }
+        for user, values in expected.items():
+            access = self.access(user, self.private)
+            self.assertEqual(tuple(getattr(access, right) for right in rights), values, user.username)
+        self.assertTrue(self.access(self.outsider, self.public).can_request_join)
+
+    def test_delete_and_archive_permissions_extend_to_non_owners(self):
+        self.assertFalse(self.access(self.outsider, self.public).can_archive)
+        self.outsider.user_permissions.add(
+            Permission.objects.get(codename='delete_project'), Permission.objects.get(codename='archive_project')
+        )
+        outsider = User.objects.get(pk=self.outsider.pk)
+        access = self.access(outsider, self.public)
+        self.assertTrue(access.can_delete)
+        self.assertTrue(access.can_archive)
+        self.assertFalse(access.can_manage)
+
+        # The permissions only reach projects the user can view.
+        access = self.access(outsider, self.private)
+        self.assertFalse(access.can_delete)
+        self.assertFalse(access.can_archive)
+
+    def test_roles_are_resolved_once_per_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.member
+        resolver = project_access(request)
+        with self.assertNumQueries(1):
+            resolver.resolve([self.private, self.public])
+            for project in (self.private, self.public):
+                self.assertTrue(resolver.get(project).is_stakeholder)
+        self.assertIs(project_access(request), resolver)
+
+    def test_project_list_resolves_access_in_one_query(self):
+        self.client.login(username='member', password='secret')
+        self.client.get(reverse('project_list'))
+        with self.assertNumQueries(7) as few:
+            self.client.get(reverse('project_list'))
+        for n in range(5):
+            self.project(f"More {n}", is_public=True)
+        with self.assertNumQueries(len(few.captured_queries)):
+            response = self.client.get(reverse('project_list'))
+        self.assertContains(response, reverse('leave_project', args=[self.public.pk]))
+
+    def test_contact_edits_move_access(self):
+        self.client.login(username='owner', password='secret')
+        self.client.post(reverse('contacts:contact_edit', args=[self.contact.pk]), {'contact_user': self.outsider.pk})
+        self.assertFalse(self.access(self.member, self.private).can_manage)
+        self.assertTrue(self.access(self.outsider, self.private).can_manage)
+
+        self.contact.delete()
+        self.assertFalse(self.access(self.outsider, self.private).can_view)
+
+    def test_private_project_is_hidden_from_outsiders(self):
+        self.client.login(username='outsider', password='secret')
+        for url in (
+            reverse('project_detail', args=[self.private.pk]),
+            reverse('project_tab', args=[self.private.pk, 'tasks']),
+            reverse('project_activity_feed', args=[self.private.pk]),
+            reverse('project_board_column', args=[self.private.pk, 'open']),
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+    def test_only_owners_edit_and_delete(self):
+        self.client.login(username='member', password='secret')
+        self.assertEqual(self.client.get(reverse('project_edit', args=[self.private.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('project_delete', args=[self.private.pk])).status_code, 404)
+        response = self.client.get(reverse('project_detail', args=[self.private.pk]))
+        self.assertNotContains(response, reverse('project_delete', args=[self.private.pk]))
+
+    def test_delete_permission_holders_can_delete(self):
+        self.outsider.user_permissions.add(Permission.objects.get(codename='delete_project'))
+        self.client.login(username='outsider', password='secret')
+        response = self.client.post(reverse('project_delete', args=[self.public.pk]), {'confirmName': 'Public'})
+        self.assertRedirects(response, reverse('project_list'))
+        self.assertFalse(Project.objects.filter(pk=self.public.pk).exists())
+
+    def test_delete_permission_does_not_reach_hidden_projects(self):
+        self.outsider.user_permissions.add(Permission.objects.get(codename='delete_project'))
+        self.client.login(username='outsider', password='secret')
+        response = self.client.post(reverse('project_delete', args=[self.private.pk]), {'confirmName': 'Private'})
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Project.objects.filter(pk=self.private.pk).exists())
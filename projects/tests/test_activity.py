@@ -0,0 +1,232 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.activity import (
+    activity_buffer, activity_transaction, record_activity, save_activities, task_payload,
+)
+from projects.middleware import ActivityBufferMiddleware
+from projects.models import PendingActivity, Project, ProjectActivity, ProjectTask
+
+User = get_user_model()
+OTHER = ProjectActivity.EventType.OTHER
+TASK_UPDATED = ProjectActivity.EventType.TASK_UPDATED
+
+
+class RecordActivityTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.project = Project.objects.create(
+            name="Logged Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+
+    def test_buffered_events_are_written_in_one_insert(self):
+        """The outbox and the activity table each get a single insert for everything recorded in a request."""
+        with CaptureQueriesContext(connection) as queries:
+            with activity_buffer():
+                with self.captureOnCommitCallbacks(execute=True):
+                    with activity_transaction():
+                        for n in range(3):
+                            record_activity(self.project, OTHER, title=f"Event {n}", created_by=self.owner)
+                self.assertFalse(ProjectActivity.objects.exists())
+                self.assertEqual(PendingActivity.objects.count(), 3)
+        for table in ('projects_pendingactivity', 'projects_projectactivity'):
+            inserts = [q for q in queries if q['sql'].startswith(f'INSERT INTO "{table}"')]
+            self.assertEqual(len(inserts), 1, table)
+        self.assertEqual(self.project.activities.count(), 3)
+        self.assertFalse(PendingActivity.objects.exists())
+
+    def test_events_from_rolled_back_transactions_are_dropped(self):
+        with activity_buffer():
+            with self.captureOnCommitCallbacks(execute=True):
+                with activity_transaction():
+                    record_activity(self.project, OTHER, title="Kept")
+                    try:
+                        with transaction.atomic():
+                            record_activity(self.project, OTHER, title="Rolled back")
+                            raise ValueError
+                    except ValueError:
+                        pass
+                try:
+                    with activity_transaction():
+                        record_activity(self.project, OTHER, title="Also rolled back")
+                        raise ValueError
+                except ValueError:
+                    pass
+        self.assertEqual(list(self.project.activities.values_list('title', flat=True)), ["Kept"])
+        self.assertFalse(PendingActivity.objects.exists())
+
+    def test_outbox_commits_with_the_change(self):
+        """A view's change and its outbox row share one transaction."""
+        self.client.login(username='owner', password='secret')
+        with mock.patch.object(PendingActivity.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.post(reverse('tasks_create', args=[self.project.pk]),
+                                 {'title': "Lost", 'due_date': date(2023, 6, 1)})
+        self.assertFalse(ProjectTask.objects.exists())
+
+    def test_unwritten_events_are_kept_in_the_outbox(self):
+        """An event whose transaction committed but was never written is drained later."""
+        with self.captureOnCommitCallbacks(execute=False):
+            record_activity(self.project, OTHER, title="Committed", created_by=self.owner)
+        self.assertFalse(ProjectActivity.objects.exists())
+        call_command('drain_activity', stdout=StringIO())
+        self.assertEqual(list(self.project.activities.values_list('title', flat=True)), ["Committed"])
+        self.assertFalse(PendingActivity.objects.exists())
+
+    def test_write_failure_does_not_fail_the_request(self):
+        """The middleware logs a failed write; the committed event stays in the outbox."""
+        def view(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                record_activity(self.project, OTHER, title="Saved", created_by=self.owner)
+            return HttpResponse()
+
+        middleware = ActivityBufferMiddleware(view)
+        with mock.patch('projects.activity.save_activities', side_effect=DatabaseError), \
+                self.assertLogs('projects.middleware', 'ERROR'):
+            response = middleware(RequestFactory().post('/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PendingActivity.objects.count(), 1)
+
+        call_command('drain_activity', stdout=StringIO())
+        self.assertEqual(list(self.project.activities.values_list('title', flat=True)), ["Saved"])
+        self.assertFalse(PendingActivity.objects.exists())
+
+    def test_write_after_commit_leaves_invalidation_to_the_change(self):
+        version = self.project.cache_version
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                record_activity(self.project, OTHER, title="Changed")
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.cache_version, version)
+        self.assertFalse([q for q in queries if 'UPDATE' in q['sql']])
+
+
+@override_settings(PROJECT_ACTIVITY_DEFERRED=True)
+class DeferredActivityTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.project = Project.objects.create(
+            name="Deferred Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+
+    def record(self, *titles, project=None):
+        with activity_buffer():
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with activity_transaction():
+                    for title in titles:
+                        record_activity(project or self.project, OTHER, title=title, created_by=self.owner)
+        return callbacks
+
+    def test_events_are_left_for_the_drain(self):
+        self.assertEqual(self.record("First", "Second"), [])
+        self.assertFalse(ProjectActivity.objects.exists())
+        self.assertEqual(PendingActivity.objects.count(), 2)
+
+        call_command('drain_activity', stdout=StringIO())
+        self.assertFalse(PendingActivity.objects.exists())
+        self.assertEqual(
+            sorted(self.project.activities.values_list('title', flat=True)), ["First", "Second"]
+        )
+        self.assertEqual(self.project.activities.filter(created_by=self.owner).count(), 2)
+
+    def test_drain_invalidates_cached_fragments(self):
+        self.record("Changed")
+        version = self.project.cache_version
+        call_command('drain_activity', stdout=StringIO())
+        self.project.refresh_from_db()
+        self.assertNotEqual(self.project.cache_version, version)
+
+    def test_draining_again_does_not_duplicate_events(self):
+        self.record("Once")
+        call_command('drain_activity', stdout=StringIO())
+        call_command('drain_activity', stdout=StringIO())
+        self.assertEqual(self.project.activities.count(), 1)
+
+    def test_events_for_deleted_projects_are_dropped(self):
+        doomed = Project.objects.create(
+            name="Doomed", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+        self.record("Kept")
+        self.record("Orphaned", project=doomed)
+        doomed.delete()
+
+        call_command('drain_activity', stdout=StringIO())
+        self.assertEqual(list(ProjectActivity.objects.values_list('title', flat=True)), ["Kept"])
+
+
+@override_settings(PROJECT_ACTIVITY_COALESCE_WINDOWS={'TASK_UPDATED': 600})
+class ActivityCoalescingTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.other = User.objects.create_user(username='other', password='secret')
+        self.project = Project.objects.create(
+            name="Busy Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+        self.task = ProjectTask.objects.create(project=self.project, title="Draft", due_date=date(2023, 6, 1))
+        self.other_task = ProjectTask.objects.create(project=self.project, title="Review", due_date=date(2023, 6, 1))
+        self.start = timezone.now()
+
+    def update(self, minutes, task=None, user=None, event_type=TASK_UPDATED):
+        task = task or self.task
+        save_activities([ProjectActivity(
+            project=self.project, event_type=event_type, created_by=user or self.owner,
+            payload=task_payload(task), timestamp=self.start + timedelta(minutes=minutes),
+        )])
+
+    def test_repeats_within_the_window_are_merged(self):
+        for minutes in (0, 5, 12):
+            self.update(minutes)
+        activity = ProjectActivity.objects.get()
+        self.assertEqual(activity.occurrences, 3)
+        self.assertEqual(activity.timestamp, self.start + timedelta(minutes=12))
+
+    def test_repeats_outside_the_window_start_a_new_row(self):
+        self.update(0)
+        self.update(11)
+        self.assertEqual(ProjectActivity.objects.count(), 2)
+
+    def test_different_tasks_users_and_event_types_are_kept_apart(self):
+        self.update(0)
+        self.update(1, task=self.other_task)
+        self.update(2, user=self.other)
+        self.update(3, event_type=ProjectActivity.EventType.TASK_DELETED)
+        self.assertEqual(ProjectActivity.objects.count(), 4)
+        self.assertEqual(set(ProjectActivity.objects.values_list('occurrences', flat=True)), {1})
+
+    def test_repeats_in_one_batch_are_merged(self):
+        save_activities([
+            ProjectActivity(project=self.project, event_type=TASK_UPDATED, created_by=self.owner,
+                            payload=task_payload(self.task))
+            for _ in range(3)
+        ])
+        self.assertEqual(ProjectActivity.objects.get().occurrences, 3)
+
+    def test_repeated_task_edits_in_the_view(self):
+        self.client.login(username='owner', password='secret')
+        for title in ("Draft v2", "Draft v3"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('tasks_edit', args=[self.task.pk]),
+                                 {'title': title, 'due_date': date(2023, 6, 1)})
+        activity = ProjectActivity.objects.get(event_type=TASK_UPDATED)
+        self.assertEqual(activity.occurrences, 2)
+        self.assertEqual(activity.display_title, "Task Updated: Draft v3")
+
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'activity']))
+        self.assertContains(response, '&times;2')
+
+    def test_drained_repeats_are_merged(self):
+        with override_settings(PROJECT_ACTIVITY_DEFERRED=True), activity_transaction():
+            for _ in range(2):
+                record_activity(self.project, TASK_UPDATED, created_by=self.owner, payload=task_payload(self.task))
+        call_command('drain_activity', stdout=StringIO())
+        self.assertEqual(ProjectActivity.objects.get().occurrences, 2)
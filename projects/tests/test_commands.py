@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from projects.models import ArchivedProjectActivity, Project, ProjectActivity, ProjectTask
+
+User = get_user_model()
+
+
+class ReconcileTaskCountersCommandTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="secret")
+        self.projects = [
+            Project.objects.create(
+                name=f"Project {i}",
+                description="Counter drift testing.",
+                start_date="2023-01-01",
+                end_date="2023-12-31",
+                owner=self.owner
+            )
+            for i in range(3)
+        ]
+
+    def test_reconcile_repairs_drifted_counters(self):
+        """Counters are recomputed from the task table, chunk by chunk."""
+        first, second, third = self.projects
+        ProjectTask.objects.create(project=first, title="A", due_date="2023-06-01", is_complete=True)
+        ProjectTask.objects.create(project=first, title="B", due_date="2023-06-01")
+        second.adjust_task_counters(total=5, completed=2)  # no tasks exist, so this is drift
+
+        out = StringIO()
+        call_command('reconcile_task_counters', chunk_size=2, stdout=out)
+
+        for project in self.projects:
+            project.refresh_from_db()
+        self.assertEqual((first.task_count, first.completed_task_count), (2, 1))
+        self.assertEqual((second.task_count, second.completed_task_count), (0, 0))
+        self.assertEqual((third.task_count, third.completed_task_count), (0, 0))
+        self.assertIn("Checked 3 projects, repaired 2", out.getvalue())
+
+
+class ArchiveActivityCommandTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="secret")
+        self.project = Project.objects.create(
+            name="Long-running project",
+            start_date="2020-01-01",
+            end_date="2030-12-31",
+            owner=self.owner
+        )
+        now = timezone.now()
+        self.old = [
+            ProjectActivity.objects.create(
+                project=self.project, title=f"Old {i}", created_by=self.owner,
+                timestamp=now - timedelta(days=400 + i)
+            )
+            for i in range(5)
+        ]
+        self.recent = ProjectActivity.objects.create(project=self.project, title="Recent", timestamp=now)
+
+    def test_old_activity_is_moved_to_the_archive(self):
+        """Rows past the retention period move, chunk by chunk, keeping their ids and fields."""
+        self.project.refresh_from_db()
+        version = self.project.cache_version
+        out = StringIO()
+        call_command('archive_activity', days=365, chunk_size=2, stdout=out)
+
+        self.assertEqual(list(ProjectActivity.objects.values_list('title', flat=True)), ["Recent"])
+        archived = ArchivedProjectActivity.objects.order_by('-timestamp')
+        self.assertEqual([a.pk for a in archived], [a.pk for a in self.old])
+        self.assertEqual({a.event_id for a in archived}, {a.event_id for a in self.old})
+        self.assertEqual(archived[0].created_by, self.owner)
+        self.assertEqual(archived[0].display_title, "Old 0")
+        self.assertIn("Archived 5 activity rows", out.getvalue())
+        self.project.refresh_from_db()
+        self.assertNotEqual(self.project.cache_version, version)
+
+    def test_nothing_to_archive(self):
+        out = StringIO()
+        call_command('archive_activity', days=1000, stdout=out)
+        self.assertEqual(ProjectActivity.objects.count(), 6)
+        self.assertIn("Archived 0 activity rows", out.getvalue())
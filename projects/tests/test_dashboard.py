@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from contacts.models import Contact
+from projects.models import Project, ProjectTask
+
+User = get_user_model()
+
+
+class MyTasksDashboardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.worker = User.objects.create_user(username='worker', password='secret')
+        self.contact = Contact.objects.create(user=self.owner, contact_user=self.worker)
+        self.alpha = self.project("Alpha")
+        self.beta = self.project("Beta")
+        self.client.login(username='worker', password='secret')
+
+    def project(self, name):
+        project = Project.objects.create(
+            name=name, start_date=self.today, end_date=self.today + timedelta(days=90), owner=self.owner
+        )
+        project.stakeholders.add(self.contact)
+        project.sync_memberships()
+        return project
+
+    def task(self, project, title, days, **kwargs):
+        task = ProjectTask.objects.create(
+            project=project, title=title, due_date=self.today + timedelta(days=days), **kwargs
+        )
+        task.assigned_to.add(self.contact)
+        return task
+
+    def dashboard(self):
+        return self.client.get(reverse('my_tasks'))
+
+    def test_open_tasks_are_grouped_by_project_and_due_date(self):
+        self.task(self.alpha, "Alpha later", 5)
+        self.task(self.beta, "Beta late", -2)
+        self.task(self.beta, "Beta soon", 1)
+        self.task(self.beta, "Beta done", 1, is_complete=True)
+        ProjectTask.objects.create(project=self.alpha, title="Unassigned", due_date=self.today)
+
+        groups = self.dashboard().context['project_groups']
+        self.assertEqual([g['name'] for g in groups], ["Beta", "Alpha"])
+        self.assertEqual([t['title'] for t in groups[0]['overdue']], ["Beta late"])
+        self.assertEqual([t['title'] for t in groups[0]['upcoming']], ["Beta soon"])
+        self.assertEqual([t['title'] for t in groups[1]['upcoming']], ["Alpha later"])
+
+    def test_tasks_reached_through_several_contacts_are_listed_once(self):
+        task = self.task(self.alpha, "Shared", 3)
+        second = Contact.objects.create(user=self.beta.owner, contact_user=self.worker, note="second")
+        task.assigned_to.add(second)
+        self.assertEqual(self.dashboard().context['task_count'], 1)
+
+    def test_result_is_cached_until_a_task_changes(self):
+        task = self.task(self.alpha, "Draft", 3)
+        self.dashboard()
+        # session, user, membership versions
+        with self.assertNumQueries(3):
+            self.dashboard()
+
+        self.client.login(username='owner', password='secret')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks_edit', args=[task.pk]), {
+                'title': "Draft v2", 'due_date': task.due_date, 'is_complete': True,
+            })
+        self.client.login(username='worker', password='secret')
+        self.assertEqual(self.dashboard().context['task_count'], 0)
+
+    def test_bulk_writes_invalidate(self):
+        tasks = [self.task(self.alpha, f"Task {n}", 3) for n in range(2)]
+        self.assertEqual(self.dashboard().context['task_count'], 2)
+        self.client.login(username='owner', password='secret')
+        self.client.post(reverse('tasks_bulk', args=[self.alpha.pk]), {
+            'action': 'complete', 'tasks': [t.pk for t in tasks],
+        })
+        self.client.login(username='worker', password='secret')
+        self.assertEqual(self.dashboard().context['task_count'], 0)
+
+    def test_leaving_a_project_drops_its_tasks(self):
+        self.task(self.alpha, "Alpha task", 3)
+        self.task(self.beta, "Beta task", 3)
+        self.dashboard()
+        self.client.post(reverse('leave_project', args=[self.alpha.pk]))
+        groups = self.dashboard().context['project_groups']
+        self.assertEqual([g['name'] for g in groups], ["Beta"])
@@ -0,0 +1,140 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from contacts.models import Contact
+from projects import fragment_cache
+from projects.models import Project, ProjectJoinRequest, ProjectTask
+
+User = get_user_model()
+
+
+class FragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragment_cache.reset_stats()
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.other = User.objects.create_user(username='other', password='secret')
+        self.third = User.objects.create_user(username='third', password='secret')
+        self.contact = Contact.objects.create(user=self.owner, contact_user=self.other)
+        self.project = Project.objects.create(
+            name="Cached Project",
+            description="A project whose pages are cached.",
+            start_date=date(2023, 1, 1),
+            end_date=date(2023, 12, 31),
+            is_public=True,
+            owner=self.owner,
+        )
+        self.project.stakeholders.add(self.contact)
+        self.task = ProjectTask.objects.create(project=self.project, title="Cached Task", due_date=date(2023, 6, 1))
+        self.project.adjust_task_counters(total=1)
+        self.client.login(username='owner', password='secret')
+
+    def render_tab(self, tab):
+        return self.client.get(reverse('project_tab', args=[self.project.pk, tab]))
+
+    def assertInvalidates(self, tab, write):
+        """Render ``tab`` until it is cached, run ``write`` and check the fragment is rebuilt."""
+        self.render_tab(tab)
+        self.render_tab(tab)
+        before = fragment_cache.stats()[tab]
+        self.assertGreaterEqual(before['hits'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        self.client.login(username='owner', password='secret')
+        response = self.render_tab(tab)
+        after = fragment_cache.stats()[tab]
+        self.assertEqual(after['misses'], before['misses'] + 1)
+        return response
+
+    def test_hits_and_misses_are_counted(self):
+        """The first render misses; later renders of an unchanged project are hits."""
+        self.render_tab('tasks')
+        self.assertEqual(fragment_cache.stats()['tasks'], {'hits': 0, 'misses': 1})
+        self.render_tab('tasks')
+        self.render_tab('tasks')
+        self.assertEqual(fragment_cache.stats()['tasks'], {'hits': 2, 'misses': 1})
+
+    def test_cache_hit_skips_tab_queries(self):
+        """A cached tasks tab does not query the tasks or their assignees."""
+        self.render_tab('tasks')
+        with self.assertNumQueries(3):
+            response = self.render_tab('tasks')
+        self.assertContains(response, "Cached Task")
+
+    def test_list_rows_are_cached(self):
+        self.client.get(reverse('project_list'))
+        self.client.get(reverse('project_list'))
+        self.assertEqual(fragment_cache.stats()['list_row'], {'hits': 1, 'misses': 1})
+
+    def test_project_update_invalidates(self):
+        def write():
+            self.client.post(reverse('project_edit', args=[self.project.pk]), {
+                'name': 'Renamed Project',
+                'description': 'New description',
+                'is_public': True,
+                'start_date': date(2023, 1, 1),
+                'end_date': date(2023, 12, 31),
+                'status': Project.Status.IN_PROGRESS,
+                'stakeholders': [str(self.contact.pk)],
+            })
+        response = self.assertInvalidates('overview', write)
+        self.assertContains(response, 'New description')
+
+    def test_join_request_invalidates(self):
+        def write():
+            self.client.login(username='third', password='secret')
+            self.client.post(reverse('request_join_project', args=[self.project.pk]))
+        response = self.assertInvalidates('activity', write)
+        self.assertContains(response, 'Join Request Submitted')
+
+    def test_accept_join_request_invalidates(self):
+        join_request = ProjectJoinRequest.objects.create(project=self.project, requesting_user=self.third)
+        response = self.assertInvalidates('stakeholders', lambda: self.client.post(
+            reverse('accept_join_request', args=[join_request.pk])
+        ))
+        self.assertContains(response, 'third')
+
+    def test_reject_join_request_invalidates(self):
+        join_request = ProjectJoinRequest.objects.create(project=self.project, requesting_user=self.third)
+        response = self.assertInvalidates('activity', lambda: self.client.post(
+            reverse('reject_join_request', args=[join_request.pk])
+        ))
+        self.assertContains(response, 'Join Request Rejected')
+
+    def test_leave_project_invalidates(self):
+        def write():
+            self.client.login(username='other', password='secret')
+            self.client.post(reverse('leave_project', args=[self.project.pk]))
+        response = self.assertInvalidates('stakeholders', write)
+        self.assertContains(response, 'No stakeholders assigned.')
+
+    def test_task_create_invalidates(self):
+        response = self.assertInvalidates('tasks', lambda: self.client.post(
+            reverse('tasks_create', args=[self.project.pk]),
+            {'title': 'Brand New Task', 'due_date': date(2023, 7, 1), 'is_complete': False},
+        ))
+        self.assertContains(response, 'Brand New Task')
+
+    def test_task_update_invalidates(self):
+        response = self.assertInvalidates('tasks', lambda: self.client.post(
+            reverse('tasks_edit', args=[self.task.pk]),
+            {'title': 'Edited Task', 'due_date': date(2023, 7, 1), 'is_complete': True},
+        ))
+        self.assertContains(response, 'Edited Task')
+
+    def test_task_delete_invalidates(self):
+        response = self.assertInvalidates('tasks', lambda: self.client.post(
+            reverse('tasks_edit', args=[self.task.pk]), {'delete': '1'}
+        ))
+        self.assertNotContains(response, 'Cached Task')
+
+    def test_task_counters_invalidate_list_row(self):
+        """A change to the task counters changes the progress shown in the project list."""
+        self.client.get(reverse('project_list'))
+        self.project.adjust_task_counters(total=1)
+        self.client.get(reverse('project_list'))
+        self.assertEqual(fragment_cache.stats()['list_row'], {'hits': 0, 'misses': 2})
@@ -0,0 +1,114 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contacts.models import Contact
+from messaging.models import Message
+from projects.models import Project, ProjectActivity, ProjectJoinRequest, ProjectMembership
+
+User = get_user_model()
+
+
+class JoinRequestTriageTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.alpha = self.project("Alpha")
+        self.beta = self.project("Beta")
+        self.client.login(username='owner', password='secret')
+
+    def project(self, name, owner=None):
+        return Project.objects.create(
+            name=name, start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), is_public=True,
+            owner=owner or self.owner,
+        )
+
+    def requests_from(self, prefix, count, projects):
+        join_requests = []
+        for n in range(count):
+            user = User.objects.create_user(username=f'{prefix}{n}', password='secret')
+            join_requests += [
+                ProjectJoinRequest.objects.create(project=project, requesting_user=user) for project in projects
+            ]
+        return join_requests
+
+    def triage(self, action, join_requests):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('join_request_inbox'), {
+                'action': action, 'requests': [jr.pk for jr in join_requests],
+            })
+
+    def test_inbox_lists_pending_requests_for_owned_projects(self):
+        pending = self.requests_from('user', 2, [self.alpha])
+        ProjectJoinRequest.objects.filter(pk=pending[1].pk).update(status=ProjectJoinRequest.RequestStatus.REJECTED)
+        elsewhere = self.project("Elsewhere", owner=User.objects.create_user(username='someone'))
+        self.requests_from('stranger', 1, [elsewhere])
+
+        response = self.client.get(reverse('join_request_inbox'))
+        self.assertEqual(list(response.context['join_requests']), [pending[0]])
+
+    def test_bulk_accept_across_projects(self):
+        join_requests = self.requests_from('user', 2, [self.alpha, self.beta])
+        response = self.triage('accept', join_requests)
+        self.assertRedirects(response, reverse('join_request_inbox'))
+
+        self.assertFalse(ProjectJoinRequest.objects.filter(status=ProjectJoinRequest.RequestStatus.PENDING).exists())
+        for project in (self.alpha, self.beta):
+            self.assertEqual(
+                set(project.stakeholders.values_list('contact_user__username', flat=True)), {'user0', 'user1'}
+            )
+            self.assertEqual(project.memberships.filter(role=ProjectMembership.Role.STAKEHOLDER).count(), 2)
+            activity = project.activities.get()
+            self.assertEqual(activity.event_type, ProjectActivity.EventType.JOIN_REQUESTS_ACCEPTED)
+            self.assertEqual(activity.payload['users'], ['user0', 'user1'])
+        self.assertEqual(Contact.objects.filter(user=self.owner).count(), 2)
+        self.assertEqual(Contact.objects.filter(contact_user=self.owner).count(), 2)
+
+    def test_accept_reuses_existing_contacts(self):
+        join_request, = self.requests_from('user', 1, [self.alpha])
+        contact = Contact.objects.create(user=self.owner, contact_user=join_request.requesting_user)
+        self.triage('accept', [join_request])
+        self.assertEqual(list(self.alpha.stakeholders.all()), [contact])
+        self.assertEqual(
+            self.alpha.activities.get().event_type, ProjectActivity.EventType.JOIN_ACCEPTED
+        )
+
+    def test_query_count_does_not_grow_with_selection(self):
+        few = self.requests_from('few', 1, [self.alpha, self.beta])
+        many = self.requests_from('many', 6, [self.alpha, self.beta])
+        with CaptureQueriesContext(connection) as small:
+            self.triage('accept', few)
+        with self.assertNumQueries(len(small.captured_queries)):
+            self.triage('accept', many)
+
+    def test_bulk_reject_notifies_requesters(self):
+        join_requests = self.requests_from('user', 3, [self.alpha])
+        self.triage('reject', join_requests)
+        self.assertEqual(
+            ProjectJoinRequest.objects.filter(status=ProjectJoinRequest.RequestStatus.REJECTED).count(), 3
+        )
+        self.assertEqual(Message.objects.filter(sender=self.owner, subject__icontains="Rejected").count(), 3)
+        self.assertEqual(
+            self.alpha.activities.get().event_type, ProjectActivity.EventType.JOIN_REQUESTS_REJECTED
+        )
+        self.assertFalse(self.alpha.stakeholders.exists())
+
+    def test_requests_on_other_projects_are_rejected_by_the_form(self):
+        elsewhere = self.project("Elsewhere", owner=User.objects.create_user(username='someone'))
+        foreign, = self.requests_from('user', 1, [elsewhere])
+        self.triage('accept', [foreign])
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, ProjectJoinRequest.RequestStatus.PENDING)
+        self.assertFalse(elsewhere.stakeholders.exists())
+
+    def test_one_request_per_user_and_project(self):
+        join_request, = self.requests_from('user', 1, [self.alpha])
+        _, created = ProjectJoinRequest.objects.get_or_create(
+            project=self.alpha, requesting_user=join_request.requesting_user
+        )
+        self.assertFalse(created)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ProjectJoinRequest.objects.create(project=self.alpha, requesting_user=join_request.requesting_user)
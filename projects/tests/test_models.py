@@ -1,6 +1,8 @@
+from importlib import import_module
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from projects.models import Project, ProjectJoinRequest, ProjectActivity, ProjectTask
+from projects.models import Project, ProjectJoinRequest, ProjectActivity, ProjectMembership, ProjectTask
 from contacts.models import Contact
 
 User = get_user_model()
@@ -60,6 +62,112 @@ class ProjectModelTest(TestCase):
         self.assertEqual(self.project.completed_tasks, 1)
         self.assertEqual(self.project.progress, 50)
 
+    def test_with_progress_annotations_are_used_by_properties(self):
+        """Annotated projects answer the task properties without extra queries."""
+        self.project.adjust_task_counters(total=3, completed=1)
+        project = Project.objects.with_progress().get(pk=self.project.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(project.total_tasks, 3)
+            self.assertEqual(project.completed_tasks, 1)
+            self.assertEqual(project.progress, 33)
+
+    def test_adjust_task_counters(self):
+        """Counter deltas are applied to the stored columns."""
+        self.project.adjust_task_counters(total=2, completed=1)
+        self.project.adjust_task_counters(total=-1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.task_count, 1)
+        self.assertEqual(self.project.completed_task_count, 1)
+
+    def test_with_progress_without_tasks(self):
+        """Projects with no tasks are annotated with zero progress."""
+        project = Project.objects.with_progress().get(pk=self.project.pk)
+        self.assertEqual(project.total_tasks, 0)
+        self.assertEqual(project.progress, 0)
+
+    def test_save_never_rewinds_cache_version(self):
+        project = Project.objects.get(pk=self.project.pk)
+        Project.objects.filter(pk=project.pk).bump_cache_version()
+        bumped = Project.objects.get(pk=project.pk).cache_version
+        project.save()
+        self.assertEqual(project.cache_version, bumped + 1)
+        self.assertEqual(Project.objects.get(pk=project.pk).cache_version, bumped + 1)
+
+    def test_save_keeps_concurrent_counter_increments(self):
+        project = Project.objects.get(pk=self.project.pk)
+        self.project.adjust_task_counters(total=5, completed=2)
+        project.name = "Renamed"
+        project.save()
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual((project.name, project.task_count, project.completed_task_count), ("Renamed", 5, 2))
+
+
+class ProjectMembershipTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="secret")
+        self.member = User.objects.create_user(username="member", password="secret")
+        self.outsider = User.objects.create_user(username="outsider", password="secret")
+        self.contact = Contact.objects.create(user=self.owner, contact_user=self.member)
+        self.project = Project.objects.create(
+            name="Private Project",
+            description="Only for members.",
+            start_date="2023-01-01",
+            end_date="2023-12-31",
+            is_public=False,
+            owner=self.owner
+        )
+
+    def roles(self):
+        return dict(self.project.memberships.values_list('user__username', 'role'))
+
+    def test_owner_membership_created_with_project(self):
+        self.assertEqual(self.roles(), {"owner": ProjectMembership.Role.OWNER})
+
+    def test_stakeholder_changes_are_mirrored(self):
+        """Adding, removing and clearing stakeholders keeps the membership table in step."""
+        self.project.stakeholders.add(self.contact)
+        self.assertEqual(self.roles(), {"owner": "OWNER", "member": "STAKEHOLDER"})
+        self.project.stakeholders.remove(self.contact)
+        self.assertEqual(self.roles(), {"owner": "OWNER"})
+        self.contact.projects.add(self.project)
+        self.assertEqual(self.roles(), {"owner": "OWNER", "member": "STAKEHOLDER"})
+        self.contact.projects.clear()
+        self.assertEqual(self.roles(), {"owner": "OWNER"})
+
+    def test_repointed_contact_moves_membership(self):
+        self.project.stakeholders.add(self.contact)
+        self.contact.contact_user = self.outsider
+        self.contact.save()
+        self.assertEqual(self.roles(), {"owner": "OWNER", "outsider": "STAKEHOLDER"})
+
+    def test_deleted_contact_drops_membership(self):
+        self.project.stakeholders.add(self.contact)
+        version = Project.objects.get(pk=self.project.pk).cache_version
+        self.contact.delete()
+        self.assertEqual(self.roles(), {"owner": "OWNER"})
+        self.assertGreater(Project.objects.get(pk=self.project.pk).cache_version, version)
+
+    def test_profile_edits_invalidate_member_projects(self):
+        self.project.stakeholders.add(self.contact)
+        version = Project.objects.get(pk=self.project.pk).cache_version
+        self.member.email = "member@example.com"
+        self.member.save()
+        self.assertGreater(Project.objects.get(pk=self.project.pk).cache_version, version)
+
+        version = Project.objects.get(pk=self.project.pk).cache_version
+        self.member.save(update_fields=['last_login'])
+        self.outsider.save()
+        self.assertEqual(Project.objects.get(pk=self.project.pk).cache_version, version)
+
+    def test_member_of_queryset(self):
+        self.project.stakeholders.add(self.contact)
+        public = Project.objects.create(
+            name="Public Project", description="Everyone.", start_date="2023-01-01",
+            end_date="2023-12-31", is_public=True, owner=self.outsider
+        )
+        self.assertEqual(list(Project.objects.member_of(self.member)), [self.project])
+        self.assertEqual(list(Project.objects.member_of(self.outsider)), [public])
+
 
 class ProjectJoinRequestTest(TestCase):
     def setUp(self):
@@ -111,6 +219,47 @@ class ProjectActivityTest(TestCase):
         expected_str = f"{activity.title} ({self.project.name})"
         self.assertEqual(str(activity), expected_str)
 
+    def test_activity_text_is_rendered_from_payload(self):
+        activity = ProjectActivity(
+            project=self.project,
+            event_type=ProjectActivity.EventType.TASK_STATUS_CHANGED,
+            payload={'actor': 'owner', 'task': 7, 'task_title': 'Draft', 'old_status': 'complete',
+                     'new_status': 'pending'},
+        )
+        self.assertEqual(activity.display_title, "Task reopened: Draft")
+        self.assertEqual(activity.display_description, "Task was marked reopened by owner.")
+
+    def test_legacy_activity_text_is_parsed(self):
+        """The 0015 backfill recognises the strings the views used to write."""
+        migration = import_module('projects.migrations.0015_projectactivity_event_type_payload')
+        self.assertEqual(
+            migration.parse_legacy_activity("Task completed: Draft", "Task was marked completed by bob.", 'owner'),
+            ('TASK_STATUS_CHANGED',
+             {'task_title': 'Draft', 'actor': 'bob', 'old_status': 'pending', 'new_status': 'complete'}),
+        )
+        self.assertEqual(
+            migration.parse_legacy_activity("Task Created: Draft", "Assigned to: amy, bob", 'owner'),
+            ('TASK_CREATED', {'task_title': 'Draft', 'assignees': ['amy', 'bob'], 'actor': 'owner'}),
+        )
+        self.assertIsNone(migration.parse_legacy_activity("Something else", "", 'owner'))
+
+    def test_legacy_activity_text_is_restored(self):
+        """Reversing 0015 writes back the text ActivityRecord displays."""
+        migration = import_module('projects.migrations.0015_projectactivity_event_type_payload')
+        for event_type, (title, description) in ProjectActivity.TEXT.items():
+            self.assertEqual(migration.TEXT[event_type], (title, description))
+        legacy = ("Task completed: Draft", "Task was marked completed by bob.")
+        self.assertEqual(migration.format_activity(*migration.parse_legacy_activity(*legacy, 'owner')), legacy)
+        activity = ProjectActivity(
+            project=self.project, event_type=ProjectActivity.EventType.TASK_CREATED,
+            payload={'task_title': 'Draft', 'assignees': ['amy', 'bob']},
+        )
+        self.assertEqual(
+            migration.format_activity(activity.event_type, activity.payload),
+            (activity.display_title, activity.display_description),
+        )
+        self.assertIsNone(migration.format_activity('OTHER', {}))
+
 
 class ProjectTaskTest(TestCase):
     def setUp(self):
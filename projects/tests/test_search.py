@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from projects.models import Project
+from projects.search import fts5_match_expression, search_projects
+
+User = get_user_model()
+
+
+class ProjectSearchTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="secret")
+
+    def create_project(self, name, description, **kwargs):
+        return Project.objects.create(
+            name=name,
+            description=description,
+            start_date="2023-01-01",
+            end_date="2023-12-31",
+            owner=self.owner,
+            **kwargs
+        )
+
+    def test_matches_name_and_description(self):
+        """Both fields are searched, and name matches rank above description matches."""
+        in_description = self.create_project("Website", "Migrate the warehouse to the cloud.")
+        in_name = self.create_project("Warehouse Migration", "Move things around.")
+        self.create_project("Unrelated", "Nothing to see here.")
+        results = list(search_projects(Project.objects.all(), "warehouse"))
+        self.assertEqual(results, [in_name, in_description])
+
+    def test_all_words_must_match(self):
+        both = self.create_project("Billing portal", "Customer facing billing.")
+        self.create_project("Billing export", "Nightly job.")
+        results = list(search_projects(Project.objects.all(), "billing portal"))
+        self.assertEqual(results, [both])
+
+    def test_index_follows_edits_and_deletes(self):
+        project = self.create_project("Atlas", "Old description.")
+        project.name = "Zenith"
+        project.save()
+        self.assertFalse(search_projects(Project.objects.all(), "atlas").exists())
+        self.assertTrue(search_projects(Project.objects.all(), "zenith").exists())
+        project.delete()
+        self.assertFalse(search_projects(Project.objects.all(), "zenith").exists())
+
+    def test_combines_with_other_filters(self):
+        public = self.create_project("Mobile app", "Public work.", is_public=True)
+        self.create_project("Mobile backend", "Private work.", is_public=False)
+        results = list(search_projects(Project.objects.filter(is_public=True), "mobile"))
+        self.assertEqual(results, [public])
+
+    def test_match_expression_neutralises_operators(self):
+        self.assertEqual(fts5_match_expression('NEAR("x" OR y*)'), '"NEAR"* "x"* "OR"* "y"*')
+        self.assertEqual(fts5_match_expression('  --  '), '')
+        self.assertFalse(search_projects(Project.objects.all(), '--').exists())
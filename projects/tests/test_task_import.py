@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from contacts.models import Contact
+from projects.models import Project, ProjectActivity, ProjectTask
+from projects.task_import import TaskImportError, import_tasks, iter_json
+
+User = get_user_model()
+
+CSV_HEADER = "title,description,due_date,is_complete,assigned_to\n"
+
+
+class TaskImportTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.alice = User.objects.create_user(username='alice', password='secret', email='alice@example.com')
+        self.bob = User.objects.create_user(username='bob', password='secret')
+        self.outsider = User.objects.create_user(username='outsider', password='secret')
+        self.alice_contact = Contact.objects.create(user=self.owner, contact_user=self.alice)
+        self.bob_contact = Contact.objects.create(user=self.owner, contact_user=self.bob)
+        Contact.objects.create(user=self.owner, contact_user=self.outsider)
+        self.project = Project.objects.create(
+            name="Imported Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+        self.project.stakeholders.add(self.alice_contact, self.bob_contact)
+
+    def import_csv(self, body, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return import_tasks(self.project, StringIO(CSV_HEADER + body), 'csv', user=self.owner, **kwargs)
+
+    def test_csv_rows_become_tasks_with_assignees(self):
+        result = self.import_csv(
+            "Design,,2023-03-01,false,alice;BOB\n"
+            "Build,Write it,2023-04-01,true,alice@example.com\n"
+            "Ship,,2023-05-01,,\n"
+        )
+        self.assertEqual((result.created, result.skipped), (3, 0))
+        self.assertEqual(
+            {t.title: set(t.assigned_to.values_list('contact_user__username', flat=True))
+             for t in self.project.tasks.all()},
+            {'Design': {'alice', 'bob'}, 'Build': {'alice'}, 'Ship': set()},
+        )
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.task_count, self.project.completed_task_count), (3, 1))
+
+    def test_is_complete_values(self):
+        values = {'0': False, 'no': False, 'False ': False, '': False, 'NO': False,
+                  '1': True, 'Yes': True, ' TRUE': True}
+        self.import_csv("".join(f"{text!r},,2023-03-01,{text},\n" for text in values))
+        self.assertEqual(
+            dict(self.project.tasks.values_list('title', 'is_complete')),
+            {repr(text): done for text, done in values.items()},
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_task_count, 3)
+
+    def test_unrecognised_is_complete_is_a_row_error(self):
+        result = self.import_csv("Maybe,,2023-03-01,maybe,\nDone,,2023-03-01,y,\n")
+        self.assertEqual((result.created, result.skipped), (0, 2))
+        self.assertTrue(result.errors[0].startswith("Row 1: is_complete:"))
+
+    def test_json_booleans_pass_through(self):
+        rows = [{'title': "Done", 'due_date': '2023-03-01', 'is_complete': True},
+                {'title': "Open", 'due_date': '2023-03-01', 'is_complete': False}]
+        import_tasks(self.project, StringIO(json.dumps(rows)), 'json')
+        self.assertEqual(dict(self.project.tasks.values_list('title', 'is_complete')), {"Done": True, "Open": False})
+
+    def test_invalid_rows_are_skipped_and_reported(self):
+        result = self.import_csv(
+            ",,2023-03-01,,\n"
+            "No date,,,,\n"
+            "Not ours,,2023-03-01,,outsider\n"
+            "Fine,,2023-03-01,,\n"
+        )
+        self.assertEqual((result.created, result.skipped), (1, 3))
+        self.assertTrue(result.errors[0].startswith("Row 1: title:"))
+        self.assertTrue(result.errors[1].startswith("Row 2: due_date:"))
+        self.assertIn("outsider", result.errors[2])
+        self.assertEqual(list(self.project.tasks.values_list('title', flat=True)), ["Fine"])
+
+    def test_one_activity_entry_per_import(self):
+        self.import_csv("".join(f"Task {n},,2023-03-01,,\n" for n in range(5)), chunk_size=2)
+        activity = ProjectActivity.objects.get()
+        self.assertEqual(activity.payload['count'], 5)
+        self.assertEqual(activity.display_title, "Tasks imported: 5 tasks")
+
+    def test_query_count_depends_on_chunks_not_rows(self):
+        """Assignees are resolved from one lookup; each chunk costs the same few queries."""
+        rows = "".join(f"Task {n},,2023-03-01,,alice;bob\n" for n in range(10))
+        with self.assertNumQueries(13) as ten:
+            self.import_csv(rows, chunk_size=10)
+        rows = "".join(f"Task {n},,2023-03-01,,alice;bob\n" for n in range(100))
+        with self.assertNumQueries(len(ten.captured_queries)):
+            self.import_csv(rows, chunk_size=100)
+        self.assertEqual(ProjectTask.assigned_to.through.objects.count(), 220)
+
+    def test_json_is_parsed_incrementally(self):
+        rows = [{'title': f"Task {n}", 'due_date': '2023-03-01', 'assigned_to': ['alice']} for n in range(20)]
+        document = json.dumps(rows)
+        self.assertEqual(list(iter_json(StringIO(document), read_size=7)), rows)
+        lines = "\n".join(json.dumps(row) for row in rows)
+        self.assertEqual(list(iter_json(StringIO(lines), read_size=7)), rows)
+
+        result = import_tasks(self.project, StringIO(document), 'json')
+        self.assertEqual(result.created, 20)
+        self.assertEqual(self.alice_contact.tasks.count(), 20)
+
+    def test_invalid_json_fails_without_reading_the_whole_file(self):
+        stream = StringIO('[{"title": oops}, ' + ', '.join(['{"title": "Fine"}'] * 10000) + ']')
+        with self.assertRaises(TaskImportError):
+            list(iter_json(stream, read_size=64, max_value_size=1024))
+        self.assertLess(stream.tell(), 2048)
+
+    def test_import_view(self):
+        self.client.login(username='owner', password='secret')
+        upload = SimpleUploadedFile('tasks.csv', (CSV_HEADER + "Uploaded,,2023-03-01,true,bob\n").encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('tasks_import', args=[self.project.pk]), {'file': upload})
+        self.assertRedirects(response, f"{reverse('project_detail', args=[self.project.pk])}?tab=tasks")
+        task = self.project.tasks.get()
+        self.assertEqual(task.title, "Uploaded")
+        self.assertEqual(list(task.assigned_to.all()), [self.bob_contact])
+
+    def test_import_view_rejects_unreadable_files(self):
+        self.client.login(username='owner', password='secret')
+        upload = SimpleUploadedFile('tasks.json', b'[{"title": "Broken"')
+        response = self.client.post(reverse('tasks_import', args=[self.project.pk]), {'file': upload})
+        self.assertContains(response, "Invalid JSON")
+        self.assertFalse(self.project.tasks.exists())
+
+    def test_import_view_requires_permission(self):
+        self.client.login(username='outsider', password='secret')
+        upload = SimpleUploadedFile('tasks.csv', (CSV_HEADER + "Sneaky,,2023-03-01,,\n").encode())
+        self.client.post(reverse('tasks_import', args=[self.project.pk]), {'file': upload})
+        self.assertFalse(self.project.tasks.exists())
+
+    def test_import_command(self):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as tasks_file:
+            tasks_file.write('{"title": "From CLI", "due_date": "2023-03-01"}\n{"title": ""}\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', self.project.pk, path, stdout=out, stderr=err)
+        self.assertIn("Imported 1 tasks", out.getvalue())
+        self.assertIn("Row 2:", err.getvalue())
+        self.assertEqual(list(self.project.tasks.values_list('title', flat=True)), ["From CLI"])
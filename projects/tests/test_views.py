@@ -1,9 +1,16 @@
-from datetime import date
+import base64
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-from django.test import TestCase, RequestFactory
+from django.db import connection
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from projects.models import Project, ProjectJoinRequest, ProjectActivity, ProjectTask
+from projects.models import ArchivedProjectActivity, Project, ProjectJoinRequest, ProjectActivity, ProjectTask
+from projects.views import TaskUpdateView
 from contacts.models import Contact
 from messaging.models import Message
 
@@ -69,12 +76,13 @@ class ProjectsViewsTest(TestCase):
         }
         # Log in as owner and post data.
         self.client.login(username='owner', password='secret')
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
         self.assertRedirects(response, reverse('project_list'))
         new_project = Project.objects.get(name='New Project')
         self.assertEqual(new_project.owner, self.owner)
         # Log an activity, etc.
-        self.assertTrue(ProjectActivity.objects.filter(project=new_project, title="Project Created").exists())
+        self.assertTrue(ProjectActivity.objects.filter(project=new_project, event_type=ProjectActivity.EventType.PROJECT_CREATED).exists())
 
     def test_project_update_view(self):
         """Test that updating a project via ProjectUpdateView works."""
@@ -88,11 +96,12 @@ class ProjectsViewsTest(TestCase):
             'status': self.project.status,
             'stakeholders': [str(self.contact.pk)],
         }
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
         self.assertRedirects(response, reverse('project_list'))
         self.project.refresh_from_db()
         self.assertEqual(self.project.name, 'Updated Project Name')
-        self.assertTrue(ProjectActivity.objects.filter(project=self.project, title="Project Updated").exists())
+        self.assertTrue(ProjectActivity.objects.filter(project=self.project, event_type=ProjectActivity.EventType.PROJECT_UPDATED).exists())
 
     def test_project_list_view(self):
         """Test that the project list view returns only projects for the owner when view=mine."""
@@ -103,6 +112,110 @@ class ProjectsViewsTest(TestCase):
         projects = response.context['projects']
         self.assertIn(self.project, projects)
 
+    def test_project_list_query_count_is_constant(self):
+        """The list page runs the same number of queries regardless of how many projects it shows."""
+        def create_projects(count):
+            for i in range(count):
+                project = Project.objects.create(
+                    name=f"Bulk Project {Project.objects.count()}",
+                    description="Bulk project.",
+                    start_date=date(2023, 1, 1),
+                    end_date=date(2023, 12, 31),
+                    is_public=True,
+                    owner=self.owner
+                )
+                project.stakeholders.add(self.contact)
+                ProjectTask.objects.create(project=project, title="T1", due_date=date(2023, 6, 1), is_complete=True)
+                ProjectTask.objects.create(project=project, title="T2", due_date=date(2023, 6, 1))
+                project.adjust_task_counters(total=2, completed=1)
+
+        url = reverse('project_list') + '?view=public'
+        create_projects(2)
+        self.client.get(url)  # warm up session and content type caches
+        with self.assertNumQueries(4) as small_page:
+            self.client.get(url)
+        create_projects(7)
+        with self.assertNumQueries(len(small_page.captured_queries)):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['projects']), 10)
+        self.assertContains(response, "50%")
+
+    def test_project_list_cursor_pagination(self):
+        """The public tab pages by (start_date, id) cursors in both directions."""
+        for i in range(24):
+            Project.objects.create(
+                name=f"Public {i}",
+                description="Paged project.",
+                start_date=date(2022, 1, 1 + i % 3),  # repeated dates exercise the id tie-breaker
+                end_date=date(2023, 12, 31),
+                is_public=True,
+                owner=self.third
+            )
+        expected = list(Project.objects.filter(is_public=True).order_by('-start_date', '-id'))
+        url = reverse('project_list')
+
+        response = self.client.get(url, {'view': 'public'})
+        self.assertTrue(response.context['cursor_pagination'])
+        self.assertFalse(response.context['show_count'])
+        seen = list(response.context['projects'])
+        pages = [response.context['page_obj']]
+        while pages[-1].has_next():
+            response = self.client.get(url, {'view': 'public', 'cursor': pages[-1].next_cursor})
+            seen.extend(response.context['projects'])
+            pages.append(response.context['page_obj'])
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+
+        response = self.client.get(url, {'view': 'public', 'cursor': pages[-1].previous_cursor})
+        self.assertEqual(list(response.context['projects']), expected[10:20])
+        self.assertTrue(response.context['page_obj'].has_previous())
+
+        response = self.client.get(url, {'view': 'public', 'count': '1'})
+        self.assertContains(response, "25 projects")
+
+    def test_project_list_invalid_cursor(self):
+        """A tampered cursor is a 404, like an out-of-range page number."""
+        response = self.client.get(reverse('project_list'), {'view': 'public', 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_malformed_values_is_404(self):
+        """A well-formed token carrying values of the wrong type is handled like a bad token."""
+        for values in (["notadate", 1], [None, 1], ["2023-01-01", "x"], [["2023-01-01"], 1]):
+            raw = json.dumps({'k': values, 'd': 'next'}).encode()
+            cursor = base64.urlsafe_b64encode(raw).decode().rstrip('=')
+            response = self.client.get(reverse('project_list'), {'view': 'public', 'cursor': cursor})
+            self.assertEqual(response.status_code, 404, values)
+
+    def test_project_list_search(self):
+        """Search uses the full-text index, keeps the tab filter and pages by number."""
+        for i in range(12):
+            Project.objects.create(
+                name=f"Harbor {i}",
+                description="Dockside logistics.",
+                start_date=date(2023, 1, 1),
+                end_date=date(2023, 12, 31),
+                is_public=True,
+                owner=self.third
+            )
+        Project.objects.create(
+            name="Private Harbor", description="Hidden.", start_date=date(2023, 1, 1),
+            end_date=date(2023, 12, 31), is_public=False, owner=self.third
+        )
+        url = reverse('project_list')
+        response = self.client.get(url, {'view': 'public', 'q': 'harbor'})
+        self.assertFalse(response.context['cursor_pagination'])
+        self.assertEqual(response.context['paginator'].count, 12)
+        response = self.client.get(url, {'view': 'public', 'q': 'logistics', 'page': 2})
+        self.assertEqual(len(response.context['projects']), 2)
+        self.assertNotContains(response, "Private Harbor")
+
+    def test_project_list_membership_buttons(self):
+        """Stakeholders see a Leave button instead of a join request on their projects."""
+        self.client.login(username='other', password='secret')
+        response = self.client.get(reverse('project_list') + '?view=public')
+        self.assertContains(response, reverse('leave_project', args=[self.project.pk]))
+        self.assertNotContains(response, reverse('request_join_project', args=[self.project.pk]))
+
     def test_project_detail_view(self):
         """Test that the detail view shows a project if public or user is stakeholder/owner."""
         url = reverse('project_detail', args=[self.project.pk])
@@ -116,6 +229,116 @@ class ProjectsViewsTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_project_detail_query_budget(self):
+        """The detail page stays within a fixed query budget however much the project holds."""
+        def add_rows(count):
+            for i in range(count):
+                user = User.objects.create_user(username=f"member{User.objects.count()}", password='secret')
+                contact = Contact.objects.create(user=self.owner, contact_user=user)
+                self.project.stakeholders.add(contact)
+                task = ProjectTask.objects.create(project=self.project, title=f"Task {i}", due_date=date(2023, 6, 1))
+                task.assigned_to.add(contact, self.contact)
+                self.project.adjust_task_counters(total=1)
+                ProjectJoinRequest.objects.create(project=self.project, requesting_user=user)
+                ProjectActivity.objects.create(project=self.project, title=f"Activity {i}", created_by=user)
+
+        def tab_url(tab):
+            return reverse('project_tab', args=[self.project.pk, tab])
+
+        url = reverse('project_detail', args=[self.project.pk])
+        add_rows(2)
+        self.client.get(url)
+        # session, user, project; the owner's rights need no membership lookup
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        budgets = {'overview': 3, 'tasks': 6, 'board': 6, 'activity': 4, 'stakeholders': 5}
+        for tab, budget in budgets.items():
+            with self.assertNumQueries(budget):
+                self.client.get(tab_url(tab))
+        add_rows(6)
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        for tab, budget in budgets.items():
+            with self.assertNumQueries(budget):
+                self.client.get(tab_url(tab))
+        response = self.client.get(tab_url('stakeholders'))
+        self.assertEqual(len(response.context['stakeholder_list']), 9)
+        self.assertEqual(len(response.context['pending_join_requests']), 9)
+        self.assertContains(response, "member")
+
+    def test_project_detail_renders_only_the_active_tab(self):
+        """Inactive tabs are placeholders that point at their fragment endpoints."""
+        response = self.client.get(reverse('project_detail', args=[self.project.pk]))
+        self.assertEqual(response.context['active_tab'], 'overview')
+        self.assertNotIn('task_list', response.context)
+        self.assertContains(response, reverse('project_tab', args=[self.project.pk, 'tasks']))
+        self.assertNotContains(response, self.task.title)
+
+        response = self.client.get(reverse('project_detail', args=[self.project.pk]), {'tab': 'tasks'})
+        self.assertContains(response, self.task.title)
+
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'tasks']))
+        self.assertTemplateUsed(response, 'projects/partials/tab_tasks.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertContains(response, self.task.title)
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'bogus']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_activity_feed_is_cursor_paginated(self):
+        """The Activity tab renders the newest activity; older pages come from the feed endpoint."""
+        base = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        for i in range(45):
+            ProjectActivity.objects.create(
+                project=self.project, title=f"Event {i:02d}", timestamp=base + timedelta(minutes=i)
+            )
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'activity']))
+        page = response.context['activity_page']
+        self.assertEqual([a.title for a in page], [f"Event {i:02d}" for i in range(44, 24, -1)])
+        self.assertContains(response, 'data-next-url')
+
+        titles = []
+        cursor = page.next_cursor
+        while cursor:
+            response = self.client.get(reverse('project_activity_feed', args=[self.project.pk]), {'cursor': cursor})
+            self.assertTemplateUsed(response, 'projects/partials/activity_items.html')
+            self.assertTemplateNotUsed(response, 'base.html')
+            titles.extend(a.title for a in response.context['activity_list'])
+            cursor = response.context['activity_page'].next_cursor
+        self.assertEqual(titles, [f"Event {i:02d}" for i in range(24, -1, -1)])
+
+    def test_activity_feed_pages_into_the_archive(self):
+        """Archived activity is offered at the end of the live feed and served with ?archived=1."""
+        ArchivedProjectActivity.objects.create(
+            id=10_000, project=self.project, title="Archived Event",
+            timestamp=datetime(2020, 1, 1, tzinfo=dt_timezone.utc),
+        )
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'activity']))
+        self.assertNotContains(response, "Archived Event")
+        self.assertContains(response, '?archived=1')
+
+        response = self.client.get(reverse('project_activity_feed', args=[self.project.pk]), {'archived': '1'})
+        self.assertContains(response, "Archived Event")
+        self.assertNotContains(response, 'Show archived activity')
+
+    def test_activity_feed_requires_visibility(self):
+        self.project.is_public = False
+        self.project.save()
+        self.client.login(username='third', password='secret')
+        response = self.client.get(reverse('project_activity_feed', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_private_project_visibility(self):
+        """Private projects are visible to members only, and appear under their 'mine' tab."""
+        self.project.is_public = False
+        self.project.save()
+        url = reverse('project_detail', args=[self.project.pk])
+        self.client.login(username='other', password='secret')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(reverse('project_list') + '?view=mine')
+        self.assertIn(self.project, response.context['projects'])
+        self.client.login(username='third', password='secret')
+        self.assertEqual(self.client.get(url).status_code, 404)
+
     def test_project_delete_view(self):
         """Test that a project can be deleted if confirmation name matches."""
         url = reverse('project_delete', args=[self.project.pk])
@@ -138,7 +361,8 @@ class ProjectsViewsTest(TestCase):
     def test_accept_join_request_view(self):
         """Test that the owner can accept a join request, adding the requesting user to stakeholders."""
         url = reverse('accept_join_request', args=[self.join_request.pk])
-        response = self.client.post(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
         self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
         join_req = ProjectJoinRequest.objects.get(pk=self.join_request.pk)
         self.assertEqual(join_req.status, ProjectJoinRequest.RequestStatus.ACCEPTED)
@@ -147,19 +371,32 @@ class ProjectsViewsTest(TestCase):
         from contacts.models import Contact
         contact_of_owner = Contact.objects.get(user=self.owner, contact_user=self.third)
         self.assertIn(contact_of_owner, self.project.stakeholders.all())
-        self.assertTrue(ProjectActivity.objects.filter(title="Join Request Accepted").exists())
+        self.assertTrue(self.project.memberships.filter(user=self.third, role='STAKEHOLDER').exists())
+        self.assertTrue(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.JOIN_ACCEPTED).exists())
 
     def test_reject_join_request_view(self):
         """Test that the owner can reject a join request and a message is sent to the requesting user."""
         url = reverse('reject_join_request', args=[self.join_request.pk])
-        response = self.client.post(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
         self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
         join_req = ProjectJoinRequest.objects.get(pk=self.join_request.pk)
         self.assertEqual(join_req.status, ProjectJoinRequest.RequestStatus.REJECTED)
         # Check that a message was sent to the requesting user.
         self.assertTrue(Message.objects.filter(recipient=self.join_request.requesting_user,
                                                subject__icontains="Rejected").exists())
-        self.assertTrue(ProjectActivity.objects.filter(title="Join Request Rejected").exists())
+        self.assertTrue(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.JOIN_REJECTED).exists())
+
+    def test_reject_join_request_is_one_unit_of_work(self):
+        """If the notification fails, the status change is rolled back and no activity is logged."""
+        url = reverse('reject_join_request', args=[self.join_request.pk])
+        with mock.patch('projects.views.Message.objects.create', side_effect=RuntimeError):
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    self.client.post(url)
+        self.join_request.refresh_from_db()
+        self.assertEqual(self.join_request.status, ProjectJoinRequest.RequestStatus.PENDING)
+        self.assertFalse(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.JOIN_REJECTED).exists())
 
     def test_leave_project_view(self):
         """Test that a stakeholder can leave a project and the owner is notified."""
@@ -167,13 +404,15 @@ class ProjectsViewsTest(TestCase):
         self.client.logout()
         self.client.login(username='other', password='secret')
         url = reverse('leave_project', args=[self.project.pk])
-        response = self.client.post(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
         self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
 
+        self.assertFalse(self.project.memberships.filter(user=self.other).exists())
         # Check that a notification message was sent.
         self.assertTrue(Message.objects.filter(recipient=self.owner,
                                                subject__icontains="Stakeholder Left").exists())
-        self.assertTrue(ProjectActivity.objects.filter(title="Stakeholder Left").exists())
+        self.assertTrue(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.STAKEHOLDER_LEFT).exists())
 
     def test_task_create_view(self):
         """Test that a task can be created for a project."""
@@ -188,10 +427,11 @@ class ProjectsViewsTest(TestCase):
             # 'assigned_to' should be a list of contact ids; we'll assign the existing contact.
             'assigned_to': [str(self.contact.pk)],
         }
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
         self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
         self.assertTrue(ProjectTask.objects.filter(title="New Task", project=self.project).exists())
-        self.assertTrue(ProjectActivity.objects.filter(title__icontains="Task Created").exists())
+        self.assertTrue(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.TASK_CREATED).exists())
 
     def test_task_update_view(self):
         """Test that updating a task works correctly."""
@@ -211,13 +451,90 @@ class ProjectsViewsTest(TestCase):
             'is_complete': True,
             'assigned_to': [str(self.contact.pk)],
         }
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
         self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
         task.refresh_from_db()
         self.assertEqual(task.title, 'Task Updated')
         self.assertTrue(task.is_complete)
-        self.assertTrue(ProjectActivity.objects.filter(title__icontains="Task Completed").exists() or
-                        ProjectActivity.objects.filter(title__icontains="Task Updated").exists())
+        activity = ProjectActivity.objects.get(event_type=ProjectActivity.EventType.TASK_STATUS_CHANGED)
+        self.assertEqual(activity.payload['task'], task.pk)
+        self.assertEqual((activity.payload['old_status'], activity.payload['new_status']), ('pending', 'complete'))
+        self.assertEqual(activity.display_title, "Task completed: Task Updated")
+
+    def test_task_views_maintain_task_counters(self):
+        """Creating, completing, reopening and deleting tasks keeps the stored counters in step."""
+        def counters():
+            self.project.refresh_from_db()
+            return self.project.task_count, self.project.completed_task_count
+
+        # setUp created a task directly, so start from reconciled counters.
+        self.project.adjust_task_counters(total=1)
+        data = {'title': 'Counted Task', 'due_date': date(2023, 12, 31), 'is_complete': True}
+        self.client.post(reverse('tasks_create', args=[self.project.pk]), data)
+        self.assertEqual(counters(), (2, 1))
+
+        task = ProjectTask.objects.get(title='Counted Task')
+        data['is_complete'] = False
+        self.client.post(reverse('tasks_edit', args=[task.pk]), data)
+        self.assertEqual(counters(), (2, 0))
+
+        data['is_complete'] = True
+        self.client.post(reverse('tasks_edit', args=[task.pk]), data)
+        self.assertEqual(counters(), (2, 1))
+
+        response = self.client.post(reverse('tasks_edit', args=[task.pk]), {'delete': '1'})
+        self.assertRedirects(response, reverse('project_detail', args=[self.project.pk]))
+        self.assertFalse(ProjectTask.objects.filter(pk=task.pk).exists())
+        self.assertEqual(counters(), (1, 0))
+
+    def test_task_writes_bump_the_cache_version_once(self):
+        """Saving the task, adjusting the counters and moving the activity share one project update."""
+        task = ProjectTask.objects.create(project=self.project, title='Bumped', due_date=date(2023, 12, 31))
+        data = {'title': 'Bumped', 'due_date': date(2023, 12, 31), 'description': 'Changed'}
+        posts = [
+            (reverse('tasks_create', args=[self.project.pk]), data),
+            (reverse('tasks_edit', args=[task.pk]), data),
+            (reverse('tasks_edit', args=[task.pk]), {'delete': '1'}),
+        ]
+        for url, post_data in posts:
+            with self.subTest(url=url, data=post_data):
+                with CaptureQueriesContext(connection) as queries:
+                    with self.captureOnCommitCallbacks(execute=True):
+                        self.client.post(url, post_data)
+                updates = [q for q in queries if q['sql'].startswith('UPDATE "projects_project"')]
+                self.assertEqual(len(updates), 1)
+
+    def test_concurrent_task_posts_count_once(self):
+        """A post that read the task before another request changed it adjusts the counters from the locked row."""
+        def counters():
+            self.project.refresh_from_db()
+            return self.project.task_count, self.project.completed_task_count
+
+        task = ProjectTask.objects.create(project=self.project, title='Raced', due_date=date(2023, 12, 31))
+        self.project.adjust_task_counters(total=2)
+        data = {'title': 'Raced', 'due_date': date(2023, 12, 31), 'is_complete': True}
+
+        def complete_elsewhere(view, project):
+            # The first of two submits commits while the second is under way.
+            if ProjectTask.objects.filter(pk=task.pk).update(is_complete=True):
+                project.adjust_task_counters(completed=1)
+            return original_get_access(view, project)
+
+        def delete_elsewhere(view, project):
+            if ProjectTask.objects.filter(pk=task.pk).delete()[0]:
+                project.adjust_task_counters(total=-1, completed=-1)
+            return original_get_access(view, project)
+
+        original_get_access = TaskUpdateView.get_access
+        with mock.patch.object(TaskUpdateView, 'get_access', complete_elsewhere):
+            self.client.post(reverse('tasks_edit', args=[task.pk]), data)
+        self.assertEqual(counters(), (2, 1))
+
+        with mock.patch.object(TaskUpdateView, 'get_access', delete_elsewhere):
+            self.client.post(reverse('tasks_edit', args=[task.pk]), {'delete': '1'})
+        self.assertEqual(counters(), (1, 0))
+        self.assertFalse(ProjectActivity.objects.filter(event_type=ProjectActivity.EventType.TASK_DELETED).exists())
 
     def test_can_manage_project(self):
         """Test the can_manage_project logic used in task views."""
@@ -229,3 +546,153 @@ class ProjectsViewsTest(TestCase):
         response = self.client.get(reverse('project_detail', args=[self.project.pk]))
         # This is a basic test to ensure that the stakeholder view loads.
         self.assertEqual(response.status_code, 200)
+
+
+class TaskBulkViewTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.other = User.objects.create_user(username='other', password='secret')
+        self.contact = Contact.objects.create(user=self.owner, contact_user=self.other)
+        self.project = Project.objects.create(
+            name="Bulk Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+        self.project.stakeholders.add(self.contact)
+        self.tasks = [
+            ProjectTask.objects.create(project=self.project, title=f"Task {n}", due_date=date(2023, 6, 1),
+                                       is_complete=n == 0)
+            for n in range(3)
+        ]
+        self.project.adjust_task_counters(total=3, completed=1)
+        self.url = reverse('tasks_bulk', args=[self.project.pk])
+        self.client.login(username='owner', password='secret')
+
+    def bulk(self, action, tasks=None, **data):
+        tasks = self.tasks if tasks is None else tasks
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {'action': action, 'tasks': [t.pk for t in tasks], **data})
+
+    def counters(self):
+        self.project.refresh_from_db()
+        return self.project.task_count, self.project.completed_task_count
+
+    def test_complete_and_reopen_keep_counters(self):
+        response = self.bulk('complete')
+        self.assertRedirects(response, f"{reverse('project_detail', args=[self.project.pk])}?tab=tasks")
+        self.assertFalse(self.project.tasks.filter(is_complete=False).exists())
+        self.assertEqual(self.counters(), (3, 3))
+
+        self.bulk('reopen', tasks=self.tasks[:2])
+        self.assertEqual(self.counters(), (3, 1))
+
+    def test_redate_and_reassign(self):
+        self.bulk('redate', due_date=date(2023, 9, 1))
+        self.assertEqual(set(self.project.tasks.values_list('due_date', flat=True)), {date(2023, 9, 1)})
+
+        self.tasks[0].assigned_to.add(self.contact)
+        self.bulk('reassign', tasks=self.tasks[1:], assigned_to=[self.contact.pk])
+        self.assertEqual(ProjectTask.assigned_to.through.objects.count(), 3)
+        self.bulk('reassign', tasks=self.tasks[:1])
+        self.assertFalse(self.tasks[0].assigned_to.exists())
+
+    def test_changed_tasks_are_marked_updated(self):
+        ProjectTask.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        before = timezone.now()
+        for action, tasks, data in [
+            ('complete', self.tasks[1:2], {}),
+            ('reopen', self.tasks[:1], {}),
+            ('redate', self.tasks[2:], {'due_date': date(2023, 9, 1)}),
+        ]:
+            self.bulk(action, tasks=tasks, **data)
+        self.assertTrue(all(task.updated_at >= before for task in self.project.tasks.all()))
+
+    def test_redate_requires_a_date(self):
+        self.bulk('redate')
+        self.assertEqual(set(self.project.tasks.values_list('due_date', flat=True)), {date(2023, 6, 1)})
+        self.assertFalse(ProjectActivity.objects.exists())
+
+    def test_delete_keeps_counters(self):
+        self.bulk('delete', tasks=self.tasks[:2])
+        self.assertEqual(list(self.project.tasks.all()), self.tasks[2:])
+        self.assertEqual(self.counters(), (1, 0))
+
+    def test_one_summarized_activity_entry(self):
+        self.bulk('complete')
+        activity = ProjectActivity.objects.get()
+        self.assertEqual(activity.event_type, ProjectActivity.EventType.TASKS_BULK_CHANGED)
+        self.assertEqual(activity.payload['tasks'], sorted(t.pk for t in self.tasks))
+        self.assertEqual(activity.display_title, "Tasks completed: 3 tasks")
+
+    def test_query_count_does_not_grow_with_the_selection(self):
+        """The number of queries is the same for one task as for many."""
+        with self.assertNumQueries(16) as one:
+            self.bulk('delete', tasks=self.tasks[:1])
+        with self.assertNumQueries(len(one.captured_queries)):
+            self.bulk('delete', tasks=self.tasks[1:])
+
+    def test_requires_permission(self):
+        outsider = User.objects.create_user(username='outsider', password='secret')
+        self.client.force_login(outsider)
+        self.bulk('delete')
+        self.assertEqual(self.project.tasks.count(), 3)
+
+    def test_tasks_from_other_projects_are_rejected(self):
+        other_project = Project.objects.create(
+            name="Elsewhere", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.other
+        )
+        foreign = ProjectTask.objects.create(project=other_project, title="Foreign", due_date=date(2023, 6, 1))
+        self.bulk('complete', tasks=[foreign])
+        foreign.refresh_from_db()
+        self.assertFalse(foreign.is_complete)
+
+
+@override_settings(PROJECT_TASK_DUE_SOON_DAYS=7)
+class TaskBoardTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='secret')
+        self.project = Project.objects.create(
+            name="Board Project", start_date=date(2023, 1, 1), end_date=date(2023, 12, 31), owner=self.owner
+        )
+        today = timezone.localdate()
+        self.due = {
+            'open': [today + timedelta(days=30)],
+            'due_soon': [today, today + timedelta(days=6)],
+            'overdue': [today - timedelta(days=1)] * 3,
+        }
+        for column, due_dates in self.due.items():
+            for n, due_date in enumerate(due_dates):
+                ProjectTask.objects.create(project=self.project, title=f"{column} {n}", due_date=due_date)
+        ProjectTask.objects.create(project=self.project, title="done", due_date=today, is_complete=True)
+        self.client.login(username='owner', password='secret')
+
+    def board(self):
+        response = self.client.get(reverse('project_tab', args=[self.project.pk, 'board']))
+        return {column['name']: column for column in response.context['board_columns']}
+
+    def test_tasks_are_grouped_into_columns(self):
+        columns = self.board()
+        self.assertEqual(
+            {name: column['count'] for name, column in columns.items()},
+            {'open': 1, 'due_soon': 2, 'overdue': 3, 'complete': 1},
+        )
+        self.assertEqual([t.title for t in columns['due_soon']['page']], ["due_soon 0", "due_soon 1"])
+
+    def test_counts_come_from_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.board()
+        counts = [q for q in queries if 'COUNT(' in q['sql'] and 'FROM "projects_projecttask"' in q['sql']]
+        self.assertEqual(len(counts), 1)
+
+    def test_columns_page_separately(self):
+        with mock.patch('projects.views.BOARD_PAGE_SIZE', 2):
+            page = self.board()['overdue']['page']
+            self.assertTrue(page.has_next())
+            self.assertEqual(len(page), 2)
+            response = self.client.get(
+                reverse('project_board_column', args=[self.project.pk, 'overdue']), {'cursor': page.next_cursor}
+            )
+        self.assertEqual([t.title for t in response.context['page']], ["overdue 2"])
+        self.assertFalse(response.context['page'].has_next())
+
+    def test_board_column_rejects_unknown_columns(self):
+        response = self.client.get(reverse('project_board_column', args=[self.project.pk, 'someday']))
+        self.assertEqual(response.status_code, 404)
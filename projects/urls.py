@@ -1,15 +1,21 @@
 from django.urls import path
 from . import views
-from .views import RequestJoinProjectView, AcceptJoinRequestView, RejectJoinRequestView, LeaveProjectView, TaskCreateView, TaskUpdateView
+from .views import RequestJoinProjectView, AcceptJoinRequestView, RejectJoinRequestView, LeaveProjectView, TaskCreateView, TaskUpdateView, TaskBulkView, \
+    TaskImportView
 
 urlpatterns = [
     path('', views.ProjectListView.as_view(), name='project_list'),
     path('create/', views.ProjectCreateView.as_view(), name='project_create'),
+    path('my-tasks/', views.MyTasksView.as_view(), name='my_tasks'),
     path('<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
     path('<int:pk>/edit/', views.ProjectUpdateView.as_view(), name='project_edit'),
     path('<int:pk>/delete/', views.ProjectDeleteView.as_view(), name='project_delete'),
+    path('<int:pk>/tabs/<str:tab>/', views.ProjectTabView.as_view(), name='project_tab'),
+    path('<int:pk>/activity/', views.ProjectActivityFeedView.as_view(), name='project_activity_feed'),
+    path('<int:pk>/board/<str:column>/', views.ProjectBoardColumnView.as_view(), name='project_board_column'),
 
     # Join Requests
+    path('join-requests/', views.JoinRequestInboxView.as_view(), name='join_request_inbox'),
     path('<int:pk>/join/', RequestJoinProjectView.as_view(), name='request_join_project'),
     path('join-request/<int:jr_pk>/accept/', AcceptJoinRequestView.as_view(), name='accept_join_request'),
     path('join-request/<int:jr_pk>/reject/', RejectJoinRequestView.as_view(), name='reject_join_request'),
@@ -18,4 +24,6 @@ urlpatterns = [
     # Task management
     path('<int:project_pk>/tasks/create/', TaskCreateView.as_view(), name='tasks_create'),
     path('tasks/<int:pk>/edit/', TaskUpdateView.as_view(), name='tasks_edit'),
+    path('<int:project_pk>/tasks/bulk/', TaskBulkView.as_view(), name='tasks_bulk'),
+    path('<int:project_pk>/tasks/import/', TaskImportView.as_view(), name='tasks_import'),
 ]
@@ -1,17 +1,43 @@
+import io
+
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q
+from django.http import Http404
 from django.shortcuts import redirect, get_object_or_404, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views import View
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 
+from assignment_5.pagination import CursorPaginator, InvalidCursor
 from contacts.models import Contact
 from messaging.models import Message
+from . import board, dashboard
+from .access import project_access
+from .activity import activity_transaction, record_activity, task_payload, task_status
 from .models import (
     Project, ProjectJoinRequest, ProjectActivity, ProjectTask
 )
-from .forms import ProjectForm, ProjectTaskForm
+from .forms import JoinRequestTriageForm, ProjectForm, ProjectTaskForm, TaskBulkForm, TaskImportForm
+from .join_requests import accept_join_requests, pending_for_owner, reject_join_requests, rejection_message
+from .search import search_projects
+from .task_import import TaskImportError, format_for, import_tasks
+
+
+class ProjectAccessMixin:
+    """The current user's rights to a project, memoized for the request; see projects.access."""
+
+    def get_access(self, project):
+        return project_access(self.request).get(project)
+
+    def get_visible_project(self, pk, queryset=None):
+        """The project, or a 404 unless it is public or the user owns or belongs to it."""
+        project = get_object_or_404(Project.objects.all() if queryset is None else queryset, pk=pk)
+        if not self.get_access(project).can_view:
+            raise Http404("No project found matching the query")
+        return project
 
 
 class ProjectCreateView(LoginRequiredMixin, CreateView):
@@ -29,26 +55,28 @@ class ProjectCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         """ Attach owner, create project, then log activity. """
         form.instance.owner = self.request.user
-        response = super().form_valid(form)  # Saves the project
-        project = self.object
-
-        # Create activity record
-        ProjectActivity.objects.create(
-            project=project,
-            title="Project Created",
-            description=f"{self.request.user.username} created this project.",
-            created_by=self.request.user
-        )
+        with activity_transaction():
+            response = super().form_valid(form)  # Saves the project
+            project = self.object
+
+            # Create activity record
+            record_activity(project, ProjectActivity.EventType.PROJECT_CREATED, created_by=self.request.user)
         return response
 
 
-class ProjectUpdateView(LoginRequiredMixin, UpdateView):
+class ProjectUpdateView(LoginRequiredMixin, ProjectAccessMixin, UpdateView):
     model = Project
     form_class = ProjectForm
     template_name = 'projects/project_form.html'
     success_url = reverse_lazy('project_list')
     context_object_name = 'project'
 
+    def get_object(self, queryset=None):
+        project = super().get_object(queryset)
+        if not self.get_access(project).is_owner:
+            raise Http404("No project found matching the query")
+        return project
+
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
@@ -56,22 +84,36 @@ class ProjectUpdateView(LoginRequiredMixin, UpdateView):
 
     def form_valid(self, form):
         """ On successful update, log activity. """
-        response = super().form_valid(form)
-        project = self.object
-        ProjectActivity.objects.create(
-            project=project,
-            title="Project Updated",
-            description=f"{self.request.user.username} updated this project.",
-            created_by=self.request.user
-        )
+        with activity_transaction():
+            response = super().form_valid(form)
+            project = self.object
+            record_activity(project, ProjectActivity.EventType.PROJECT_UPDATED, created_by=self.request.user)
         return response
 
 
-class ProjectListView(LoginRequiredMixin, ListView):
+class ProjectListView(LoginRequiredMixin, ProjectAccessMixin, ListView):
     model = Project
     template_name = 'projects/project_list.html'
     context_object_name = 'projects'
     paginate_by = 10
+    # Tabs that use keyset pagination on (start_date, id) instead of OFFSET.
+    cursor_views = ('public',)
+
+    def uses_cursor_pagination(self):
+        # Search results are ordered by relevance, so they use numbered pages.
+        if self.request.GET.get('q'):
+            return False
+        return 'cursor' in self.request.GET or self.request.GET.get('view', 'mine') in self.cursor_views
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, ordering=('-start_date', '-id'))
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -79,60 +121,203 @@ class ProjectListView(LoginRequiredMixin, ListView):
         query = self.request.GET.get('q', '')
         status_filter = self.request.GET.get('status', '')
 
-        if query:
-            queryset = queryset.filter(name__icontains=query)
-
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
         if view_filter == 'mine':
-            queryset = queryset.filter(owner=self.request.user)
+            queryset = queryset.member_of(self.request.user)
         elif view_filter == 'public':
             queryset = queryset.filter(is_public=True)
 
-        return queryset.order_by('-start_date')
+        if query:
+            queryset = search_projects(queryset, query)
+        else:
+            queryset = queryset.order_by('-start_date', '-id')
+        return queryset.with_progress()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        # One membership query for the whole page; rows read it with {% project_access %}.
+        project_access(self.request).resolve(context['projects'])
         context['q'] = self.request.GET.get('q', '')
         context['status'] = self.request.GET.get('status', '')
         context['view'] = self.request.GET.get('view', 'mine')
+        context['cursor_pagination'] = self.uses_cursor_pagination()
+        # Counting every matching row is optional in cursor mode.
+        context['show_count'] = not context['cursor_pagination'] or self.request.GET.get('count') == '1'
+        return context
+
+
+def project_contacts(queryset):
+    """Contacts with just the user fields the project pages display."""
+    return queryset.select_related('contact_user').only(
+        'contact_user__username', 'contact_user__first_name', 'contact_user__last_name', 'contact_user__email'
+    )
+
+
+ACTIVITY_PAGE_SIZE = 20
+
+
+def activity_paginator(project, archived=False):
+    activities = project.archived_activities.all() if archived else project.activities.all()
+    return CursorPaginator(activities, ACTIVITY_PAGE_SIZE, ordering=('-timestamp', '-id'))
+
+
+BOARD_PAGE_SIZE = 10
+
+
+def board_paginator(project, column, today=None):
+    tasks = project.tasks.filter(board.column_filters(today)[column]).prefetch_related(
+        Prefetch('assigned_to', queryset=project_contacts(Contact.objects.all()))
+    )
+    return CursorPaginator(tasks, BOARD_PAGE_SIZE, ordering=board.COLUMN_ORDERING[column])
+
+
+class ProjectTabsMixin(ProjectAccessMixin):
+    """
+    Builds the context for one tab of the project detail page. Each tab only
+    runs the queries it renders, so the page itself loads just the active tab
+    and the others are fetched from ProjectTabView when they are opened.
+    """
+    tabs = ('overview', 'tasks', 'board', 'activity', 'stakeholders')
+
+    def get_project(self, pk):
+        return self.get_visible_project(pk, Project.objects.with_progress().select_related('owner'))
+
+    def get_tab_context(self, project, tab):
+        return getattr(self, f'get_{tab}_context')(project)
+
+    def get_overview_context(self, project):
+        return {}
+
+    def get_tasks_context(self, project):
+        return {
+            'task_list': project.tasks.order_by('due_date').prefetch_related(
+                Prefetch('assigned_to', queryset=project_contacts(Contact.objects.all()))
+            ),
+            # Options for the bulk reassign select, only queried on a cache miss.
+            'bulk_assignees': project_contacts(project.stakeholders.all()),
+        }
+
+    def get_board_context(self, project):
+        today = timezone.localdate()
+        counts = board.column_counts(project.tasks.all(), today)
+        # Only the first page of each column is loaded; ProjectBoardColumnView serves the rest.
+        columns = [
+            {'name': name, 'label': label, 'count': counts[name],
+             'page': board_paginator(project, name, today).page() if counts[name] else None}
+            for name, label in board.COLUMNS
+        ]
+        return {'board_columns': columns}
+
+    def get_activity_context(self, project):
+        # Only the newest activity is rendered with the tab; the rest is fetched
+        # from ProjectActivityFeedView as the user scrolls. The page is only
+        # queried if the cached fragment misses.
+        page = SimpleLazyObject(lambda: activity_paginator(project).page())
+        return {'activity_page': page, 'activity_list': SimpleLazyObject(lambda: page.object_list)}
+
+    def get_stakeholders_context(self, project):
+        context = {'stakeholder_list': project_contacts(project.stakeholders.all())}
+        if self.get_access(project).is_owner:
+            context['pending_join_requests'] = list(
+                project.join_requests.filter(status=ProjectJoinRequest.RequestStatus.PENDING)
+                .select_related('requesting_user').order_by('created_at')
+            )
         return context
 
 
-class ProjectDetailView(LoginRequiredMixin, DetailView):
+class ProjectDetailView(LoginRequiredMixin, ProjectTabsMixin, DetailView):
     model = Project
     template_name = 'projects/project_detail.html'
     context_object_name = 'project'
 
-    def get_queryset(self):
-        """ Ensure user only sees project if it's public or they own/belong to it. """
-        qs = super().get_queryset()
-        return qs.filter(
-            Q(is_public=True) | Q(owner=self.request.user) |
-            Q(stakeholders__user=self.request.user)
-        ).distinct()
+    def get_object(self, queryset=None):
+        return self.get_project(self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        project = self.object
-        # Tasks & Activity
-        context['task_list'] = project.tasks.all().order_by('due_date')
-        context['activity_list'] = project.activities.all()
+        active_tab = self.request.GET.get('tab', 'overview')
+        if active_tab not in self.tabs:
+            active_tab = 'overview'
+        context['active_tab'] = active_tab
+        context.update(self.get_tab_context(self.object, active_tab))
         return context
 
 
-class ProjectDeleteView(LoginRequiredMixin, DeleteView):
+class ProjectTabView(LoginRequiredMixin, ProjectTabsMixin, View):
+    """Return the HTML fragment for a single tab of the project detail page."""
+
+    def get(self, request, pk, tab):
+        if tab not in self.tabs:
+            raise Http404("Unknown tab.")
+        project = self.get_project(pk)
+        context = {'project': project, 'active_tab': tab}
+        context.update(self.get_tab_context(project, tab))
+        return render(request, f'projects/partials/tab_{tab}.html', context)
+
+
+class ProjectActivityFeedView(LoginRequiredMixin, ProjectAccessMixin, View):
+    """
+    Return one page of a project's activity feed as an HTML fragment. With
+    ``?archived=1`` the page comes from the archived activity, which the feed
+    only asks for once the live activity has run out.
+    """
+
+    def get(self, request, pk):
+        project = self.get_visible_project(pk)
+        archived = request.GET.get('archived') == '1'
+        try:
+            page = activity_paginator(project, archived=archived).page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return render(request, 'projects/partials/activity_items.html', {
+            'project': project,
+            'activity_page': page,
+            'activity_list': page.object_list,
+            'archived': archived,
+        })
+
+
+class ProjectBoardColumnView(LoginRequiredMixin, ProjectAccessMixin, View):
+    """Return the next page of one task board column as an HTML fragment."""
+
+    def get(self, request, pk, column):
+        if column not in board.COLUMN_NAMES:
+            raise Http404("Unknown board column.")
+        project = self.get_visible_project(pk)
+        try:
+            page = board_paginator(project, column).page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return render(request, 'projects/partials/board_cards.html', {
+            'project': project, 'column': column, 'page': page,
+        })
+
+
+class MyTasksView(LoginRequiredMixin, View):
+    """Open tasks assigned to the current user across all of their projects."""
+
+    def get(self, request):
+        tasks = dashboard.cached_open_tasks(request.user)
+        return render(request, 'projects/my_tasks.html', {
+            'task_count': len(tasks),
+            'project_groups': dashboard.group_by_project(tasks),
+        })
+
+
+class ProjectDeleteView(LoginRequiredMixin, ProjectAccessMixin, DeleteView):
     model = Project
     template_name = 'projects/project_confirm_delete.html'
     success_url = reverse_lazy('project_list')
-    permission_required = 'projects.delete_project'
     context_object_name = 'project'
 
-    def get_queryset(self):
-        # Limit deletion to projects owned by the logged-in user.
-        qs = super().get_queryset()
-        return qs.filter(owner=self.request.user)
+    def get_object(self, queryset=None):
+        # Owners, or users holding the projects.delete_project permission.
+        project = super().get_object(queryset)
+        if not self.get_access(project).can_delete:
+            raise Http404("No project found matching the query")
+        return project
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
@@ -145,24 +330,43 @@ class ProjectDeleteView(LoginRequiredMixin, DeleteView):
             return redirect('project_detail', pk=self.object.pk)
 
 
-class RequestJoinProjectView(LoginRequiredMixin, View):
+class RequestJoinProjectView(LoginRequiredMixin, ProjectAccessMixin, View):
     def post(self, request, pk, *args, **kwargs):
-        project = get_object_or_404(Project, pk=pk, is_public=True)
+        project = get_object_or_404(Project.objects.select_related('owner'), pk=pk, is_public=True)
+        access = self.get_access(project)
 
-        if project.owner == request.user:
+        if access.is_owner:
             messages.error(request, "You own this project.")
             return redirect('project_detail', pk=project.pk)
 
-        is_stakeholder = project.stakeholders.filter(user=request.user).exists()
-        if is_stakeholder:
+        if access.is_member:
             messages.info(request, "You are already a stakeholder in this project.")
             return redirect('project_detail', pk=project.pk)
 
-        join_request, created = ProjectJoinRequest.objects.get_or_create(
-            project=project,
-            requesting_user=request.user,
-            defaults={'status': ProjectJoinRequest.RequestStatus.PENDING}
-        )
+        # The request, the owner's notification and the activity entry commit together.
+        with activity_transaction():
+            join_request, created = ProjectJoinRequest.objects.get_or_create(
+                project=project,
+                requesting_user=request.user,
+                defaults={'status': ProjectJoinRequest.RequestStatus.PENDING}
+            )
+            if created:
+                # Notify the project owner
+                subject = f"Join Request for {project.name}"
+                body = (
+                    f"{request.user.username} has requested to join your project '{project.name}'.\n"
+                    f"View project: {request.build_absolute_uri(reverse_lazy('project_detail', args=[project.pk]))}"
+                )
+                Message.objects.create(
+                    sender=request.user,
+                    recipient=project.owner,
+                    subject=subject,
+                    body=body
+                )
+
+                # Log activity
+                record_activity(project, ProjectActivity.EventType.JOIN_REQUESTED, created_by=request.user)
+
         if not created:
             # Already had a request
             if join_request.status == ProjectJoinRequest.RequestStatus.PENDING:
@@ -170,109 +374,114 @@ class RequestJoinProjectView(LoginRequiredMixin, View):
             else:
                 messages.info(request, f"You previously had a {join_request.status} request.")
         else:
-            # Notify the project owner
-            subject = f"Join Request for {project.name}"
-            body = (
-                f"{request.user.username} has requested to join your project '{project.name}'.\n"
-                f"View project: {request.build_absolute_uri(reverse_lazy('project_detail', args=[project.pk]))}"
-            )
-            Message.objects.create(
-                sender=request.user,
-                recipient=project.owner,
-                subject=subject,
-                body=body
-            )
-
-            # Log activity
-            ProjectActivity.objects.create(
-                project=project,
-                title="Join Request Submitted",
-                description=f"{request.user.username} requested to join this project.",
-                created_by=request.user
-            )
-
             messages.success(request, "Join request sent! The project owner will be notified.")
         return redirect('project_detail', pk=project.pk)
 
 
-class AcceptJoinRequestView(LoginRequiredMixin, View):
+class AcceptJoinRequestView(LoginRequiredMixin, ProjectAccessMixin, View):
     def post(self, request, jr_pk, *args, **kwargs):
-        join_request = get_object_or_404(ProjectJoinRequest, pk=jr_pk)
+        join_request = get_object_or_404(
+            ProjectJoinRequest.objects.select_related('project', 'requesting_user'), pk=jr_pk
+        )
         project = join_request.project
 
-        if project.owner != request.user:
+        if not self.get_access(project).is_owner:
             messages.error(request, "You are not the project owner.")
             return redirect('project_detail', pk=project.pk)
 
-        # Mark as accepted
-        join_request.status = ProjectJoinRequest.RequestStatus.ACCEPTED
-        join_request.save()
+        # One unit of work: the status change, both contacts, the stakeholder
+        # link and the activity entry commit together.
+        with activity_transaction():
+            # Mark as accepted
+            join_request.status = ProjectJoinRequest.RequestStatus.ACCEPTED
+            join_request.save(update_fields=['status'])
+
+            # Add user to stakeholders
+            contact_of_requesting_user, _ = Contact.objects.get_or_create(
+                user=join_request.requesting_user,
+                contact_user=request.user
+            )
+            contact_of_owner, _ = Contact.objects.get_or_create(
+                user=request.user,
+                contact_user=join_request.requesting_user
+            )
+            project.stakeholders.add(contact_of_owner)
 
-        # Add user to stakeholders
-        contact_of_requesting_user, _ = Contact.objects.get_or_create(
-            user=join_request.requesting_user,
-            contact_user=request.user
-        )
-        contact_of_owner, _ = Contact.objects.get_or_create(
-            user=request.user,
-            contact_user=join_request.requesting_user
-        )
-        project.stakeholders.add(contact_of_owner)
-
-        # Log activity
-        ProjectActivity.objects.create(
-            project=project,
-            title="Join Request Accepted",
-            description=f"{join_request.requesting_user.username} was added to project stakeholders.",
-            created_by=request.user
-        )
+            # Log activity
+            record_activity(
+                project, ProjectActivity.EventType.JOIN_ACCEPTED, created_by=request.user,
+                payload={'user': join_request.requesting_user.username},
+            )
 
         messages.success(request, f"You accepted {join_request.requesting_user.username} to the project.")
         return redirect('project_detail', pk=project.pk)
 
 
-class RejectJoinRequestView(LoginRequiredMixin, View):
+class RejectJoinRequestView(LoginRequiredMixin, ProjectAccessMixin, View):
     def post(self, request, jr_pk, *args, **kwargs):
-        join_request = get_object_or_404(ProjectJoinRequest, pk=jr_pk)
+        join_request = get_object_or_404(
+            ProjectJoinRequest.objects.select_related('project', 'requesting_user'), pk=jr_pk
+        )
         project = join_request.project
 
-        if project.owner != request.user:
+        if not self.get_access(project).is_owner:
             messages.error(request, "You are not the project owner.")
             return redirect('project_detail', pk=project.pk)
 
-        join_request.status = ProjectJoinRequest.RequestStatus.REJECTED
-        join_request.save()
+        with activity_transaction():
+            join_request.status = ProjectJoinRequest.RequestStatus.REJECTED
+            join_request.save(update_fields=['status'])
 
-        subject = f"Join Request for {project.name} Rejected"
-        body = (
-            f"Hello {join_request.requesting_user.username},\n\n"
-            f"Your request to join the project '{project.name}' has been rejected by the project owner.\n\n"
-            "Please contact the project owner if you have any questions."
-        )
-        Message.objects.create(
-            sender=request.user,
-            recipient=join_request.requesting_user,
-            subject=subject,
-            body=body
-        )
+            Message.objects.create(**rejection_message(request.user, join_request))
 
-        # Log activity
-        ProjectActivity.objects.create(
-            project=project,
-            title="Join Request Rejected",
-            description=f"{join_request.requesting_user.username}'s join request was rejected.",
-            created_by=request.user
-        )
+            # Log activity
+            record_activity(
+                project, ProjectActivity.EventType.JOIN_REJECTED, created_by=request.user,
+                payload={'user': join_request.requesting_user.username},
+            )
 
         messages.info(request, f"You rejected {join_request.requesting_user.username}. A notification has been sent to them.")
         return redirect('project_detail', pk=project.pk)
 
 
-class LeaveProjectView(LoginRequiredMixin, View):
+class JoinRequestInboxView(LoginRequiredMixin, View):
+    """Pending join requests across all of the user's projects, oldest first, with bulk accept/reject."""
+    page_size = 50
+
+    def get(self, request):
+        paginator = CursorPaginator(
+            pending_for_owner(request.user).select_related('project', 'requesting_user'),
+            self.page_size, ordering=('created_at', 'id'),
+        )
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return render(request, 'projects/join_request_inbox.html', {'page': page, 'join_requests': page.object_list})
+
+    def post(self, request):
+        form = JoinRequestTriageForm(request.POST, owner=request.user)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect('join_request_inbox')
+
+        request_ids = [jr.pk for jr in form.cleaned_data['requests']]
+        if form.cleaned_data['action'] == 'accept':
+            decided = accept_join_requests(request.user, request_ids)
+            messages.success(request, f"Accepted {len(decided)} join requests.")
+        else:
+            decided = reject_join_requests(request.user, request_ids)
+            messages.info(request, f"Rejected {len(decided)} join requests. The requesters have been notified.")
+        return redirect('join_request_inbox')
+
+
+class LeaveProjectView(LoginRequiredMixin, ProjectAccessMixin, View):
     def post(self, request, pk, *args, **kwargs):
-        project = get_object_or_404(Project, pk=pk)
+        project = get_object_or_404(Project.objects.select_related('owner'), pk=pk)
 
-        if project.owner == request.user:
+        if self.get_access(project).is_owner:
             messages.error(request, "Project owners cannot leave their own project.")
             return redirect('project_detail', pk=project.pk)
 
@@ -282,29 +491,25 @@ class LeaveProjectView(LoginRequiredMixin, View):
             messages.info(request, "You are not a stakeholder in this project.")
             return redirect('project_detail', pk=project.pk)
 
-        project.stakeholders.remove(contact)
+        with activity_transaction():
+            project.stakeholders.remove(contact)
 
-        # Notify the owner
-        subject = f"Stakeholder Left: {request.user.username}"
-        body = (
-            f"Hello {project.owner.username},\n\n"
-            f"This is to inform you that {request.user.username} has left your project '{project.name}'.\n\n"
-            "Regards,\nYour Project Management System"
-        )
-        Message.objects.create(
-            sender=request.user,
-            recipient=project.owner,
-            subject=subject,
-            body=body
-        )
+            # Notify the owner
+            subject = f"Stakeholder Left: {request.user.username}"
+            body = (
+                f"Hello {project.owner.username},\n\n"
+                f"This is to inform you that {request.user.username} has left your project '{project.name}'.\n\n"
+                "Regards,\nYour Project Management System"
+            )
+            Message.objects.create(
+                sender=request.user,
+                recipient=project.owner,
+                subject=subject,
+                body=body
+            )
 
-        # Log activity
-        ProjectActivity.objects.create(
-            project=project,
-            title="Stakeholder Left",
-            description=f"{request.user.username} left the project.",
-            created_by=request.user
-        )
+            # Log activity
+            record_activity(project, ProjectActivity.EventType.STAKEHOLDER_LEFT, created_by=request.user)
 
         messages.success(request, "You have left the project. The project owner has been notified.")
         return redirect('project_detail', pk=project.pk)
@@ -315,12 +520,12 @@ Task Creation & Update
 """
 
 
-class TaskCreateView(LoginRequiredMixin, View):
+class TaskCreateView(LoginRequiredMixin, ProjectAccessMixin, View):
     """Form to create a new task for a specific project."""
 
     def get(self, request, project_pk):
         project = get_object_or_404(Project, pk=project_pk)
-        if not self.can_manage_project(request.user, project):
+        if not self.get_access(project).can_manage:
             messages.error(request, "You do not have permission to add tasks to this project.")
             return redirect('project_detail', pk=project.pk)
 
@@ -329,42 +534,38 @@ class TaskCreateView(LoginRequiredMixin, View):
 
     def post(self, request, project_pk):
         project = get_object_or_404(Project, pk=project_pk)
-        if not self.can_manage_project(request.user, project):
+        if not self.get_access(project).can_manage:
             messages.error(request, "You do not have permission to add tasks to this project.")
             return redirect('project_detail', pk=project.pk)
 
         form = ProjectTaskForm(request.POST, project=project)
         if form.is_valid():
-            task = form.save(commit=False)
-            task.project = project
-            task.save()
-            form.save_m2m()
-
-            # Log activity for new task
-            ProjectActivity.objects.create(
-                project=project,
-                title=f"Task Created: {task.title}",
-                description=f"Assigned to: {', '.join([c.contact_user.username for c in task.assigned_to.all()])}",
-                created_by=request.user
-            )
+            with activity_transaction():
+                task = form.save(commit=False)
+                task.project = project
+                task.save(bump_cache_version=False)
+                form.save_m2m()
+                project.adjust_task_counters(total=1, completed=int(task.is_complete))
+
+                # Log activity for new task
+                assignees = list(task.assigned_to.values_list('contact_user__username', flat=True))
+                record_activity(
+                    project, ProjectActivity.EventType.TASK_CREATED, created_by=request.user,
+                    payload=task_payload(task, assignees=assignees),
+                )
 
             messages.success(request, "Task created successfully.")
             return redirect('project_detail', pk=project.pk)
         return render(request, 'projects/tasks/task_form.html', {'form': form, 'project': project})
 
-    def can_manage_project(self, user, project):
-        if project.owner == user:
-            return True
-        return project.stakeholders.filter(contact_user=user).exists()
-
 
-class TaskUpdateView(LoginRequiredMixin, View):
+class TaskUpdateView(LoginRequiredMixin, ProjectAccessMixin, View):
     """Edit an existing task."""
 
     def get(self, request, pk):
         task = get_object_or_404(ProjectTask, pk=pk)
         project = task.project
-        if not self.can_manage_project(request.user, project):
+        if not self.get_access(project).can_manage:
             messages.error(request, "You do not have permission to edit tasks for this project.")
             return redirect('project_detail', pk=project.pk)
 
@@ -374,37 +575,169 @@ class TaskUpdateView(LoginRequiredMixin, View):
     def post(self, request, pk):
         task = get_object_or_404(ProjectTask, pk=pk)
         project = task.project
-        if not self.can_manage_project(request.user, project):
+        if not self.get_access(project).can_manage:
             messages.error(request, "You do not have permission to edit tasks for this project.")
             return redirect('project_detail', pk=project.pk)
 
+        if 'delete' in request.POST:
+            return self.delete_task(request, task, project)
+
         form = ProjectTaskForm(request.POST, instance=task, project=project)
         if form.is_valid():
-            old_status = task.is_complete
-            updated_task = form.save()
-
-            # Log status changes or updates
-            if old_status != updated_task.is_complete:
-                status_text = "completed" if updated_task.is_complete else "reopened"
-                ProjectActivity.objects.create(
-                    project=project,
-                    title=f"Task {status_text}: {updated_task.title}",
-                    description=f"Task was marked {status_text} by {request.user.username}.",
-                    created_by=request.user
-                )
-            else:
-                ProjectActivity.objects.create(
-                    project=project,
-                    title=f"Task Updated: {updated_task.title}",
-                    description=f"Edited by {request.user.username}.",
-                    created_by=request.user
+            with activity_transaction():
+                # Read the old status under a row lock, so two concurrent posts
+                # of the same change don't both adjust the counters.
+                old_status = get_object_or_404(
+                    ProjectTask.objects.select_for_update().values_list('is_complete', flat=True), pk=task.pk
                 )
+                updated_task = form.save(commit=False)
+                updated_task.save(bump_cache_version=False)
+                form.save_m2m()
+                # Also bumps the cache version when the status is unchanged.
+                project.adjust_task_counters(completed=updated_task.is_complete - old_status)
+
+                # Log status changes or updates
+                if old_status != updated_task.is_complete:
+                    record_activity(
+                        project, ProjectActivity.EventType.TASK_STATUS_CHANGED, created_by=request.user,
+                        payload=task_payload(
+                            updated_task,
+                            old_status=task_status(old_status),
+                            new_status=task_status(updated_task.is_complete),
+                        ),
+                    )
+                else:
+                    record_activity(
+                        project, ProjectActivity.EventType.TASK_UPDATED, created_by=request.user,
+                        payload=task_payload(updated_task),
+                    )
 
             messages.success(request, "Task updated successfully.")
             return redirect('project_detail', pk=project.pk)
         return render(request, 'projects/tasks/task_form.html', {'form': form, 'project': project, 'task': task})
 
-    def can_manage_project(self, user, project):
-        if project.owner == user:
-            return True
-        return project.stakeholders.filter(contact_user=user).exists()
+    def delete_task(self, request, task, project):
+        task_id = task.pk
+        with activity_transaction():
+            is_complete = (
+                ProjectTask.objects.select_for_update().filter(pk=task_id)
+                .values_list('is_complete', flat=True).first()
+            )
+            _, deleted = task.delete(bump_cache_version=False)
+            # A concurrent delete got there first: nothing left to count.
+            if deleted.get(ProjectTask._meta.label):
+                project.adjust_task_counters(total=-1, completed=-int(is_complete))
+                record_activity(
+                    project, ProjectActivity.EventType.TASK_DELETED, created_by=request.user,
+                    payload=task_payload(task, task=task_id),
+                )
+
+        messages.success(request, "Task deleted successfully.")
+        return redirect('project_detail', pk=project.pk)
+
+
+class TaskBulkView(LoginRequiredMixin, ProjectAccessMixin, View):
+    """
+    Apply one action to a selection of a project's tasks from the Tasks tab:
+    one permission check, set-based updates and a single activity entry.
+    """
+
+    def post(self, request, project_pk):
+        project = get_object_or_404(Project, pk=project_pk)
+        tasks_tab = f"{reverse('project_detail', args=[project.pk])}?tab=tasks"
+        if not self.get_access(project).can_manage:
+            messages.error(request, "You do not have permission to edit tasks for this project.")
+            return redirect(tasks_tab)
+
+        form = TaskBulkForm(request.POST, project=project)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect(tasks_tab)
+
+        action = form.cleaned_data['action']
+        task_ids = sorted(task.pk for task in form.cleaned_data['tasks'])
+        tasks = project.tasks.filter(pk__in=task_ids)
+        with activity_transaction():
+            changed = getattr(self, f'bulk_{action}')(project, tasks, form.cleaned_data)
+            record_activity(
+                project, ProjectActivity.EventType.TASKS_BULK_CHANGED, created_by=request.user,
+                payload={'action': action, 'count': len(task_ids), 'tasks': task_ids},
+            )
+
+        messages.success(request, f"{changed} of {len(task_ids)} selected tasks changed.")
+        return redirect(tasks_tab)
+
+    def bulk_complete(self, project, tasks, data):
+        changed = tasks.filter(is_complete=False).update(is_complete=True, updated_at=timezone.now())
+        project.adjust_task_counters(completed=changed)
+        return changed
+
+    def bulk_reopen(self, project, tasks, data):
+        changed = tasks.filter(is_complete=True).update(is_complete=False, updated_at=timezone.now())
+        project.adjust_task_counters(completed=-changed)
+        return changed
+
+    def bulk_redate(self, project, tasks, data):
+        changed = tasks.update(due_date=data['due_date'], updated_at=timezone.now())
+        Project.objects.filter(pk=project.pk).bump_cache_version()
+        return changed
+
+    def bulk_reassign(self, project, tasks, data):
+        Assignment = ProjectTask.assigned_to.through
+        task_ids = list(tasks.values_list('pk', flat=True))
+        Assignment.objects.filter(projecttask_id__in=task_ids).delete()
+        Assignment.objects.bulk_create(
+            Assignment(projecttask_id=task_id, contact_id=contact.pk)
+            for task_id in task_ids
+            for contact in data['assigned_to']
+        )
+        Project.objects.filter(pk=project.pk).bump_cache_version()
+        return len(task_ids)
+
+    def bulk_delete(self, project, tasks, data):
+        counts = tasks.aggregate(total=Count('pk'), completed=Count('pk', filter=Q(is_complete=True)))
+        tasks.delete()
+        project.adjust_task_counters(total=-counts['total'], completed=-counts['completed'])
+        return counts['total']
+
+
+class TaskImportView(LoginRequiredMixin, ProjectAccessMixin, View):
+    """Create many tasks at once from an uploaded CSV or JSON file."""
+    template_name = 'projects/tasks/task_import.html'
+
+    def get(self, request, project_pk):
+        project = get_object_or_404(Project, pk=project_pk)
+        if not self.get_access(project).can_manage:
+            messages.error(request, "You do not have permission to add tasks to this project.")
+            return redirect('project_detail', pk=project.pk)
+        return render(request, self.template_name, {'form': TaskImportForm(), 'project': project})
+
+    def post(self, request, project_pk):
+        project = get_object_or_404(Project, pk=project_pk)
+        if not self.get_access(project).can_manage:
+            messages.error(request, "You do not have permission to add tasks to this project.")
+            return redirect('project_detail', pk=project.pk)
+
+        form = TaskImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            file_format = form.cleaned_data['format'] or format_for(upload.name)
+            if not file_format:
+                form.add_error('format', "Choose the file format; it could not be told from the file name.")
+            else:
+                # Large uploads are already on disk; read them as text a row at a time.
+                stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+                try:
+                    result = import_tasks(project, stream, file_format, user=request.user)
+                except TaskImportError as exc:
+                    form.add_error('file', str(exc))
+                else:
+                    messages.success(request, f"Imported {result.created} tasks.")
+                    if result.skipped:
+                        messages.warning(request, f"Skipped {result.skipped} invalid rows.")
+                    for error in result.errors:
+                        messages.warning(request, error)
+                    return redirect(f"{reverse('project_detail', args=[project.pk])}?tab=tasks")
+        return render(request, self.template_name, {'form': form, 'project': project})